@@ -0,0 +1,250 @@
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import main as mood_check
+from daily_aggregates import DailyAggregates
+from mood_reader import MoodReader
+from moods import EMOJI_STATE_MAP, EMOJIS, MOOD_HEADER, TIMESTAMP_FORMAT
+from notification_ledger import NotificationLedger
+
+BASELINE_FILE = "benchmark_baseline.json"
+DEFAULT_SIZES = [10000]
+# Calls timed individually for the per-call benchmarks
+DEFAULT_CALLS = 200
+# Whole-file passes timed for the reader and aggregation benchmarks
+DEFAULT_PASSES = 3
+# Allowed slowdown of p50 and throughput before the gate fails; p99 is
+# noisier on shared machines, so it gets more room
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_P99_TOLERANCE = 1.0
+STORAGES = ["csv", "columnar", "sqlite"]
+
+
+def generate_history(path, rows, users, start=date(2024, 1, 1), seed=0):
+    """Write ``rows`` chronologically ordered synthetic check-ins from ``users`` users."""
+    rng = random.Random(seed)
+    names = [f"user_{i:07d}" for i in range(users)]
+    # Spread the rows over roughly one check-in per user per day
+    days = max(1, rows // max(1, users))
+    start_at = datetime.combine(start, datetime.min.time())
+    step = days * 86400 / max(1, rows)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(MOOD_HEADER)
+        for i in range(rows):
+            mood = rng.choice(EMOJIS)
+            timestamp = (start_at + timedelta(seconds=int(i * step))).strftime(TIMESTAMP_FORMAT)
+            writer.writerow([timestamp, rng.choice(names), mood, EMOJI_STATE_MAP[mood]])
+    return names
+
+
+def generate_ledger(path, users, day=date(2024, 1, 1)):
+    """Write a notification ledger holding ``users`` users, all last notified on ``day``."""
+    ledger = NotificationLedger(path)
+    ledger.update({f"user_{i:07d}": day.isoformat() for i in range(users)})
+    return ledger
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples, ops_per_sample=1):
+    """Latency percentiles (ms per sample) and throughput (ops/s) for a list of durations."""
+    total = sum(samples)
+    return {
+        "samples": len(samples),
+        "p50_ms": round(percentile(samples, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 4),
+        "ops_per_sec": round(ops_per_sample * len(samples) / total, 1) if total else float("inf"),
+    }
+
+
+def time_calls(func, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+@contextmanager
+def patched_main(**values):
+    """Point main.py's module-level paths at the synthetic data for the duration of a run."""
+    saved = {name: getattr(mood_check, name) for name in values}
+    for name, value in values.items():
+        setattr(mood_check, name, value)
+    try:
+        yield
+    finally:
+        mood_check.get_mood_writer().close()
+        for name, value in saved.items():
+            setattr(mood_check, name, value)
+
+
+def _prepare_storage(storage, work_dir, history_path, ledger_path):
+    """Load the synthetic data into ``storage`` and return the main overrides that select it."""
+    overrides = {
+        "MOOD_STORAGE": storage,
+        "MOOD_FILE": history_path,
+        "NOTIFICATION_LEDGER_FILE": ledger_path,
+        "COLUMNAR_MOOD_FILE": os.path.join(work_dir, "bench.mcol"),
+        "SQLITE_DB_FILE": os.path.join(work_dir, "bench.db"),
+    }
+    if storage == "columnar":
+        from columnar_store import convert_csv
+        convert_csv(history_path, overrides["COLUMNAR_MOOD_FILE"])
+    elif storage == "sqlite":
+        from sqlite_store import SqliteMoodStore
+        store = SqliteMoodStore(overrides["SQLITE_DB_FILE"])
+        try:
+            store.import_csv(history_path)
+            store.ledger.update(dict(NotificationLedger(ledger_path).items()))
+        finally:
+            store.close()
+    return overrides
+
+
+def run_size(size, storage="csv", calls=DEFAULT_CALLS, passes=DEFAULT_PASSES, seed=0):
+    """Benchmark one data size: ``size`` history rows and ``size`` ledger users."""
+    work_dir = tempfile.mkdtemp(prefix="moodcheck-bench-")
+    try:
+        history_path = os.path.join(work_dir, "history.csv")
+        ledger_path = os.path.join(work_dir, "ledger.idx")
+        # About a month of history per user
+        generate_history(history_path, size, max(1, size // 30), seed=seed)
+        generate_ledger(ledger_path, size)
+        results = {}
+
+        with patched_main(**_prepare_storage(storage, work_dir, history_path, ledger_path)):
+            # The first lookup creates the ledger file or opens the database
+            mood_check.check_notification_eligibility()
+            results["check_notification_eligibility"] = summarize(
+                time_calls(mood_check.check_notification_eligibility, calls))
+            results["update_notification_time"] = summarize(time_calls(mood_check.update_notification_time, calls))
+            rng = random.Random(seed)
+            results["save_mood"] = summarize(time_calls(lambda: mood_check.save_mood(rng.choice(EMOJIS)), calls))
+
+        def read_all():
+            for _ in MoodReader(history_path):
+                pass
+
+        results["read_moods"] = summarize(time_calls(read_all, passes), size)
+        results["daily_aggregates_rebuild"] = summarize(
+            time_calls(lambda: DailyAggregates(history_path).refresh(rebuild=True), passes), size)
+        try:
+            import mood_analytics
+        except ImportError:
+            pass
+        else:
+            results["daily_summary"] = summarize(
+                time_calls(lambda: mood_analytics.daily_summary(mood_analytics.load_history(history_path)), passes),
+                size)
+        return results
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run(sizes=DEFAULT_SIZES, storage="csv", calls=DEFAULT_CALLS, passes=DEFAULT_PASSES, seed=0):
+    """Return ``{"<benchmark>@<size>": stats}`` for every benchmark at every size."""
+    report = {}
+    for size in sizes:
+        for name, stats in run_size(size, storage, calls, passes, seed).items():
+            report[f"{name}@{size}"] = stats
+    return report
+
+
+def load_baseline(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, storage, report):
+    """Store ``report`` as the baseline for ``storage``, keeping other storages' baselines."""
+    baseline = load_baseline(path) if os.path.exists(path) else {}
+    baseline[storage] = report
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE, p99_tolerance=DEFAULT_P99_TOLERANCE):
+    """Return a message for every benchmark that regressed against ``baseline``.
+
+    Benchmarks missing from either side are ignored, so the gate can be run
+    at a subset of the baseline's sizes.
+    """
+    regressions = []
+    for key, stats in report.items():
+        expected = baseline.get(key)
+        if not expected:
+            continue
+        for metric, allowed in (("p50_ms", tolerance), ("p99_ms", p99_tolerance)):
+            if stats[metric] > expected[metric] * (1 + allowed):
+                regressions.append(f"{key}: {metric} {stats[metric]} > baseline {expected[metric]} (+{allowed:.0%})")
+        if stats["ops_per_sec"] < expected["ops_per_sec"] / (1 + tolerance):
+            regressions.append(
+                f"{key}: ops_per_sec {stats['ops_per_sec']} < baseline {expected['ops_per_sec']} (-{tolerance:.0%})")
+    return regressions
+
+
+def format_report(report):
+    lines = [f"{'benchmark':<44}{'p50 ms':>12}{'p99 ms':>12}{'ops/s':>14}"]
+    for key, stats in report.items():
+        lines.append(f"{key:<44}{stats['p50_ms']:>12.4f}{stats['p99_ms']:>12.4f}{stats['ops_per_sec']:>14.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the storage, eligibility and reader hot paths.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated history rows / ledger users, e.g. 10000,100000,1000000")
+    parser.add_argument("--storage", choices=STORAGES, default="csv")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="timed calls per per-call benchmark")
+    parser.add_argument("--passes", type=int, default=DEFAULT_PASSES, help="timed passes per whole-file benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any benchmark regressed")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--p99-tolerance", type=float, default=DEFAULT_P99_TOLERANCE)
+    parser.add_argument("--output", help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    report = run(sizes, args.storage, args.calls, args.passes, args.seed)
+    print(format_report(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        save_baseline(args.baseline, args.storage, report)
+        print(f"Saved baseline to {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        regressions = compare(report, load_baseline(args.baseline).get(args.storage, {}),
+                              args.tolerance, args.p99_tolerance)
+        for message in regressions:
+            print("REGRESSION", message)
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
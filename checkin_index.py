@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+from log_checkpoint import LogCheckpoint
+from mood_reader import MoodReader, MoodRecord
+from moods import EMOJI_STATE_MAP, EMOJIS
+
+# The delta is merged into the base once it holds more rows than this
+# fraction of the base (and at least COMPACT_MIN_ROWS), which keeps the
+# amortized cost of a refresh proportional to the rows it reads
+COMPACT_RATIO = 0.5
+COMPACT_MIN_ROWS = 10000
+
+
+class CheckinIndex:
+    """Latest check-in per (username, day), maintained incrementally from the mood log.
+
+    Users can submit several times a day; the canonical check-in for a day
+    is the one with the latest timestamp (last write wins). The sidecar is
+    a small checkpoint (``*.latest.json``) plus two JSON-lines files of
+    check-ins: a compacted base (``*.latest.base``) and an append-only
+    delta (``*.latest.delta``). ``refresh`` reads only rows appended to the
+    log since the last one and appends them to the delta, so its cost
+    follows the new rows rather than the history. The delta is merged into
+    the base once it grows past ``COMPACT_RATIO`` of it. The in-memory
+    index is loaded from the sidecar on first use.
+    """
+
+    def __init__(self, mood_path, store_path=None):
+        self.mood_path = mood_path
+        self.store_path = store_path or mood_path + ".latest.json"
+        stem = os.path.splitext(self.store_path)[0]
+        self.base_path = stem + ".base"
+        self.delta_path = stem + ".delta"
+        self.checkpoint = LogCheckpoint(mood_path, self.store_path)
+        self.lock = self.checkpoint.lock
+        self.index = None
+        self.offset = None
+
+    def add(self, timestamp, username, mood):
+        """Fold one check-in into the in-memory index. Returns True if it became the day's check-in."""
+        return self._fold(self._entries(), timestamp, username, mood)
+
+    @staticmethod
+    def _fold(index, timestamp, username, mood):
+        key = (username, timestamp[:10])
+        current = index.get(key)
+        # Equal timestamps replace, so re-reading a row is harmless
+        if current is not None and current[0] > timestamp:
+            return False
+        index[key] = (timestamp, mood)
+        return True
+
+    def _is_stale(self, state):
+        if self.checkpoint.is_stale(state) or "delta_bytes" not in state:
+            return True
+        delta_size = os.path.getsize(self.delta_path) if os.path.exists(self.delta_path) else 0
+        return delta_size < state["delta_bytes"] or (state["base"] and not os.path.exists(self.base_path))
+
+    @staticmethod
+    def _read_lines(path, length=None):
+        with open(path, 'rb') as f:
+            data = f.read() if length is None else f.read(length)
+        for line in data.splitlines():
+            yield json.loads(line)
+
+    def _load(self, state):
+        """Build the in-memory index from the base and delta that ``state`` covers."""
+        index = {}
+        if state["base"]:
+            for timestamp, username, mood in self._read_lines(self.base_path):
+                index[(username, timestamp[:10])] = (timestamp, mood)
+        if state["delta_bytes"]:
+            for timestamp, username, mood in self._read_lines(self.delta_path, state["delta_bytes"]):
+                self._fold(index, timestamp, username, mood)
+        self.index, self.offset = index, state["offset"]
+
+    def _entries(self):
+        if self.index is None:
+            with self.lock:
+                state = self.checkpoint.load()
+                if state is None or self._is_stale(state):
+                    self.index, self.offset = {}, None
+                else:
+                    self._load(state)
+        return self.index
+
+    def refresh(self, rebuild=False):
+        """Fold rows appended to the log since the last refresh. Returns the number of rows read."""
+        with self.lock:
+            state = self.checkpoint.load()
+            if rebuild or self._is_stale(state):
+                # The old base and delta are ignored from here on and overwritten later
+                state = self.checkpoint.reset(rejected=0, base=False, base_rows=0, delta_bytes=0, delta_rows=0)
+                self.index, self.offset = {}, 0
+            if self.offset != state["offset"]:
+                # Another process moved the sidecar on; reload on next use
+                self.index = None
+            if not os.path.exists(self.mood_path):
+                self.offset = state["offset"]
+                self.checkpoint.save(state)
+                return 0
+
+            reader = MoodReader(self.mood_path, start_offset=state["offset"])
+            rows = [(record.timestamp, record.username, record.mood) for record in reader]
+            compact = state["delta_rows"] + len(rows) > max(COMPACT_MIN_ROWS, state["base_rows"] * COMPACT_RATIO)
+            if compact and self.index is None:
+                self._load(state)
+            if self.index is not None:
+                for row in rows:
+                    self._fold(self.index, *row)
+            self.checkpoint.advance(state, reader.offset)
+            state["rejected"] += sum(reader.rejected.values())
+            self.offset = reader.offset
+            if compact:
+                # The new rows go straight into the base
+                self._compact(state)
+                return reader.stats["rows"]
+            if rows:
+                with open(self.delta_path, 'ab') as f:
+                    # Drop anything a crashed refresh appended without saving the checkpoint
+                    f.truncate(state["delta_bytes"])
+                    f.write(b"".join(self._encode(row) for row in rows))
+                    state["delta_bytes"] = f.tell()
+                state["delta_rows"] += len(rows)
+            self.checkpoint.save(state)
+            return reader.stats["rows"]
+
+    @staticmethod
+    def _encode(row):
+        return json.dumps(row, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def _compact(self, state):
+        """Write the in-memory index as the new base and empty the delta. Call with the lock held."""
+        tmp_path = self.base_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(b"".join(self._encode([timestamp, username, mood])
+                             for (username, day), (timestamp, mood) in sorted(self.index.items())))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.base_path)
+        # Until the checkpoint is saved, the old checkpoint with the new base
+        # is still the right index: the base only adds rows past its offset,
+        # and folding them or the old delta in again is harmless
+        state.update(base=True, base_rows=len(self.index), delta_bytes=0, delta_rows=0)
+        self.checkpoint.save(state)
+        with open(self.delta_path, 'wb'):
+            pass
+
+    def __len__(self):
+        return len(self._entries())
+
+    def get(self, username, day):
+        """The canonical check-in of ``username`` on ISO ``day``, or None."""
+        entry = self._entries().get((username, day))
+        if entry is None:
+            return None
+        return MoodRecord(entry[0], username, entry[1], EMOJI_STATE_MAP[entry[1]])
+
+    def records(self, start=None, end=None):
+        """Canonical check-ins with ISO days in [start, end], sorted by username and day."""
+        return [
+            MoodRecord(timestamp, username, mood, EMOJI_STATE_MAP[mood])
+            for (username, day), (timestamp, mood) in sorted(self._entries().items())
+            if (start is None or day >= start) and (end is None or day <= end)
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the latest check-in per user and day.")
+    parser.add_argument("path", nargs="?", default="employee_mood_data.csv")
+    parser.add_argument("--rebuild", action="store_true", help="discard the checkpoint and reindex everything")
+    parser.add_argument("--start", help="first ISO day to count")
+    parser.add_argument("--end", help="last ISO day to count")
+    args = parser.parse_args(argv)
+
+    index = CheckinIndex(args.path)
+    read = index.refresh(rebuild=args.rebuild)
+    records = index.records(args.start, args.end)
+    print(f"Folded in {read} new rows; {len(records)} user-days")
+    counts = Counter(record.mood for record in records)
+    for emoji in EMOJIS:
+        print(f"{emoji} {EMOJI_STATE_MAP[emoji]}: {counts[emoji]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
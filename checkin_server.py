@@ -0,0 +1,388 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import secrets
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from urllib.parse import parse_qs, urlsplit
+
+import main as mood_check
+from moods import EMOJIS, EMOJI_STATE_MAP, MOOD_RESPONSE_MAP
+
+DEFAULT_PORT = 8780
+CHECKINS_PATH = "/checkins"
+# Usernames that are safe as CSV fields and fit in the notification ledger
+USERNAME_PATTERN = re.compile(r"[\w.@-]{1,64}")
+MAX_BODY_BYTES = 4096
+MAX_HEADER_BYTES = 16384
+HISTORY_DAYS = 7
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+MOODS_BODY = {"moods": [
+    {"emoji": emoji, "state": EMOJI_STATE_MAP[emoji], "response": MOOD_RESPONSE_MAP[emoji]} for emoji in EMOJIS
+]}
+
+INDEX_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Mood Check-in</title>
+<style>
+body { font-family: Arial, Helvetica, sans-serif; text-align: center; color: #003049; }
+button { font-size: 48px; margin: 8px; border: none; border-radius: 15px; background: #f0f9ff; cursor: pointer; }
+#response { font-size: 24px; font-weight: bold; margin: 24px; }
+</style></head>
+<body>
+<h1>Hey, how was your day?</h1>
+<p><input id="token" type="password" placeholder="Check-in token (if your admin gave you one)"></p>
+<div id="moods"></div>
+<p id="response"></p>
+<script>
+fetch("/moods").then(r => r.json()).then(data => {
+  for (const mood of data.moods) {
+    const button = document.createElement("button");
+    button.textContent = mood.emoji;
+    button.title = mood.state;
+    button.onclick = () => submit(mood.emoji);
+    document.getElementById("moods").appendChild(button);
+  }
+});
+const tokenInput = document.getElementById("token");
+tokenInput.value = localStorage.getItem("moodcheckToken") || "";
+function submit(mood) {
+  const headers = {"Content-Type": "application/json"};
+  if (tokenInput.value) {
+    localStorage.setItem("moodcheckToken", tokenInput.value);
+    headers["Authorization"] = "Bearer " + tokenInput.value;
+  }
+  fetch("/checkins", {method: "POST", headers: headers, body: JSON.stringify({mood: mood})})
+    .then(r => r.json())
+    .then(data => { document.getElementById("response").textContent = data.response || data.error; });
+}
+</script>
+</body></html>
+""".encode("utf-8")
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _response(status, body, content_type="application/json; charset=utf-8", keep_alive=True):
+    if not isinstance(body, bytes):
+        body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("ascii") + body
+
+
+def load_tokens(path):
+    """Read a ``{"username": "token", ...}`` JSON file into a token -> username map."""
+    with open(path, 'r', encoding='utf-8') as f:
+        by_user = json.load(f)
+    tokens = {}
+    for username, token in by_user.items():
+        if not USERNAME_PATTERN.fullmatch(username) or not isinstance(token, str) or len(token) < 16:
+            raise ValueError(f"{path}: {username!r} needs a valid username and a token of 16+ characters")
+        if token in tokens:
+            raise ValueError(f"{path}: {username!r} and {tokens[token]!r} share a token")
+        tokens[token] = username
+    return tokens
+
+
+class CheckinServer:
+    """Headless HTTP check-in service for browser and kiosk clients, on one asyncio loop.
+
+    It offers the desktop window's five moods and responses, and records
+    submissions through ``mood_check.save_moods`` after the same
+    ``mood_check.check_notification_eligibility`` check, so check-ins land in
+    whichever MOOD_STORAGE backend and ledger the desktop app uses.
+
+    Callers never name themselves. The username comes from
+    ``trusted_header``, set by an authenticating reverse proxy, or from an
+    ``Authorization: Bearer`` token looked up in ``tokens``
+    (token -> username), and each caller can only check in as, and read
+    the eligibility and history of, that user. One of the two must be
+    given.
+
+    Disk work never runs on the event loop. Submissions that arrive while a
+    batch is being written are queued and group-committed as the next
+    batch by a single writer thread, so one write and one ledger update
+    are shared by every submit in the batch.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, tokens=None, trusted_header=None):
+        if not tokens and not trusted_header:
+            raise ValueError("the check-in server needs tokens or a trusted identity header")
+        self.host = host
+        self.port = port
+        self.tokens = tokens or {}
+        self.trusted_header = trusted_header.lower() if trusted_header else None
+        self.server = None
+        self.pending = []
+        self.flushing = False
+        # Users whose check-in today is accepted or being written, so
+        # concurrent duplicates are refused without another ledger lookup
+        self.checked_in = set()
+        self.checked_in_day = None
+        self.writer_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkin-writer")
+        self.batches = 0
+
+    @property
+    def address(self):
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        # Create the storage sink up front rather than racing to do it from worker threads
+        mood_check.get_mood_writer()
+        if mood_check.MOOD_STORAGE == "csv":
+            # /history is answered from the check-in index, kept current by each save
+            await asyncio.get_running_loop().run_in_executor(None, mood_check.get_checkin_index)
+        self.server = await asyncio.start_server(self._serve_connection, self.host, self.port,
+                                                 limit=MAX_HEADER_BYTES)
+        return self
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        while self.flushing:
+            await asyncio.sleep(0.01)
+        self.writer_pool.shutdown(wait=True)
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(413, {"error": "headers too large"}, keep_alive=False))
+                    return
+                method, target, headers = self._parse_head(head)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                length = int(headers.get("content-length", 0) or 0)
+                if length > MAX_BODY_BYTES:
+                    writer.write(_response(413, {"error": "body too large"}, keep_alive=False))
+                    return
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload, content_type = await self.handle(method, target, body, headers)
+                except HttpError as e:
+                    status, payload, content_type = e.status, {"error": str(e)}, "application/json; charset=utf-8"
+                writer.write(_response(status, payload, content_type, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head):
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = lines[0].split(" ", 2)
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def handle(self, method, target, body, headers=None):
+        """Return (status, JSON body or bytes, content type) for one request."""
+        headers = headers or {}
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        json_type = "application/json; charset=utf-8"
+        if url.path == "/" and method == "GET":
+            return 200, INDEX_HTML, "text/html; charset=utf-8"
+        if url.path == "/health" and method == "GET":
+            return 200, {"status": "ok"}, json_type
+        if url.path == "/moods" and method == "GET":
+            return 200, MOODS_BODY, json_type
+        if url.path == "/eligibility" and method == "GET":
+            username = self._caller(headers, query.get("username"))
+            return 200, {"username": username, "eligible": await self.is_eligible(username)}, json_type
+        if url.path == "/history" and method == "GET":
+            username = self._caller(headers, query.get("username"))
+            days = int(query.get("days", HISTORY_DAYS)) if query.get("days", "").isdigit() else HISTORY_DAYS
+            history = await asyncio.get_running_loop().run_in_executor(
+                None, mood_check.get_user_history, username, min(days, 366))
+            return 200, {"username": username, "history": history}, json_type
+        if url.path == CHECKINS_PATH:
+            if method != "POST":
+                raise HttpError(405, "use POST")
+            username = self._caller(headers)
+            try:
+                submission = json.loads(body)
+                mood = submission["mood"]
+                claimed = submission.get("username")
+            except (ValueError, KeyError, TypeError, AttributeError):
+                raise HttpError(400, 'body must be {"mood": ...}') from None
+            self._caller(headers, claimed)
+            return 200, await self.submit(username, mood), json_type
+        raise HttpError(404, "not found")
+
+    def _caller(self, headers, claimed=None):
+        """The authenticated username of the request; ``claimed`` may only repeat it."""
+        username = None
+        if self.trusted_header:
+            username = headers.get(self.trusted_header) or None
+        if username is None and self.tokens:
+            scheme, _, token = headers.get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer":
+                username = self.tokens.get(token.strip())
+        if username is None:
+            raise HttpError(401, "not authenticated")
+        if not USERNAME_PATTERN.fullmatch(username):
+            raise HttpError(403, "username must be 1-64 letters, digits or ._@-")
+        if claimed is not None and claimed != username:
+            raise HttpError(403, "you can only act as yourself")
+        return username
+
+    async def is_eligible(self, username):
+        today = date.today().isoformat()
+        if self.checked_in_day != today:
+            # Yesterday's reservations are settled in the ledger
+            self.checked_in, self.checked_in_day = set(), today
+        if username in self.checked_in:
+            return False
+        return await asyncio.get_running_loop().run_in_executor(
+            None, mood_check.check_notification_eligibility, username)
+
+    async def submit(self, username, mood):
+        """Record one check-in once its batch is written. Returns the client's response body."""
+        if mood not in EMOJI_STATE_MAP:
+            raise HttpError(400, f"mood must be one of {' '.join(EMOJIS)}")
+        if not await self.is_eligible(username):
+            raise HttpError(409, "already checked in today")
+        if username in self.checked_in:
+            # Another submit for this user got in while the ledger was read
+            raise HttpError(409, "already checked in today")
+        self.checked_in.add(username)
+        done = asyncio.get_running_loop().create_future()
+        self.pending.append((username, mood, done))
+        if not self.flushing:
+            self.flushing = True
+            asyncio.ensure_future(self._flush())
+        try:
+            await done
+        except Exception as e:
+            self.checked_in.discard(username)
+            raise HttpError(500, f"check-in not saved: {e}") from None
+        return {"username": username, "mood": mood, "state": EMOJI_STATE_MAP[mood],
+                "response": MOOD_RESPONSE_MAP[mood]}
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self.pending:
+                batch, self.pending = self.pending, []
+                try:
+                    await loop.run_in_executor(self.writer_pool, mood_check.save_moods,
+                                               [(username, mood) for username, mood, _ in batch])
+                except Exception as e:
+                    for _, _, done in batch:
+                        done.set_exception(e)
+                else:
+                    for _, _, done in batch:
+                        done.set_result(None)
+                self.batches += 1
+        finally:
+            self.flushing = False
+
+
+async def load_test(count, concurrency, host="127.0.0.1"):
+    """Submit ``count`` check-ins from ``concurrency`` keep-alive clients to a local server.
+
+    Storage goes to a temporary directory. Returns (submits per second, batches written).
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        saved = {name: getattr(mood_check, name) for name in ("MOOD_FILE", "NOTIFICATION_LEDGER_FILE", "MOOD_STORAGE")}
+        mood_check.MOOD_FILE = os.path.join(tmp_dir, "employee_mood_data.csv")
+        mood_check.NOTIFICATION_LEDGER_FILE = os.path.join(tmp_dir, "last_notification.idx")
+        mood_check.MOOD_STORAGE = "csv"
+        tokens = [secrets.token_hex(16) for _ in range(count)]
+        server = await CheckinServer(host, 0, tokens={token: f"user{i:06d}" for i, token in enumerate(tokens)}).start()
+        try:
+            port = server.address[1]
+
+            async def client(first):
+                reader, writer = await asyncio.open_connection(host, port)
+                for i in range(first, count, concurrency):
+                    body = json.dumps({"mood": EMOJIS[i % len(EMOJIS)]}).encode()
+                    writer.write(b"POST /checkins HTTP/1.1\r\nHost: local\r\nContent-Type: application/json\r\n"
+                                 + f"Authorization: Bearer {tokens[i]}\r\n".encode()
+                                 + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+                    head = await reader.readuntil(b"\r\n\r\n")
+                    length = int(CheckinServer._parse_head(head)[2]["content-length"])
+                    await reader.readexactly(length)
+                    if not head.startswith(b"HTTP/1.1 200"):
+                        raise RuntimeError(head.decode("latin-1").split("\r\n")[0])
+                writer.close()
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client(i) for i in range(concurrency)))
+            elapsed = time.perf_counter() - start
+        finally:
+            await server.close()
+            mood_check.get_mood_writer().close()
+            for name, value in saved.items():
+                setattr(mood_check, name, value)
+        return count / elapsed, server.batches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve mood check-ins over HTTP for browser and kiosk clients.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tokens", help='JSON file of {"username": "token"} for Authorization: Bearer')
+    parser.add_argument("--trusted-header", metavar="NAME",
+                        help="header holding the username, set by an authenticating proxy (e.g. X-Remote-User)")
+    parser.add_argument("--load-test", type=int, metavar="N",
+                        help="submit N check-ins to a throwaway local server and report the rate")
+    parser.add_argument("--concurrency", type=int, default=200, help="clients used by --load-test")
+    args = parser.parse_args(argv)
+
+    if args.load_test:
+        rate, batches = asyncio.run(load_test(args.load_test, args.concurrency, args.host))
+        print(f"{args.load_test} check-ins at {rate:.0f}/s in {batches} batches")
+        return 0
+
+    if not args.tokens and not args.trusted_header:
+        parser.error("give --tokens or --trusted-header so callers are authenticated")
+    try:
+        tokens = load_tokens(args.tokens) if args.tokens else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    mood_check.initialize_files()
+
+    async def serve():
+        server = await CheckinServer(args.host, args.port, tokens, args.trusted_header).start()
+        print(f"Serving check-ins on http://{args.host}:{server.address[1]}/")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
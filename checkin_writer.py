@@ -0,0 +1,87 @@
+import atexit
+import queue
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+import main
+
+# Check-ins waiting to be written; submit() refuses new ones past this
+MAX_PENDING_CHECKINS = 64
+
+
+class CheckinWriter(QObject):
+    """Persist check-ins on a background thread so the GUI never waits on disk.
+
+    ``saved``, ``failed`` and ``history_loaded`` are emitted from the writer
+    thread; Qt queues them onto the receiver's thread, so slots run on the
+    GUI thread. If ``load_history`` is given it is called after each
+    successful save, and its result (None if it raised) is sent with
+    ``history_loaded``, so history reads stay off the GUI thread too.
+    """
+
+    saved = Signal(str)
+    failed = Signal(str, str)
+    history_loaded = Signal(str, object)
+
+    def __init__(self, save=None, maxsize=MAX_PENDING_CHECKINS, parent=None, load_history=None):
+        super().__init__(parent)
+        # Resolved at call time so tests can patch main.save_mood
+        self.save = save or (lambda mood: main.save_mood(mood))
+        self.load_history = load_history
+        self.queue = queue.Queue(maxsize)
+        self.thread = None
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="checkin-writer", daemon=True)
+                self.thread.start()
+
+    def submit(self, mood):
+        """Queue a check-in for writing. Returns False if the queue is full."""
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(mood)
+        except queue.Full:
+            self.failed.emit(mood, "Too many check-ins are waiting to be saved")
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            mood = self.queue.get()
+            try:
+                if mood is None:
+                    return
+                try:
+                    self.save(mood)
+                except Exception as e:
+                    self.failed.emit(mood, str(e) or type(e).__name__)
+                else:
+                    self.saved.emit(mood)
+                    if self.load_history is not None:
+                        try:
+                            history = self.load_history()
+                        except Exception:
+                            # The strip is a nicety; the check-in is already saved
+                            history = None
+                        self.history_loaded.emit(mood, history)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Block until every queued check-in has been written."""
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self, timeout=None):
+        """Write everything still queued and stop the writer thread."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(None)
+        thread.join(timeout)
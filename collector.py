@@ -0,0 +1,338 @@
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from file_lock import FileLock
+from mood_writer import JournaledWriteError, MoodWriter
+from moods import MOOD_HEADER
+
+CHECKINS_PATH = "/checkins"
+DEFAULT_PORT = 8765
+# Row keys remembered by the collector, enough to cover any client's retry
+RECENT_IDS = 100000
+
+
+def valid_row(row):
+    """A [timestamp, username, mood, state] list of strings, as the collector accepts."""
+    return isinstance(row, list) and len(row) == 4 and all(isinstance(v, str) for v in row)
+
+
+class CollectorServer:
+    """HTTP collector that group-commits check-ins from many desktops into one store.
+
+    Each POST blocks until the batch containing its rows has been written,
+    so a 200 response means the rows are on disk. Rows arriving within
+    ``flush_interval`` of each other share one lock and one flush.
+    """
+
+    def __init__(self, store_path, host="127.0.0.1", port=DEFAULT_PORT,
+                 batch_size=500, flush_interval=0.05, fsync="batch"):
+        self.writer = MoodWriter(store_path, fsync=fsync, batch_size=batch_size, header=MOOD_HEADER)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # (rows, done, error) entries, one per request, for the next batch
+        self.pending = []
+        self.pending_rows = 0
+        # Batches written so far
+        self.generation = 0
+        # Recently queued row keys -> their entry, to absorb client retries
+        self.recent = OrderedDict()
+        self.cond = threading.Condition()
+        self.running = False
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.threads = []
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps client connections open between batches
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._reply(200, {"status": "ok"})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != CHECKINS_PATH:
+                    self._reply(404, {"error": "not found"})
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    payload = json.loads(self.rfile.read(length))
+                    rows, ids = payload["rows"], payload.get("ids")
+                    if not all(valid_row(row) for row in rows):
+                        raise ValueError("rows must be [timestamp, username, mood, state] lists")
+                    if ids is not None and (len(ids) != len(rows) or not all(isinstance(i, str) for i in ids)):
+                        raise ValueError("ids must be one string per row")
+                except (ValueError, KeyError, TypeError) as e:
+                    self._reply(400, {"error": str(e)})
+                    return
+                error = server.submit(rows, ids)
+                if error:
+                    self._reply(500, {"error": error})
+                else:
+                    self._reply(200, {"accepted": len(rows)})
+
+        return Handler
+
+    def submit(self, rows, ids=None):
+        """Queue rows and wait for the batch holding them to be written. Returns an error or None.
+
+        ``ids`` are the client's per-row keys. A row whose key was already
+        written, or is in a batch still being written, is not queued again,
+        so a client retrying after a timeout does not duplicate it.
+        """
+        if not rows:
+            return None
+        ids = ids or [None] * len(rows)
+        with self.cond:
+            waits, fresh, fresh_ids = [], [], []
+            for row, key in zip(rows, ids):
+                prior = self.recent.get(key) if key is not None else None
+                if prior is not None and prior["error"] is None:
+                    if not any(entry is prior for entry in waits):
+                        waits.append(prior)
+                    continue
+                fresh.append(row)
+                fresh_ids.append(key)
+            if fresh:
+                entry = {"rows": fresh, "done": False, "error": None}
+                self.pending.append(entry)
+                self.pending_rows += len(fresh)
+                for key in fresh_ids:
+                    if key is not None:
+                        self.recent[key] = entry
+                        self.recent.move_to_end(key)
+                while len(self.recent) > RECENT_IDS:
+                    self.recent.popitem(last=False)
+                waits.append(entry)
+                self.cond.notify_all()
+            while not all(entry["done"] for entry in waits):
+                self.cond.wait()
+            errors = [entry["error"] for entry in waits if entry["error"]]
+            return errors[0] if errors else None
+
+    def _flush_loop(self):
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    self.cond.wait()
+                if not self.running and not self.pending:
+                    return
+            # Give concurrent submitters a moment to join this batch
+            deadline = time.monotonic() + self.flush_interval
+            while time.monotonic() < deadline:
+                with self.cond:
+                    if self.pending_rows >= self.batch_size:
+                        break
+                time.sleep(min(0.005, self.flush_interval))
+            # Only the submitters whose entries are swapped out here are
+            # answered by this write; later ones wait for their own batch
+            with self.cond:
+                batch, self.pending, self.pending_rows = self.pending, [], 0
+            error = None
+            try:
+                self.writer.write([row for entry in batch for row in entry["rows"]])
+            except JournaledWriteError:
+                # Committed: the writer applies the journal on its next flush,
+                # so the clients must not send these rows again
+                pass
+            except Exception as e:
+                # Don't retry these rows here; the clients keep them spooled
+                self.writer.discard_pending()
+                error = str(e) or type(e).__name__
+            with self.cond:
+                self.generation += 1
+                for entry in batch:
+                    entry["error"] = error
+                    entry["done"] = True
+                self.cond.notify_all()
+
+    def start(self):
+        """Serve in background threads."""
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._flush_loop, name="collector-flush", daemon=True),
+            threading.Thread(target=self.httpd.serve_forever, name="collector-http", daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        with self.cond:
+            self.running = False
+            self.cond.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+
+class CollectorRejected(Exception):
+    """The collector answered 400: resending the same rows will never succeed."""
+
+
+class CollectorSink:
+    """``save_mood()`` sink that spools check-ins locally and ships them to a collector.
+
+    Rows are appended to an on-disk JSON-lines spool first, each with a
+    unique key, then everything in the spool is sent in one request over a
+    persistent connection. While the collector is unreachable the spool
+    keeps growing and sends are retried with exponential backoff; the keys
+    let the collector skip rows it already wrote before a timed-out reply.
+    Rows the collector refuses are moved to ``<spool>.rejected`` rather
+    than retried forever.
+    """
+
+    def __init__(self, url, spool_path, timeout=2.0, initial_backoff=1.0, max_backoff=300.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.path = spool_path
+        self.lock = FileLock(spool_path)
+        self.timeout = timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff = 0.0
+        self.next_attempt = 0.0
+        self.connection = None
+
+    def write(self, rows):
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json.dumps({"id": uuid.uuid4().hex, "row": list(row)}) + "\n")
+        self.flush()
+        return len(rows)
+
+    def flush(self, force=False):
+        """Send the spool if the backoff allows. Returns the number of rows delivered."""
+        if not force and time.monotonic() < self.next_attempt:
+            return 0
+        with self.lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    lines = f.read().splitlines()
+            except FileNotFoundError:
+                return 0
+            entries, rejected = [], []
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn line from a crash mid-append
+                    continue
+                if isinstance(entry, list):
+                    # Spooled before rows had keys; the line itself is stable across retries
+                    entry = {"id": hashlib.sha1(line.encode("utf-8")).hexdigest(), "row": entry}
+                if isinstance(entry, dict) and valid_row(entry.get("row")) and isinstance(entry.get("id"), str):
+                    entries.append(entry)
+                else:
+                    rejected.append(line)
+            if rejected:
+                self._quarantine(rejected)
+                self._rewrite(entries)
+            if not entries:
+                return 0
+            try:
+                self._post([entry["row"] for entry in entries], [entry["id"] for entry in entries])
+            except CollectorRejected:
+                self._quarantine([json.dumps(entry) for entry in entries])
+                os.truncate(self.path, 0)
+                return 0
+            except (OSError, http.client.HTTPException):
+                self._close_connection()
+                self.backoff = min(self.max_backoff, self.backoff * 2 or self.initial_backoff)
+                self.next_attempt = time.monotonic() + self.backoff
+                return 0
+            self.backoff = 0.0
+            self.next_attempt = 0.0
+            os.truncate(self.path, 0)
+            return len(entries)
+
+    def _quarantine(self, lines):
+        with open(self.path + ".rejected", 'a', encoding='utf-8') as f:
+            for line in lines:
+                f.write(line + "\n")
+
+    def _rewrite(self, entries):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _post(self, rows, ids):
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        body = json.dumps({"rows": rows, "ids": ids}).encode("utf-8")
+        self.connection.request("POST", CHECKINS_PATH, body, {"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        response.read()
+        if response.status == 400:
+            raise CollectorRejected(f"collector refused the rows: {response.status}")
+        if response.status != 200:
+            raise http.client.HTTPException(f"collector returned {response.status}")
+
+    def _close_connection(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def close(self):
+        self.flush(force=True)
+        self._close_connection()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect mood check-ins from desktop clients into one store.")
+    parser.add_argument("store", nargs="?", default="employee_mood_data.csv")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--flush-interval", type=float, default=0.05, help="seconds to gather a batch")
+    parser.add_argument("--fsync", choices=["none", "batch", "always"], default="batch")
+    args = parser.parse_args(argv)
+
+    server = CollectorServer(args.store, args.host, args.port, args.batch_size, args.flush_interval, args.fsync)
+    server.start()
+    print(f"Collecting check-ins on http://{args.host}:{server.address[1]}{CHECKINS_PATH}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
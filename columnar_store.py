@@ -0,0 +1,274 @@
+import os
+import struct
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from file_lock import FileLock
+from mood_reader import MoodReader
+from mood_writer import JOURNAL_HEADER
+from moods import EMOJI_STATE_MAP, TIMESTAMP_FORMAT, mood_code, mood_from_code
+
+# A .mcol file is a magic header followed by append-only row blocks. Each
+# block holds the three columns for its rows - delta-encoded int64 epoch
+# seconds, uint32 username ids and uint8 mood codes - zlib-compressed as one
+# payload. Username ids index into the sidecar ".users" dictionary (one name
+# per line). compact() folds small per-check-in blocks into a single block.
+MAGIC = b"MCOL\x01\x00\x00\x00"
+BLOCK_HEADER = struct.Struct("<4sII")  # tag, row count, compressed payload length
+BLOCK_TAG = b"ROWS"
+# Once this many trailing blocks fall in the same size tier (powers of
+# MERGE_FANOUT rows) they are merged into one, so n single-row check-ins
+# leave O(log n) blocks and each row is recompressed O(log n) times
+MERGE_FANOUT = 16
+# Timestamps are stored as wall-clock seconds since this naive epoch, so
+# they round-trip exactly without any timezone conversion
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(timestamp):
+    return int((datetime.strptime(timestamp, TIMESTAMP_FORMAT) - EPOCH).total_seconds())
+
+
+def from_epoch(seconds):
+    return (EPOCH + timedelta(seconds=int(seconds))).strftime(TIMESTAMP_FORMAT)
+
+
+def _encode_block(timestamps, user_ids, moods):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    deltas = np.diff(timestamps, prepend=np.int64(0))
+    payload = (deltas.astype("<i8").tobytes()
+               + np.asarray(user_ids, dtype="<u4").tobytes()
+               + np.asarray(moods, dtype=np.uint8).tobytes())
+    compressed = zlib.compress(payload, 6)
+    return BLOCK_HEADER.pack(BLOCK_TAG, len(timestamps), len(compressed)) + compressed
+
+
+def _tier(count):
+    tier = 0
+    while count >= MERGE_FANOUT:
+        count //= MERGE_FANOUT
+        tier += 1
+    return tier
+
+
+def _block_index(f):
+    """``[(offset, row count), ...]`` of the complete blocks in ``f``, and the offset where they end."""
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    magic = f.read(len(MAGIC))
+    if len(magic) < len(MAGIC):
+        # Empty, or torn before the header was complete
+        return [], 0
+    if magic != MAGIC:
+        raise ValueError(f"{f.name} is not a columnar mood store")
+    blocks = []
+    pos = len(MAGIC)
+    while pos + BLOCK_HEADER.size <= size:
+        f.seek(pos)
+        tag, count, length = BLOCK_HEADER.unpack(f.read(BLOCK_HEADER.size))
+        if tag != BLOCK_TAG or pos + BLOCK_HEADER.size + length > size:
+            break
+        blocks.append((pos, count))
+        pos += BLOCK_HEADER.size + length
+    return blocks, pos
+
+
+def _decode_block(count, compressed):
+    payload = zlib.decompress(compressed)
+    deltas = np.frombuffer(payload, dtype="<i8", count=count)
+    user_ids = np.frombuffer(payload, dtype="<u4", count=count, offset=8 * count)
+    moods = np.frombuffer(payload, dtype=np.uint8, count=count, offset=12 * count)
+    return np.cumsum(deltas), user_ids, moods
+
+
+def _decode_blocks(data):
+    """Decode consecutive blocks from ``data`` into columns, stopping at a truncated trailing block."""
+    blocks = []
+    pos = 0
+    while pos + BLOCK_HEADER.size <= len(data):
+        tag, count, length = BLOCK_HEADER.unpack_from(data, pos)
+        pos += BLOCK_HEADER.size
+        if tag != BLOCK_TAG or pos + length > len(data):
+            # Truncated trailing block from an interrupted append
+            break
+        blocks.append(_decode_block(count, data[pos:pos + length]))
+        pos += length
+    if not blocks:
+        return {
+            "timestamp": np.empty(0, dtype=np.int64),
+            "user_id": np.empty(0, dtype=np.uint32),
+            "mood": np.empty(0, dtype=np.uint8),
+        }
+    return {
+        "timestamp": np.concatenate([b[0] for b in blocks]),
+        "user_id": np.concatenate([b[1] for b in blocks]),
+        "mood": np.concatenate([b[2] for b in blocks]),
+    }
+
+
+class ColumnarMoodStore:
+    """Compact binary mood history; a drop-in sink for ``save_mood()``.
+
+    Each write appends one block. Trailing blocks of similar size are merged
+    as they accumulate, so a store fed one check-in at a time stays close
+    to the size ``compact()`` would give without any scheduled maintenance.
+    A merge rewrites the tail in place behind a journal, replayed by the
+    next writer or reader if the merging process died part way.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.users_path = path + ".users"
+        self.journal_path = path + ".journal"
+        self.lock = FileLock(path)
+
+    def _load_usernames(self):
+        try:
+            with open(self.users_path, 'r', encoding='utf-8') as f:
+                return f.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+    def write(self, rows):
+        """Append ``[timestamp, username, mood, state]`` rows as one block."""
+        if not rows:
+            return 0
+        with self.lock:
+            usernames = self._load_usernames()
+            ids = {name: i for i, name in enumerate(usernames)}
+            new_names = []
+            timestamps, user_ids, moods = [], [], []
+            for timestamp, username, mood, *_ in rows:
+                if username not in ids:
+                    ids[username] = len(ids)
+                    new_names.append(username)
+                timestamps.append(to_epoch(timestamp))
+                user_ids.append(ids[username])
+                moods.append(mood_code(mood))
+            if new_names:
+                with open(self.users_path, 'a', encoding='utf-8', newline='\n') as f:
+                    f.write("".join(name + "\n" for name in new_names))
+            block = _encode_block(timestamps, user_ids, moods)
+            self._recover()
+            with open(self.path, 'r+b' if os.path.exists(self.path) else 'w+b') as f:
+                blocks, end = _block_index(f)
+                # Cut off a block torn by an interrupted append, or the new
+                # block would be read as its missing payload
+                f.truncate(end)
+                f.seek(end)
+                if end == 0:
+                    f.write(MAGIC)
+                    end = len(MAGIC)
+                f.write(block)
+                blocks.append((end, len(rows)))
+                self._merge_tail(f, blocks)
+        return len(rows)
+
+    def _merge_tail(self, f, blocks):
+        while len(blocks) >= MERGE_FANOUT:
+            tail = blocks[-MERGE_FANOUT:]
+            tier = _tier(tail[0][1])
+            if any(_tier(count) != tier for _, count in tail):
+                return
+            start = tail[0][0]
+            f.seek(start)
+            columns = _decode_blocks(f.read())
+            merged = _encode_block(columns["timestamp"], columns["user_id"], columns["mood"])
+            self._write_journal(start, merged)
+            f.truncate(start)
+            f.seek(start)
+            f.write(merged)
+            f.flush()
+            os.remove(self.journal_path)
+            blocks[-MERGE_FANOUT:] = [(start, len(columns["timestamp"]))]
+
+    def _write_journal(self, offset, payload):
+        tmp_path = self.journal_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(JOURNAL_HEADER.pack(offset, len(payload), zlib.crc32(payload)))
+            f.write(payload)
+        # Renamed into place so a journal that exists is always complete
+        os.replace(tmp_path, self.journal_path)
+
+    def _recover(self):
+        """Finish a tail merge interrupted by a crash. Call with the lock held."""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                offset, length, crc = JOURNAL_HEADER.unpack(f.read(JOURNAL_HEADER.size))
+                payload = f.read()
+        except FileNotFoundError:
+            return False
+        if len(payload) == length and zlib.crc32(payload) == crc:
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+                f.seek(offset)
+                f.write(payload)
+        os.remove(self.journal_path)
+        return True
+
+    def flush(self):
+        return 0
+
+    def close(self):
+        pass
+
+    def scan(self):
+        """Return the whole history as columns: timestamp (int64), user_id (uint32), mood (uint8)."""
+        with self.lock:
+            self._recover()
+            try:
+                with open(self.path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = b""
+        if data and not data.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not a columnar mood store")
+        return _decode_blocks(data[len(MAGIC):])
+
+    @property
+    def usernames(self):
+        return self._load_usernames()
+
+    def rows(self):
+        """Yield decoded ``(timestamp, username, mood, state)`` tuples."""
+        columns = self.scan()
+        usernames = self._load_usernames()
+        for seconds, user_id, code in zip(columns["timestamp"], columns["user_id"], columns["mood"]):
+            mood = mood_from_code(code) or ""
+            yield from_epoch(seconds), usernames[user_id], mood, EMOJI_STATE_MAP.get(mood, "Unknown")
+
+    def compact(self):
+        """Rewrite the store as a single block so it scans and compresses optimally."""
+        with self.lock:
+            columns = self.scan()
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                if len(columns["timestamp"]):
+                    f.write(_encode_block(columns["timestamp"], columns["user_id"], columns["mood"]))
+            os.replace(tmp_path, self.path)
+
+
+def convert_csv(csv_path, store_path, batch_size=100000):
+    """Convert a mood CSV into a columnar store. Returns (rows converted, rows skipped)."""
+    reader = MoodReader(csv_path)
+    store = ColumnarMoodStore(store_path)
+    batch = []
+    for record in reader:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            store.write(batch)
+            batch = []
+    store.write(batch)
+    store.compact()
+    return reader.stats["rows"], sum(reader.rejected.values())
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3:
+        sys.exit("usage: python columnar_store.py <mood.csv> <store.mcol>")
+    converted, skipped = convert_csv(sys.argv[1], sys.argv[2])
+    print(f"Converted {converted} rows ({skipped} skipped)")
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+
+from log_checkpoint import LogCheckpoint
+from mood_reader import MoodReader
+from moods import EMOJIS, EMOJI_STATE_MAP, MOOD_CODES
+
+
+class DailyAggregates:
+    """Per-day, per-mood check-in counts maintained incrementally in a sidecar file.
+
+    ``refresh`` folds in only the rows appended to the mood log since the
+    last checkpoint, so its cost and the cost of ``counts`` stay flat as the
+    history grows.
+    """
+
+    def __init__(self, mood_path, store_path=None):
+        self.mood_path = mood_path
+        self.store_path = store_path or mood_path + ".daily.json"
+        self.checkpoint = LogCheckpoint(mood_path, self.store_path)
+        self.lock = self.checkpoint.lock
+
+    def refresh(self, rebuild=False):
+        """Fold newly appended rows into the aggregates. Returns the number of rows added."""
+        with self.lock:
+            state = self.checkpoint.load()
+            if rebuild or self.checkpoint.is_stale(state):
+                state = self.checkpoint.reset(days={}, rejected=0)
+            if not os.path.exists(self.mood_path):
+                self.checkpoint.save(state)
+                return 0
+            reader = MoodReader(self.mood_path, start_offset=state["offset"])
+            days = state["days"]
+            for record in reader:
+                day = record.timestamp[:10]
+                counts = days.setdefault(day, [0] * len(EMOJIS))
+                counts[MOOD_CODES[record.mood]] += 1
+            self.checkpoint.advance(state, reader.offset)
+            state["rejected"] += sum(reader.rejected.values())
+            self.checkpoint.save(state)
+            return reader.stats["rows"]
+
+    def counts(self, start=None, end=None):
+        """Return ``{day: {state: count}}`` for ISO days in [start, end] from the sidecar only."""
+        state = self.checkpoint.load() or {"days": {}}
+        return {
+            day: dict(zip((EMOJI_STATE_MAP[e] for e in EMOJIS), counts))
+            for day, counts in sorted(state["days"].items())
+            if (start is None or day >= start) and (end is None or day <= end)
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally maintain daily mood counts.")
+    parser.add_argument("path", nargs="?", default="employee_mood_data.csv")
+    parser.add_argument("--rebuild", action="store_true", help="discard the checkpoint and recount everything")
+    parser.add_argument("--start", help="first ISO day to print")
+    parser.add_argument("--end", help="last ISO day to print")
+    args = parser.parse_args(argv)
+
+    aggregates = DailyAggregates(args.path)
+    added = aggregates.refresh(rebuild=args.rebuild)
+    print(f"Folded in {added} new rows")
+    for day, counts in aggregates.counts(args.start, args.end).items():
+        print(day, ", ".join(f"{state}: {count}" for state, count in counts.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,13 @@
 # Mood Check Application Deployment Script for Intune
 # This script installs and configures the Mood Check application
 
+param(
+    # Keep one tray process running per user instead of starting one per prompt
+    [switch]$Resident,
+    # Daily prompt time (HH:MM) for -Resident
+    [string]$PromptTime = "10:00"
+)
+
 # Error handling
 $ErrorActionPreference = "Stop"
 $LogFile = "$env:ProgramData\MoodCheck\install.log"
@@ -35,6 +42,24 @@ try {
     Write-Log "Copying application files..."
     $RequiredFiles = @(
         "pyside6new.py",
+        "file_lock.py",
+        "notification_ledger.py",
+        "mood_writer.py",
+        "moods.py",
+        "columnar_store.py",
+        "mood_reader.py",
+        "mood_window.py",
+        "startup_profile.py",
+        "resources.py",
+        "spinner.py",
+        "resident.py",
+        "checkin_writer.py",
+        "collector.py",
+        "sqlite_store.py",
+        "segment_store.py",
+        "time_index.py",
+        "log_checkpoint.py",
+        "user_history.py",
         "requirements.txt",
         "Shorthills Logo Light Bg.png"
     )
@@ -43,16 +68,29 @@ try {
         Copy-Item -Path "$PSScriptRoot\$file" -Destination "$InstallDir\" -Force
     }
 
+    # Pre-scaled assets generated with "python resources.py", if packaged
+    if (Test-Path "$PSScriptRoot\embedded_assets.py") {
+        Copy-Item -Path "$PSScriptRoot\embedded_assets.py" -Destination "$InstallDir\" -Force
+    }
+
     # Install Python dependencies
     Write-Log "Installing Python dependencies..."
     Start-Process -FilePath "python" -ArgumentList "-m", "pip", "install", "-r", "$InstallDir\requirements.txt" -Wait
 
     # Create startup task
     Write-Log "Creating startup task..."
-    $Action = New-ScheduledTaskAction -Execute "pythonw.exe" -Argument "`"$InstallDir\main.py`""
+    $Arguments = "`"$InstallDir\main.py`""
+    if ($Resident) {
+        $Arguments += " --resident --prompt-at $PromptTime"
+    }
+    $Action = New-ScheduledTaskAction -Execute "pythonw.exe" -Argument $Arguments
     $Trigger = New-ScheduledTaskTrigger -AtLogOn
     $Principal = New-ScheduledTaskPrincipal -GroupId "BUILTIN\Users" -RunLevel Highest
     $Settings = New-ScheduledTaskSettingsSet -AllowStartIfOnBatteries -DontStopIfGoingOnBatteries -Hidden
+    if ($Resident) {
+        # The resident process runs for the whole session
+        $Settings.ExecutionTimeLimit = "PT0S"
+    }
     
     Register-ScheduledTask -TaskName "MoodCheck" -Action $Action -Trigger $Trigger -Principal $Principal -Settings $Settings -Force
 
@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+class FileLock:
+    """Cross-process exclusive lock backed by a sidecar ``.lock`` file."""
+
+    def __init__(self, path, timeout=10.0, poll_interval=0.01):
+        self.path = path + ".lock"
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+        self._depth = 0
+
+    def acquire(self):
+        if self._depth:
+            self._depth += 1
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if sys.platform == "win32":
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"Could not lock {self.path} within {self.timeout}s")
+                time.sleep(self.poll_interval)
+        self._fd = fd
+        self._depth = 1
+
+    def release(self):
+        if not self._depth:
+            return
+        self._depth -= 1
+        if self._depth:
+            return
+        try:
+            if sys.platform == "win32":
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,241 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+from PySide6.QtCore import QCoreApplication, QEvent, QEventLoop, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+
+import benchmarks
+from mood_window import SPINNER_DURATION_MS, MoodWindow
+from moods import EMOJIS
+
+DEFAULT_CONSTRUCTIONS = 20
+DEFAULT_RESIZE_EVENTS = 500
+DEFAULT_SUBMITS = 20
+# A gap this long between event-loop turns is visible as a hitch
+STALL_THRESHOLD_MS = 50
+PAINT_TIMEOUT_S = 5.0
+# Key used for these results in the shared benchmark baseline file
+BASELINE_KEY = "gui"
+
+
+def ensure_app():
+    return QApplication.instance() or QApplication([])
+
+
+def make_window():
+    """Build a window whose check-ins are discarded instead of written to the data files.
+
+    The history strip still loads through the real path, as it would after a save.
+    """
+    window = MoodWindow()
+    window.checkin_writer.save = lambda mood: None
+    return window
+
+
+def select_mood(window, mood):
+    for layout in window.emoji_layouts:
+        button = layout.itemAt(0).widget()
+        if button.text() == mood:
+            window.on_mood_select(mood, button)
+            return button
+    raise ValueError(f"no button for {mood!r}")
+
+
+def dispose(window):
+    window.checkin_writer.close()
+    window.close()
+    window.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    QApplication.processEvents()
+
+
+def run_event_loop(duration_ms):
+    loop = QEventLoop()
+    QTimer.singleShot(duration_ms, loop.quit)
+    loop.exec()
+
+
+class FirstPaint(QObject):
+    """Event filter that records when its widget is first painted."""
+
+    def __init__(self, widget):
+        super().__init__(widget)
+        self.painted_at = None
+        widget.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and self.painted_at is None:
+            self.painted_at = time.perf_counter()
+        return False
+
+
+class StallMonitor(QObject):
+    """Measure gaps between event-loop turns with a fast repeating timer.
+
+    Any work that blocks the GUI thread shows up as one long gap; gaps over
+    ``threshold_ms`` are counted as stalls.
+    """
+
+    def __init__(self, interval_ms=1, threshold_ms=STALL_THRESHOLD_MS):
+        super().__init__()
+        self.threshold_ms = threshold_ms
+        self.gaps = []
+        self.last = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self.last is not None:
+            self.gaps.append(now - self.last)
+        self.last = now
+
+    def start(self):
+        self.gaps = []
+        self.last = time.perf_counter()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self._tick()
+
+    @property
+    def stalls(self):
+        return sum(1 for gap in self.gaps if gap * 1000 > self.threshold_ms)
+
+
+def bench_construction(count=DEFAULT_CONSTRUCTIONS):
+    """Time ``MoodWindow()`` (which includes ``init_ui()`` and the first show) ``count`` times."""
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        window = make_window()
+        samples.append(time.perf_counter() - start)
+        dispose(window)
+    return samples
+
+
+def bench_resize_storm(events=DEFAULT_RESIZE_EVENTS, seed=0):
+    """Replay a drag-resize: ``events`` sizes, each delivered and processed like a live resize."""
+    rng = random.Random(seed)
+    window = make_window()
+    try:
+        minimum = window.minimumSize()
+        width, height = window.width(), window.height()
+        samples = []
+        for _ in range(events):
+            # A drag moves the edge a few pixels per event
+            width = min(1920, max(minimum.width(), width + rng.randint(-12, 12)))
+            height = min(1080, max(minimum.height(), height + rng.randint(-8, 8)))
+            start = time.perf_counter()
+            window.resize(width, height)
+            QApplication.processEvents()
+            samples.append(time.perf_counter() - start)
+        # Let the trailing restyle land so it is not billed to the next run
+        run_event_loop(window.resize_timer.interval() * 2)
+        return samples
+    finally:
+        dispose(window)
+
+
+def bench_submit(count=DEFAULT_SUBMITS, seed=0):
+    """Time from ``submit_mood()`` to the first paint of the spinner, ``count`` times."""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        window = make_window()
+        try:
+            select_mood(window, rng.choice(EMOJIS))
+            start = time.perf_counter()
+            window.submit_mood()
+            painted = FirstPaint(window.spinner)
+            deadline = start + PAINT_TIMEOUT_S
+            while painted.painted_at is None:
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("spinner was never painted")
+                QApplication.processEvents(QEventLoop.AllEvents, 5)
+            samples.append(painted.painted_at - start)
+        finally:
+            dispose(window)
+    return samples
+
+
+def bench_stalls(duration_ms=SPINNER_DURATION_MS, threshold_ms=STALL_THRESHOLD_MS):
+    """Watch the event loop through a submit and the spinner animation that follows it."""
+    window = make_window()
+    monitor = StallMonitor(threshold_ms=threshold_ms)
+    try:
+        select_mood(window, EMOJIS[0])
+        monitor.start()
+        window.submit_mood()
+        run_event_loop(duration_ms)
+        monitor.stop()
+        return monitor
+    finally:
+        dispose(window)
+
+
+def run(constructions=DEFAULT_CONSTRUCTIONS, resize_events=DEFAULT_RESIZE_EVENTS,
+        submits=DEFAULT_SUBMITS, stall_ms=SPINNER_DURATION_MS, seed=0):
+    """Return a report in the same shape as ``benchmarks.run()``."""
+    ensure_app()
+    report = {
+        "window_construction": benchmarks.summarize(bench_construction(constructions)),
+        "resize_event": benchmarks.summarize(bench_resize_storm(resize_events, seed)),
+        "submit_to_spinner_paint": benchmarks.summarize(bench_submit(submits, seed)),
+    }
+    monitor = bench_stalls(stall_ms)
+    gaps = benchmarks.summarize(monitor.gaps)
+    gaps["max_ms"] = round(max(monitor.gaps) * 1000, 4)
+    gaps["stalls"] = monitor.stalls
+    report["event_loop_gap"] = gaps
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MoodWindow construction, resizing and submit latency.")
+    parser.add_argument("--constructions", type=int, default=DEFAULT_CONSTRUCTIONS)
+    parser.add_argument("--resize-events", type=int, default=DEFAULT_RESIZE_EVENTS)
+    parser.add_argument("--submits", type=int, default=DEFAULT_SUBMITS)
+    parser.add_argument("--stall-ms", type=int, default=SPINNER_DURATION_MS,
+                        help="how long to watch the event loop after a submit")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=benchmarks.BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit 1 if anything regressed or the loop stalled")
+    parser.add_argument("--tolerance", type=float, default=benchmarks.DEFAULT_TOLERANCE)
+    parser.add_argument("--p99-tolerance", type=float, default=benchmarks.DEFAULT_P99_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    # Headless by default; QT_QPA_PLATFORM=xcb etc. still wins if set
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    ensure_app()
+    report = run(args.constructions, args.resize_events, args.submits, args.stall_ms, args.seed)
+    print(benchmarks.format_report(report))
+    print(f"event loop: max gap {report['event_loop_gap']['max_ms']} ms, "
+          f"{report['event_loop_gap']['stalls']} stalls over {STALL_THRESHOLD_MS} ms")
+    if args.save_baseline:
+        benchmarks.save_baseline(args.baseline, BASELINE_KEY, report)
+        print(f"Saved baseline to {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+            return 1
+        regressions = benchmarks.compare(report, benchmarks.load_baseline(args.baseline).get(BASELINE_KEY, {}),
+                                         args.tolerance, args.p99_tolerance)
+        if report["event_loop_gap"]["stalls"]:
+            regressions.append(f"event loop stalled {report['event_loop_gap']['stalls']} times")
+        for message in regressions:
+            print("REGRESSION", message)
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
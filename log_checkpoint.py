@@ -0,0 +1,63 @@
+import json
+import os
+import zlib
+
+from file_lock import FileLock
+
+# Bytes at the start of the log covered by the checkpoint fingerprint. If
+# they change (or the log shrinks below the checkpoint) the log was rewritten
+# rather than appended to, and whatever was built from it is rebuilt from scratch.
+FINGERPRINT_BYTES = 4096
+
+
+def fingerprint(path, length):
+    """CRC of the first ``length`` (at most FINGERPRINT_BYTES) bytes of ``path``."""
+    with open(path, 'rb') as f:
+        return zlib.crc32(f.read(min(length, FINGERPRINT_BYTES)))
+
+
+class LogCheckpoint:
+    """How far into an append-only mood log a derived view has read, kept in a JSON sidecar.
+
+    The state is a dict holding the log ``offset`` read up to and the
+    ``fingerprint`` of the log at that point, plus whatever the view itself
+    stores. Views take ``lock`` around load, fold-in and save, so processes
+    sharing the log don't fold the same rows in twice.
+    """
+
+    def __init__(self, log_path, state_path):
+        self.log_path = log_path
+        self.state_path = state_path
+        self.lock = FileLock(state_path)
+
+    def load(self):
+        """The saved state, or None if there is none or it is unreadable."""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(self, state):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def is_stale(self, state):
+        """True if ``state`` can't be extended: missing, or the log was rewritten or removed since."""
+        if state is None or not os.path.exists(self.log_path):
+            return True
+        if os.path.getsize(self.log_path) < state["offset"]:
+            return True
+        return fingerprint(self.log_path, state["offset"]) != state["fingerprint"]
+
+    @staticmethod
+    def reset(**fields):
+        """A state covering none of the log, with the view's own empty ``fields``."""
+        return {"offset": 0, "fingerprint": 0, **fields}
+
+    def advance(self, state, offset):
+        """Record in ``state`` that the log has been read up to ``offset``."""
+        state["offset"] = offset
+        state["fingerprint"] = fingerprint(self.log_path, offset)
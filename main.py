@@ -1,478 +1,313 @@
+import startup_profile
 import os
 import getpass
 from datetime import datetime, date
 import csv
-from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
-                              QPushButton, QLabel, QSystemTrayIcon, QMessageBox, QSizePolicy)
-from PySide6.QtGui import QLinearGradient, QPainter, QColor, QIcon, QPixmap
-from PySide6.QtCore import Qt, QTimer
 import sys
+import atexit
+import argparse
+import threading
+from file_lock import FileLock
+from notification_ledger import NotificationLedger, migrate_text_ledger
+from mood_writer import MoodWriter
+from moods import EMOJI_STATE_MAP, EMOJIS, MOOD_HEADER, MOOD_RESPONSE_MAP, TIMESTAMP_FORMAT
  
 # File paths
 MOOD_FILE = "employee_mood_data.csv"
+COLUMNAR_MOOD_FILE = "employee_mood_data.mcol"
+COLLECTOR_SPOOL_FILE = "collector_spool.jsonl"
+COLLECTOR_URL = os.environ.get("MOODCHECK_COLLECTOR_URL", "http://127.0.0.1:8765")
 LAST_NOTIFICATION_FILE = "last_notification.txt"
- 
-# Emojis and their corresponding states
-EMOJI_STATE_MAP = {
-    "😄": "Thrivin'",
-    "😊": "Chillin'",
-    "😐": "Meh!",
-    "😔": "Low Key",
-    "😞": "Cooked >_>"
-}
-EMOJIS = list(EMOJI_STATE_MAP.keys())
- 
-# Define colors for each mood
-EMOJI_COLOR_MAP = {
-    "😄": {"hover": "#90EE90", "pressed": "#70e000", "checked": "#9ef01a"},
-    "😊": {"hover": "#ADD8E6", "pressed": "#00b4d8", "checked": "#56cfe1"},
-    "😐": {"hover": "#D3D3D3", "pressed": "#A9A9A9", "checked": "#ced4da"},
-    "😔": {"hover": "#FFDAB9", "pressed": "#FFA07A", "checked": "#FF7F50"},
-    "😞": {"hover": "#FFB6C1", "pressed": "#FF6347", "checked": "#FF4500"},
-}
- 
-SPINNER_DURATION_MS = 2000
- 
-SPINNER_FRAMES = ["😄", "😊", "😐", "😔", "😞"]
- 
-MOOD_RESPONSE_MAP = {
-    "😄": "Yaaas! Love to see you thriving! Keep that energy up!",
-    "😊": "Smooth sailing. Glad you're vibing. Keep it mellow!",
-    "😐": "Fair enough. Not every day's a banger. Tomorrow's a reset.",
-    "😔": "Aww, sending a little sunshine your way. Hope today feels lighter.",
-    "😞": "Oh no, you got roasted by the day! Hope today serves better vibes."
-}
+NOTIFICATION_LEDGER_FILE = "last_notification.idx"
+STARTUP_PROFILE_FILE = "startup_profile.jsonl"
+SQLITE_DB_FILE = "moodcheck.db"
+MOOD_SEGMENT_DIR = "mood_segments"
+# Held for the life of a --resident process so each user runs only one
+RESIDENT_LOCK_FILE = "moodcheck_resident"
+# Daily "HH:MM" at which the --resident tray process shows the prompt
+RESIDENT_PROMPT_TIME = os.environ.get("MOODCHECK_PROMPT_TIME", "10:00")
+# "none", "batch" or "always"; see mood_writer.FSYNC_POLICIES
+MOOD_FSYNC_POLICY = "batch"
+# Where save_mood() writes: "csv" (MOOD_FILE), "columnar" (COLUMNAR_MOOD_FILE)
+# "collector" (sent to COLLECTOR_URL, spooled in COLLECTOR_SPOOL_FILE),
+# "sqlite" (SQLITE_DB_FILE, which then also holds the notification ledger) or
+# "segmented" (one CSV per month under MOOD_SEGMENT_DIR, see segment_store)
+MOOD_STORAGE = os.environ.get("MOODCHECK_STORAGE", "csv")
  
 def initialize_files():
-    if not os.path.exists(MOOD_FILE):
+    # A segmented store creates its directory and segments on first write
+    if MOOD_STORAGE != "segmented" and not os.path.exists(MOOD_FILE):
         with open(MOOD_FILE, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(["Timestamp", "Username", "Mood", "State"])
+            writer.writerow(MOOD_HEADER)
     if not os.path.exists(LAST_NOTIFICATION_FILE):
         with open(LAST_NOTIFICATION_FILE, 'w') as f:
             f.write("")
+    elif not os.path.exists(NOTIFICATION_LEDGER_FILE):
+        # One-time migration from the legacy "user,date" text file
+        migrate_text_ledger(LAST_NOTIFICATION_FILE, NOTIFICATION_LEDGER_FILE)
  
-def check_notification_eligibility():
-    username = getpass.getuser()
+def check_notification_eligibility(username=None):
+    """Return False if the user (by default the logged-in one) has already checked in today.
+
+    This runs before any PySide6 import: it is a single ledger lookup, so a
+    user who is done for the day exits within milliseconds.
+    """
+    username = username or getpass.getuser()
     today = date.today().isoformat()
-    last_notifications = {}
-    try:
-        with open(LAST_NOTIFICATION_FILE, 'r') as f:
-            for line in f:
-                if line.strip():
-                    parts = line.strip().split(',')
-                    if len(parts) == 2:
-                        user, last_date = parts
-                        last_notifications[user] = last_date
-    except FileNotFoundError:
-        pass
-    if username in last_notifications and last_notifications[username] == today:
-        return True
+    if _notification_ledger().get(username) == today:
+        return False
     return True
  
-def update_notification_time():
-    username = getpass.getuser()
+def update_notification_time(username=None):
+    username = username or getpass.getuser()
     today = date.today().isoformat()
-    last_notifications = {}
-    try:
-        with open(LAST_NOTIFICATION_FILE, 'r') as f:
-            for line in f:
-                if line.strip():
-                    user, last_date = line.strip().split(',')
-                    last_notifications[user] = last_date
-    except FileNotFoundError:
-        pass
-    last_notifications[username] = today
-    with open(LAST_NOTIFICATION_FILE, 'w') as f:
-        for user, last_date in last_notifications.items():
-            f.write(f"{user},{last_date}\n")
- 
-def save_mood(mood):
-    username = getpass.getuser()
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    state = EMOJI_STATE_MAP.get(mood, "Unknown")
-    with open(MOOD_FILE, 'a', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow([timestamp, username, mood, state])
-    update_notification_time()
- 
-# (all imports and constants remain the same)
- 
-class MoodWindow(QWidget):
-    def __init__(self):
-        super().__init__()
-        # Set window flags to show standard window decorations
-        self.setWindowFlags(
-            Qt.Window |  # Use Window to get standard title bar
-            Qt.WindowTitleHint |  # Show title
-            Qt.WindowSystemMenuHint |  # Show system menu
-            Qt.WindowMinimizeButtonHint |  # Show minimize button
-            Qt.WindowMaximizeButtonHint |  # Show maximize button
-            Qt.WindowCloseButtonHint  # Show close button
-        )
-        # Set minimum size but allow resizing
-        self.setMinimumSize(800, 450)
-        self.setWindowTitle("Mood Check-in")
-        self.setStyleSheet("""
-            background-color: #ffffff;
-            border-radius: 20px;
-            font-family: Arial, Helvetica, sans-serif;
-        """)
-        
-        self.selected_mood = None
-        self.selected_button = None
-        self.spinner_label = None
-        self.spinner_timer = None
-        self.spinner_index = 0
-        
-        # Create a central container widget that can resize
-        self.central_widget = QWidget(self)
-        self.central_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.central_widget.setStyleSheet("""
-            background-color: #ffffff;
-            border-radius: 20px;
-        """)
-        
-        self.init_ui()
-        # Center window after showing it
-        self.show()
-        QApplication.processEvents()
-        self.center_window()
-
-    def resizeEvent(self, event):
-        """Handle window resize events"""
-        super().resizeEvent(event)
-        # Make central widget fill the window
-        self.central_widget.setGeometry(0, 0, event.size().width(), event.size().height())
-        
-        # Calculate new sizes based on window dimensions
-        window_width = event.size().width()
-        window_height = event.size().height()
-        
-        # Base size calculation that ensures scaling
-        base_size = min(window_width // 8, window_height // 4)
-        base_size = max(base_size, 80)  # Ensure minimum size
-        
-        # Update button sizes
-        for layout in self.emoji_layouts:
-            for i in range(layout.count()):
-                item = layout.itemAt(i)
-                if isinstance(item.widget(), QPushButton):
-                    button = item.widget()
-                    # Calculate sizes based on window dimensions
-                    button_width = max(base_size, window_width // 8)
-                    button_height = int(button_width * 1.1)  # Keep aspect ratio
-                    font_size = max(30, min(50, button_width // 2))
-                    
-                    # Get the emoji for this button to determine colors
-                    emoji = button.text()
-                    colors = EMOJI_COLOR_MAP.get(emoji, {"hover": "#f0f9ff", "pressed": "#d1e7ff", "checked": "#d1e7ff"})
-                    
-                    # Create a properly formatted stylesheet
-                    style = """
-                        QPushButton {
-                            font-size: %dpx;
-                            background-color: #ffffff;
-                            color: #2c3e50;
-                            border: none;
-                            border-radius: 15px;
-                            padding: 15px;
-                            min-width: %dpx;
-                            min-height: %dpx;
-                        }
-                        QPushButton:hover {
-                            background-color: %s;
-                        }
-                        QPushButton:pressed {
-                            background-color: %s;
-                        }
-                        QPushButton:checked {
-                            background-color: %s;
-                            border: 3px solid %s;
-                        }
-                    """ % (
-                        font_size,
-                        button_width,
-                        button_height,
-                        colors['hover'],
-                        colors['pressed'],
-                        colors['checked'],
-                        colors['pressed']
-                    )
-                    
-                    button.setStyleSheet(style)
-                    button.updateGeometry()
-
-    def center_window(self):
-        """Center the window on the screen"""
-        # Get the screen geometry
-        screen = QApplication.primaryScreen().availableGeometry()
-        
-        # Get the window geometry
-        window_frame = self.frameGeometry()
-        
-        # Calculate the center point
-        center_point = screen.center()
-        
-        # Move the window's center to the screen's center
-        window_frame.moveCenter(center_point)
-        
-        # Use move instead of setGeometry to preserve size
-        self.move(window_frame.x(), window_frame.y())
-        
-        # Process events to ensure the window is positioned
-        QApplication.processEvents()
-
-    def init_ui(self):
-        self.main_layout = QVBoxLayout(self.central_widget)  # Set layout on central widget
-        self.main_layout.setContentsMargins(20, 20, 20, 20)
-        self.main_layout.setSpacing(20)
+    _notification_ledger().set(username, today)
 
-        # Top layout for logo and label
-        top_layout = QHBoxLayout()
-        top_layout.setContentsMargins(0, 30, 0, 0)  # Added 30px top margin
-        top_layout.setSpacing(20)
-
-        # Label
-        label = QLabel("How did yesterday treat you?")
-        label.setObjectName("question_label")
-        label.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: #003049;
-            background: transparent;
-            margin-top: 10px;
-            margin-left: 40px;  /* Added left margin to shift text right */
-        """)
-        label.setAlignment(Qt.AlignCenter)
-        top_layout.addWidget(label, 1)
-
-        # Logo
-        self.logo_label = QLabel()
-        logo_pixmap = QPixmap("Shorthills Logo Light Bg.png")
-        self.logo_label.setPixmap(logo_pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        top_layout.addWidget(self.logo_label)
-
-        # Add top layout to main layout
-        self.main_layout.addLayout(top_layout)
-
-        # Add spacer to push content to center
-        self.main_layout.addStretch(2)  # Increased weight for top stretch
-
-        # Emoji buttons layout
-        self.button_layout = QHBoxLayout()
-        self.button_layout.setSpacing(30)
-        self.button_layout.setAlignment(Qt.AlignCenter)
-
-        self.emoji_layouts = []  # Initialize the list
-        for emoji, state in EMOJI_STATE_MAP.items():
-            emoji_layout = QVBoxLayout()
-            emoji_layout.setSpacing(5)
-            colors = EMOJI_COLOR_MAP.get(emoji, {"hover": "#f0f9ff", "pressed": "#d1e7ff", "checked": "#d1e7ff"})
-            button_style = f"""
-                QPushButton {{
-                    font-size: 50px;
-                    background-color: #ffffff;
-                    color: #2c3e50;
-                    border: none;
-                    border-radius: 15px;
-                    padding: 15px;
-                    min-width: 80px;
-                    min-height: 90px;
-                }}
-                QPushButton:hover {{
-                    background-color: {colors['hover']};
-                }}
-                QPushButton:pressed {{
-                    background-color: {colors['pressed']};
-                }}
-                QPushButton:checked {{
-                    background-color: {colors['checked']};
-                    border: 3px solid {colors['pressed']};
-                }}
-            """
-            btn = QPushButton(emoji)
-            btn.setStyleSheet(button_style)
-            btn.setCheckable(True)
-            btn.clicked.connect(lambda checked, e=emoji, b=btn: self.on_mood_select(e, b))
-            emoji_layout.addWidget(btn, alignment=Qt.AlignCenter)
-            text_label = QLabel(state)
-            text_label.setStyleSheet("""
-                font-size: 16px;
-                font-weight: bold;
-                color: #003049;
-                background: transparent;
-            """)
-            text_label.setAlignment(Qt.AlignCenter)
-            emoji_layout.addWidget(text_label, alignment=Qt.AlignCenter)
-            self.button_layout.addLayout(emoji_layout)
-            self.emoji_layouts.append(emoji_layout)
-
-        self.main_layout.addLayout(self.button_layout)
-
-        # Add spacer to push content to center
-        self.main_layout.addStretch(3)  # Increased weight for bottom stretch
-
-        self.send_button = QPushButton("Send")
-        self.send_button.setStyleSheet("""
-            QPushButton {
-                font-family: Helvetica;
-                font-size: 20px;
-                font-weight: bold;
-                color: white;
-                background-color: #FF6F61;
-                border: 2px solid #283618;
-                border-radius: 15px;
-                padding: 8px;
-                min-width: 100px;
-                background-clip: padding-box;
-            }
-            QPushButton:hover {
-                background-color: #E65C50;
-            }
-            QPushButton:pressed {
-                background-color: #CC5247;
-            }
-        """)
-        self.send_button.clicked.connect(self.submit_mood)
-        self.main_layout.addWidget(self.send_button, alignment=Qt.AlignCenter)
-
-        self.dynamic_container = QVBoxLayout()
-        self.dynamic_container.setSpacing(20)
-        self.main_layout.addLayout(self.dynamic_container)
-
-    def on_mood_select(self, mood, button):
-        if self.selected_button:
-            self.selected_button.setChecked(False)
-        self.selected_mood = mood
-        self.selected_button = button
-        button.setChecked(True)
+def _notification_ledger():
+    if MOOD_STORAGE == "sqlite":
+        return get_mood_writer().ledger
+    return NotificationLedger(NOTIFICATION_LEDGER_FILE)
  
-    def submit_mood(self):
-        if self.selected_mood:
-            # Hide emoji buttons and the Send button immediately
-            for layout in self.emoji_layouts:
-                while layout.count():
-                    item = layout.takeAt(0)
-                    widget = item.widget()
-                    if widget:
-                        widget.hide()
+_mood_writer = None
 
-            # Hide the question label and all widgets in the top layout
-            for child in self.findChildren(QWidget):
-                if isinstance(child, QLabel):
-                    child.hide()
-            if self.send_button:
-                self.send_button.hide()
+def _mood_storage_path():
+    if MOOD_STORAGE == "columnar":
+        return COLUMNAR_MOOD_FILE
+    if MOOD_STORAGE == "collector":
+        return COLLECTOR_SPOOL_FILE
+    if MOOD_STORAGE == "sqlite":
+        return SQLITE_DB_FILE
+    if MOOD_STORAGE == "segmented":
+        return MOOD_SEGMENT_DIR
+    return MOOD_FILE
 
-            # Show animation and message together
-            self.show_animation_with_message()
-        else:
-            QMessageBox.warning(self, "Select Mood", "Please select a mood before submitting.")
+def _create_mood_writer():
+    if MOOD_STORAGE == "columnar":
+        # Imported lazily to keep NumPy off the startup path
+        from columnar_store import ColumnarMoodStore
+        return ColumnarMoodStore(COLUMNAR_MOOD_FILE)
+    if MOOD_STORAGE == "collector":
+        from collector import CollectorSink
+        return CollectorSink(COLLECTOR_URL, COLLECTOR_SPOOL_FILE)
+    if MOOD_STORAGE == "sqlite":
+        from sqlite_store import SqliteMoodStore
+        return SqliteMoodStore(SQLITE_DB_FILE)
+    if MOOD_STORAGE == "segmented":
+        from segment_store import SegmentedMoodStore
+        return SegmentedMoodStore(MOOD_SEGMENT_DIR, fsync=MOOD_FSYNC_POLICY)
+    if MOOD_STORAGE == "csv":
+        return MoodWriter(MOOD_FILE, fsync=MOOD_FSYNC_POLICY, header=MOOD_HEADER)
+    raise ValueError(f"Unknown MOOD_STORAGE {MOOD_STORAGE!r}")
 
-    def show_animation_with_message(self):
-        self.clear_dynamic_container()
+def get_mood_writer():
+    """Return the process-wide sink for MOOD_STORAGE, flushed automatically at exit."""
+    global _mood_writer
+    if _mood_writer is None or _mood_writer.path != _mood_storage_path():
+        if _mood_writer is not None:
+            _mood_writer.close()
+            atexit.unregister(_mood_writer.close)
+        _mood_writer = _create_mood_writer()
+        atexit.register(_mood_writer.close)
+    return _mood_writer
+ 
+_checkin_index = None
+# FileLock depth is per object, not per thread, so threads share the index under this
+_checkin_index_lock = threading.Lock()
 
-        # Create white background container
-        final_widget = QWidget()
-        final_widget.setStyleSheet("background-color: white;")
-        final_layout = QVBoxLayout(final_widget)
-        
-        # Create top layout with logo only on the right
-        top_layout = QHBoxLayout()
-        top_layout.setContentsMargins(0, 0, 0, 0)
-        top_layout.setSpacing(20)
+def get_checkin_index():
+    """Load the latest-check-in-per-day index over MOOD_FILE for a long-running process.
 
-        # Add stretch to push logo to the right
-        top_layout.addStretch(1)
+    Once loaded, ``save_mood()``/``save_moods()`` fold their rows into it
+    and ``get_user_history()`` answers from it, after a refresh that reads
+    only the rows other processes appended since the last request.
+    """
+    global _checkin_index
+    with _checkin_index_lock:
+        if _checkin_index is None or _checkin_index.mood_path != MOOD_FILE:
+            from checkin_index import CheckinIndex
+            index = CheckinIndex(MOOD_FILE)
+            index.refresh()
+            _checkin_index = index
+        return _checkin_index
 
-        # Logo on the right
-        logo_label = QLabel()
-        logo_pixmap = QPixmap("Shorthills Logo Light Bg.png")
-        logo_label.setPixmap(logo_pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        top_layout.addWidget(logo_label)
+def _loaded_checkin_index():
+    index = _checkin_index
+    if index is not None and MOOD_STORAGE == "csv" and index.mood_path == MOOD_FILE:
+        return index
+    return None
 
-        final_layout.addLayout(top_layout)
-        
-        # Add top spacing to move content slightly above center
-        top_spacer = QWidget()
-        top_spacer.setFixedHeight(20)  # Reduced top spacing to move content up
-        final_layout.addWidget(top_spacer)
+_user_history = None
 
-        # Spinner animation
-        self.spinner_label = QLabel(self.selected_mood)
-        self.spinner_label.setAlignment(Qt.AlignCenter)
-        self.spinner_label.setStyleSheet("font-size: 50px; background-color: white;")  # Smaller size for animation
-        final_layout.addWidget(self.spinner_label)
+def _load_user_history(username, since):
+    """Return ``username``'s records from ISO day ``since`` on, reading as little as MOOD_STORAGE allows."""
+    from mood_reader import MoodRecord
+    if MOOD_STORAGE == "sqlite":
+        return [MoodRecord(*row) for row in get_mood_writer().user_history(username, since)]
+    if MOOD_STORAGE == "segmented":
+        records = get_mood_writer().read_range(since)
+    elif MOOD_STORAGE == "columnar":
+        records = (MoodRecord(*row) for row in get_mood_writer().rows() if row[0][:10] >= since)
+    elif MOOD_STORAGE == "collector":
+        # Check-ins live on the collector; only the unsent spool is local
+        return []
+    else:
+        if not os.path.exists(MOOD_FILE):
+            return []
+        from time_index import TimeIndex
+        records = TimeIndex(MOOD_FILE).query(since)
+    return [record for record in records if record.username == username]
 
-        # Display the mood response text immediately
-        response = MOOD_RESPONSE_MAP.get(self.selected_mood, "")
-        response_label = QLabel(response)
-        response_label.setWordWrap(True)
-        response_label.setAlignment(Qt.AlignCenter)
-        response_label.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: #003049;
-            background: transparent;
-            font-family: Arial, Helvetica, sans-serif;
-            padding: 20px;
-        """)
-        final_layout.addWidget(response_label)
-        
-        # Add bottom spacing to balance the layout
-        bottom_spacer = QWidget()
-        bottom_spacer.setFixedHeight(180)  # Increased bottom spacing to push content up
-        final_layout.addWidget(bottom_spacer)
+def get_user_history(username, days=7):
+    """``[(day, mood or None), ...]`` for the user's last ``days`` days, oldest first.
 
-        self.dynamic_container.addWidget(final_widget)
+    Served from a bounded LRU cache that ``save_mood()`` invalidates for
+    the user it appends for, so repeated calls do not touch storage, or
+    from the check-in index if this process loaded one.
+    """
+    global _user_history
+    index = _loaded_checkin_index()
+    if index is not None:
+        from user_history import day_range
+        with _checkin_index_lock:
+            index.refresh()
+            records = [(day, index.get(username, day)) for day in day_range(days)]
+        return [(day, record.mood if record else None) for day, record in records]
+    if _user_history is None:
+        from user_history import UserHistoryCache
+        _user_history = UserHistoryCache(_load_user_history)
+    return _user_history.get(username, days)
 
-        # Start the animation
-        self.spinner_timer = QTimer()
-        self.spinner_timer.timeout.connect(self.update_spinner_frame)
-        self.spinner_timer.start(150)
+def _append_checkins(rows):
+    """Write ``[timestamp, username, mood, state]`` rows and bring the in-process indexes up to date."""
+    get_mood_writer().write(rows)
+    index = _loaded_checkin_index()
+    if index is not None:
+        # Visible before the writer flushes; the next refresh reads the same rows again harmlessly
+        with _checkin_index_lock:
+            for timestamp, username, mood, _ in rows:
+                if mood in EMOJI_STATE_MAP:
+                    index.add(timestamp, username, mood)
+    for _, username, _, _ in rows:
+        if _user_history is not None:
+            _user_history.invalidate(username)
 
-        # Show final emoji after animation
-        QTimer.singleShot(SPINNER_DURATION_MS - 500, self.show_final_emoji)  # Show final emoji slightly before animation ends
-        
-        # Save the mood data
-        save_mood(self.selected_mood)
+def save_mood(mood):
+    username = getpass.getuser()
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    state = EMOJI_STATE_MAP.get(mood, "Unknown")
+    _append_checkins([[timestamp, username, mood, state]])
+    update_notification_time()
+    if MOOD_STORAGE == "csv":
+        _update_time_index()
 
-    def update_spinner_frame(self):
-        # Update the spinner frame
-        self.spinner_index = (self.spinner_index + 1) % len(SPINNER_FRAMES)
-        self.spinner_label.setText(SPINNER_FRAMES[self.spinner_index])
+def save_moods(checkins):
+    """Persist many ``(username, mood)`` check-ins with one write and one ledger update.
 
-    def show_final_emoji(self):
-        if self.spinner_timer:
-            self.spinner_timer.stop()
-        self.spinner_label.setStyleSheet("font-size: 80px; background-color: white;")  # Large size for final emoji
-        self.spinner_label.setText(self.selected_mood)  # Show selected emoji
+    Used by the check-in server to group-commit concurrent submissions.
+    Returns the rows written.
+    """
+    timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    rows = [[timestamp, username, mood, EMOJI_STATE_MAP.get(mood, "Unknown")] for username, mood in checkins]
+    if not rows:
+        return rows
+    _append_checkins(rows)
+    today = date.today().isoformat()
+    _notification_ledger().update({username: today for username, _ in checkins})
+    if MOOD_STORAGE == "csv":
+        _update_time_index()
+    return rows
 
-    def clear_dynamic_container(self):
-        while self.dynamic_container.count():
-            item = self.dynamic_container.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+def _update_time_index():
+    """Extend the sparse date index over MOOD_FILE with the rows just appended."""
+    from time_index import TimeIndex
+    try:
+        TimeIndex(MOOD_FILE).refresh()
+    except OSError:
+        # The check-in is already saved; the next refresh indexes it
+        pass
  
-# (rest of your file remains unchanged)
+# PySide6 is only imported once we know the window will actually be shown,
+# so users who already checked in today exit without paying for Qt startup
+_GUI_NAMES = {"MoodWindow", "EMOJI_COLOR_MAP", "SPINNER_DURATION_MS", "SPINNER_FRAMES"}
+
+def __getattr__(name):
+    if name in _GUI_NAMES:
+        import mood_window
+        return getattr(mood_window, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
  
-def show_notification():
+def show_notification(resident=False, prompt_time=None):
+    """Show the check-in window now or, with ``resident``, keep a tray process
+    running that shows a pre-built window daily at ``prompt_time``."""
+    from PySide6.QtWidgets import QApplication, QSystemTrayIcon
+    import resources
+    startup_profile.mark("import_pyside6")
+    from mood_window import MoodWindow
+    startup_profile.mark("import_mood_window")
     app = QApplication.instance() or QApplication(sys.argv)
-    tray = QSystemTrayIcon(QIcon("Shorthills Logo Light Bg.png"))
+    startup_profile.mark("create_qapplication")
+    if resident:
+        from resident import ResidentTray, parse_prompt_time
+        # Closing the window only hides it until the next prompt
+        app.setQuitOnLastWindowClosed(False)
+        tray = ResidentTray(parse_prompt_time(prompt_time or RESIDENT_PROMPT_TIME))
+        startup_profile.mark("resident_window_built")
+        tray.start()
+        startup_profile.finish(STARTUP_PROFILE_FILE)
+        app.exec()
+        return
+    tray = QSystemTrayIcon(resources.icon(resources.LOGO))
     tray.show()
     tray.showMessage("Daily Mood Check", "Hey user, how was your day?",
                      QSystemTrayIcon.Information, 10000)
+    startup_profile.mark("tray_icon")
     window = MoodWindow()
     window.show()
+    startup_profile.mark("window_shown")
+    startup_profile.finish(STARTUP_PROFILE_FILE)
     app.exec()
  
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Daily mood check-in.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help=f"record per-phase startup timings to {STARTUP_PROFILE_FILE}")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="also record the slowest imports (implies --profile-startup)")
+    parser.add_argument("--resident", action="store_true",
+                        help="stay in the tray and prompt daily instead of exiting")
+    parser.add_argument("--prompt-at", default=RESIDENT_PROMPT_TIME, metavar="HH:MM",
+                        help="daily prompt time for --resident (default %(default)s)")
+    # Qt consumes its own command line options, so leave unknown ones alone
+    args, _ = parser.parse_known_args(argv)
+    if args.profile_startup or args.profile_imports:
+        startup_profile.enable(import_times=args.profile_imports)
+        startup_profile.mark("import_main")
+
     initialize_files()
-    if check_notification_eligibility():
+    startup_profile.mark("initialize_files")
+    if args.resident:
+        lock = FileLock(f"{RESIDENT_LOCK_FILE}_{getpass.getuser()}", timeout=0)
+        try:
+            lock.acquire()
+        except TimeoutError:
+            # Another resident process for this user is already running
+            startup_profile.finish(STARTUP_PROFILE_FILE)
+            return
+        try:
+            show_notification(resident=True, prompt_time=args.prompt_at)
+        finally:
+            lock.release()
+        return
+    eligible = check_notification_eligibility()
+    startup_profile.mark("eligibility_check")
+    if eligible:
         show_notification()
+    else:
+        startup_profile.finish(STARTUP_PROFILE_FILE)
  
 if __name__ == "__main__":
+    # Register this script as "main" so modules doing "import main" share its state
+    sys.modules.setdefault("main", sys.modules[__name__])
     main()
 
@@ -0,0 +1,181 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from checkin_index import CheckinIndex
+from columnar_store import ColumnarMoodStore
+from mood_scan import MoodScan
+from segment_store import SegmentedMoodStore
+from moods import EMOJIS, EMOJI_STATE_MAP, MOOD_CODES, TIMESTAMP_FORMAT
+
+# Score each mood from 5 (😄) down to 1 (😞) so averages read naturally
+MOOD_SCORES = np.array([len(EMOJIS) - code for code in range(len(EMOJIS))], dtype=np.float64)
+# "Low Key" and "Cooked >_>" days count towards low streaks
+LOW_MOOD_CODES = [MOOD_CODES["😔"], MOOD_CODES["😞"]]
+STATE_COLUMNS = [EMOJI_STATE_MAP[emoji] for emoji in EMOJIS]
+
+
+def load_history(path):
+    """Load mood history from a CSV, columnar (.mcol) or segmented store into a typed DataFrame.
+
+    Columns: timestamp (datetime64), username (category), mood (uint8 code
+    into EMOJIS), score (float), day (datetime64 at midnight).
+    """
+    if path.endswith(".mcol"):
+        store = ColumnarMoodStore(path)
+        columns = store.scan()
+        usernames = np.array(store.usernames, dtype=object)
+        keep = columns["mood"] < len(EMOJIS)
+        seconds = columns["timestamp"][keep]
+        names = usernames[columns["user_id"][keep]] if len(usernames) else np.empty(0, dtype=object)
+        moods = columns["mood"][keep]
+    elif os.path.isdir(path):
+        seconds, names, moods = _parse_records(list(SegmentedMoodStore(path).read_range()))
+    else:
+        with MoodScan(path) as scan:
+            keep = scan.valid
+            seconds = scan.timestamps[keep].astype(np.int64)
+            names = np.array(scan.usernames, dtype=object)[scan.user_ids[keep]]
+            moods = scan.mood_codes[keep].copy()
+    return _frame(np.asarray(seconds, dtype=np.int64), names, np.asarray(moods, dtype=np.uint8))
+
+
+def load_checkins(path):
+    """Load only each user's latest check-in per day from a mood CSV.
+
+    The rows come from the incrementally maintained ``CheckinIndex``, so the
+    raw log is not sorted or grouped again, and ``last_per_day`` passes the
+    frame through unchanged.
+    """
+    index = CheckinIndex(path)
+    index.refresh()
+    df = _frame(*_parse_records(index.records()))
+    df.attrs["deduplicated"] = True
+    return df
+
+
+def _parse_records(records):
+    """Turn validated MoodRecords into (epoch seconds, usernames, mood codes) arrays.
+
+    Timestamps are parsed in one ``pd.to_datetime`` call with the fixed
+    format and moods are coded through a categorical lookup, rather than
+    one ``strptime`` and one dict lookup per row.
+    """
+    timestamps = pd.to_datetime([r.timestamp for r in records], format=TIMESTAMP_FORMAT)
+    seconds = timestamps.to_numpy(dtype="datetime64[s]").astype(np.int64)
+    moods = pd.Categorical([r.mood for r in records], categories=EMOJIS).codes.astype(np.uint8)
+    return seconds, [r.username for r in records], moods
+
+
+def _frame(seconds, names, moods):
+    df = pd.DataFrame({
+        "timestamp": pd.to_datetime(seconds, unit="s"),
+        "username": pd.Categorical(names),
+        "mood": moods,
+    })
+    df["score"] = MOOD_SCORES[df["mood"].to_numpy()] if len(df) else np.empty(0)
+    df["day"] = df["timestamp"].dt.floor("D")
+    return df
+
+
+def _distribution(df, keys):
+    """Check-in counts per mood state plus mean score, grouped by ``keys``."""
+    counts = (df.groupby(keys + ["mood"], observed=True).size()
+              .unstack("mood", fill_value=0)
+              .reindex(columns=range(len(EMOJIS)), fill_value=0))
+    counts.columns = STATE_COLUMNS
+    counts["check_ins"] = counts.sum(axis=1)
+    counts["mean_score"] = df.groupby(keys, observed=True)["score"].mean()
+    return counts
+
+
+def daily_summary(df):
+    return _distribution(df, ["day"])
+
+
+def weekly_summary(df):
+    weekly = df.assign(week=df["timestamp"].dt.to_period("W").dt.start_time)
+    return _distribution(weekly, ["week"])
+
+
+def last_per_day(df):
+    """Each user's final check-in of each day, sorted by user and day."""
+    if df.attrs.get("deduplicated"):
+        return df
+    return (df.sort_values("timestamp", kind="stable")
+            .drop_duplicates(["username", "day"], keep="last")
+            .sort_values(["username", "day"], kind="stable")
+            .reset_index(drop=True))
+
+
+def rolling_scores(df, window=7):
+    """Per-user daily score with a trailing ``window``-day rolling mean.
+
+    The window spans calendar days, so days without a check-in shrink it
+    rather than pulling in older ones.
+    """
+    daily = last_per_day(df)[["username", "day", "score"]].copy()
+    daily["rolling_score"] = (daily.set_index("day").groupby("username", observed=True)["score"]
+                              .transform(lambda scores: scores.rolling(f"{window}D", min_periods=1).mean())
+                              .to_numpy())
+    return daily
+
+
+def low_streaks(df):
+    """Runs of consecutive days whose final check-in was "Low Key" or "Cooked >_>"."""
+    daily = last_per_day(df)
+    lows = daily[daily["mood"].isin(LOW_MOOD_CODES)]
+    if lows.empty:
+        return pd.DataFrame(columns=["username", "start", "end", "days"])
+    users = lows["username"].to_numpy()
+    days = lows["day"].to_numpy()
+    breaks = np.ones(len(lows), dtype=bool)
+    breaks[1:] = (users[1:] != users[:-1]) | (days[1:] - days[:-1] != np.timedelta64(1, "D"))
+    runs = lows.assign(run=np.cumsum(breaks))
+    return (runs.groupby("run")
+            .agg(username=("username", "first"), start=("day", "min"), end=("day", "max"), days=("day", "size"))
+            .reset_index(drop=True))
+
+
+def user_summary(df):
+    summary = _distribution(df, ["username"])
+    summary["last_check_in"] = df.groupby("username", observed=True)["timestamp"].max()
+    streaks = low_streaks(df)
+    longest = streaks.groupby("username", observed=True)["days"].max() if len(streaks) else pd.Series(dtype=int)
+    summary["longest_low_streak"] = longest.reindex(summary.index, fill_value=0).astype(int)
+    return summary
+
+
+REPORTS = {
+    "daily": daily_summary,
+    "weekly": weekly_summary,
+    "users": user_summary,
+    "rolling": rolling_scores,
+    "streaks": low_streaks,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate the mood check-in history.")
+    parser.add_argument("path", nargs="?", default="employee_mood_data.csv",
+                        help="mood CSV, columnar .mcol store or segment directory")
+    parser.add_argument("--report", choices=sorted(REPORTS), default="daily")
+    parser.add_argument("--latest", action="store_true",
+                        help="count only each user's latest check-in per day (CSV only)")
+    parser.add_argument("--output", help="write the report as CSV to this file instead of printing it")
+    args = parser.parse_args(argv)
+
+    df = load_checkins(args.path) if args.latest else load_history(args.path)
+    report = REPORTS[args.report](df)
+    if args.output:
+        report.to_csv(args.output)
+    else:
+        print(report.to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import csv
+import gzip
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from moods import EMOJI_STATE_MAP, TIMESTAMP_FORMAT
+
+MoodRecord = namedtuple("MoodRecord", ["timestamp", "username", "mood", "state"])
+
+
+class MoodReader:
+    """Stream normalised records out of a mood CSV in constant memory.
+
+    The file is read one line at a time, so ``offset`` is always the byte
+    position just past the last line consumed; pass it back as
+    ``start_offset`` to resume a later run where this one stopped. Reading
+    stops before the first line at or past ``end_offset``, if given. Legacy
+    three-column rows get their State filled in from ``EMOJI_STATE_MAP``.
+    Rows that cannot be normalised are counted in ``rejected`` under the
+    reason they were rejected and, if ``quarantine`` is given, copied
+    verbatim to that file instead of being yielded. Paths ending in ``.gz``
+    are read through gzip.
+    """
+
+    def __init__(self, path, start_offset=0, quarantine=None, end_offset=None):
+        self.path = path
+        self.offset = start_offset
+        self.end_offset = end_offset
+        # Where the most recently consumed line starts
+        self.line_offset = start_offset
+        self.quarantine = quarantine
+        self.stats = Counter()
+        self.rejected = Counter()
+
+    def __iter__(self):
+        # Opened on the first rejected line, so clean input leaves no empty file behind
+        quarantine_file = None
+        try:
+            with (gzip.open if self.path.endswith(".gz") else open)(self.path, 'rb') as f:
+                f.seek(self.offset)
+                for raw_line in f:
+                    # Only complete lines are consumed so a row being
+                    # appended concurrently is picked up on the next run
+                    if not raw_line.endswith(b"\n"):
+                        break
+                    if self.end_offset is not None and self.offset >= self.end_offset:
+                        break
+                    self.line_offset = self.offset
+                    self.offset += len(raw_line)
+                    record, reason = self._parse(raw_line)
+                    if record is not None:
+                        self.stats["rows"] += 1
+                        yield record
+                    elif reason is not None:
+                        self.rejected[reason] += 1
+                        if self.quarantine:
+                            if quarantine_file is None:
+                                quarantine_file = open(self.quarantine, 'ab')
+                            quarantine_file.write(raw_line)
+        finally:
+            if quarantine_file:
+                quarantine_file.close()
+
+    def _parse(self, raw_line):
+        """Return (record, None), (None, rejection reason), or (None, None) for lines to skip."""
+        try:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+        except UnicodeDecodeError:
+            return None, "bad_encoding"
+        if not line.strip():
+            return None, None
+        row = next(csv.reader([line]))
+        if row[0] == "Timestamp":
+            return None, None
+        if len(row) not in (3, 4):
+            return None, "bad_columns"
+        timestamp, username, mood = row[0], row[1], row[2]
+        try:
+            datetime.strptime(timestamp, TIMESTAMP_FORMAT)
+        except ValueError:
+            return None, "bad_timestamp"
+        state = EMOJI_STATE_MAP.get(mood)
+        if state is None:
+            return None, "invalid_mood"
+        if len(row) == 3:
+            self.stats["legacy_rows"] += 1
+        return MoodRecord(timestamp, username, mood, state), None
+
+
+def read_moods(path, start_offset=0, quarantine=None):
+    """Convenience generator over ``MoodReader`` when the offset and stats are not needed."""
+    yield from MoodReader(path, start_offset, quarantine)
@@ -0,0 +1,287 @@
+import argparse
+import mmap
+import os
+import sys
+import time
+from datetime import datetime
+from functools import cached_property
+
+import numpy as np
+
+from mood_reader import MoodReader
+from moods import EMOJIS, EMOJI_STATE_MAP, MOOD_CODES, TIMESTAMP_FORMAT, UNKNOWN_MOOD_CODE
+
+# "YYYY-MM-DD HH:MM:SS" always occupies the first 19 bytes of a row
+TIMESTAMP_BYTES = 19
+# Rows and bytes handled per vectorized step, which bounds temporary memory
+CHUNK_ROWS = 1 << 16
+CHUNK_BYTES = 1 << 24
+
+# Every mood emoji encodes to the same number of UTF-8 bytes, so a mood is
+# matched by packing that many bytes into one integer key
+_MOOD_BYTES = len(EMOJIS[0].encode("utf-8"))
+assert all(len(emoji.encode("utf-8")) == _MOOD_BYTES for emoji in EMOJIS)
+_MOOD_KEY_CODES = np.argsort([int.from_bytes(emoji.encode("utf-8"), "big") for emoji in EMOJIS]).astype(np.uint8)
+_MOOD_KEYS = np.array([int.from_bytes(EMOJIS[code].encode("utf-8"), "big") for code in _MOOD_KEY_CODES],
+                      dtype=np.uint64)
+# Bytes allowed straight after the mood, so "😊👍" is not read as "😊"
+_TERMINATORS = np.zeros(256, dtype=bool)
+_TERMINATORS[[ord(","), ord("\r"), ord("\n")]] = True
+# Byte offsets of the separators within a timestamp, and of each field's digits
+_TIMESTAMP_SEPARATORS = {4: ord("-"), 7: ord("-"), 10: ord(" "), 13: ord(":"), 16: ord(":"), 19: ord(",")}
+_TIMESTAMP_FIELDS = [(0, 1, 2, 3), (5, 6), (8, 9), (11, 12), (14, 15), (17, 18)]
+
+
+class MoodScan:
+    """Column views over a memory-mapped mood CSV, built with vectorized byte searches.
+
+    Row boundaries come from a search for newline bytes, and each column
+    is decoded from fixed positions within the rows the first time it is
+    accessed. Only rows that plain byte checks cannot settle (quoted
+    fields, non-ASCII usernames, unusual timestamps, and every row those
+    checks reject) are parsed one by one, with ``MoodReader``'s own
+    parser, so the scan keeps exactly the rows the reader yields. The rows
+    it rejects (header, wrong column count, bad timestamp, unknown mood,
+    torn last line) have mood code ``UNKNOWN_MOOD_CODE`` and are excluded
+    by ``valid``. The views borrow the mapping, so call ``close()`` (or use
+    a ``with`` block) before the file is truncated or replaced.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        if os.fstat(self._file.fileno()).st_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buffer = np.frombuffer(self._mmap, dtype=np.uint8)
+        else:
+            self._mmap = None
+            self.buffer = np.empty(0, dtype=np.uint8)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        # Drop every view of the mapping first, or it cannot be closed
+        for name in [name for name, value in self.__dict__.items() if isinstance(value, (np.ndarray, tuple))]:
+            del self.__dict__[name]
+        self.buffer = np.empty(0, dtype=np.uint8)
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def _gather(self, positions, width):
+        """``width`` bytes starting at each of ``positions``, clamped to the end of the file."""
+        index = positions[:, None] + np.arange(width)
+        np.minimum(index, len(self.buffer) - 1, out=index)
+        return self.buffer[index]
+
+    def _column(self, positions, offset):
+        """The byte at ``offset`` past each of ``positions``, clamped to the end of the file."""
+        return self.buffer[np.minimum(positions + offset, len(self.buffer) - 1)]
+
+    def _find(self, byte):
+        """Offsets of every occurrence of ``byte`` in the file."""
+        return self._find_where(lambda chunk: chunk == byte)
+
+    def _find_where(self, condition):
+        """Offsets of every byte for which ``condition`` (applied to a chunk of the buffer) is true."""
+        found = [np.flatnonzero(condition(self.buffer[start:start + CHUNK_BYTES])) + start
+                 for start in range(0, len(self.buffer), CHUNK_BYTES)]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def _count_per_row(self, offsets):
+        """How many of the sorted ``offsets`` fall within each complete row."""
+        return np.diff(np.searchsorted(offsets, self.line_ends, side="right"), prepend=0)
+
+    @cached_property
+    def line_ends(self):
+        """Offset of the newline ending each complete row; a torn last line has none."""
+        return self._find(ord("\n"))
+
+    @cached_property
+    def line_starts(self):
+        return np.concatenate(([0], self.line_ends + 1))[:len(self.line_ends)].astype(np.int64)
+
+    @cached_property
+    def _timestamp(self):
+        """(fields, ok): year, month, day, hour, minute, second per row and whether they parsed."""
+        fields = np.zeros((len(self.line_ends), 6), dtype=np.int32)
+        ok = self.line_ends - self.line_starts > TIMESTAMP_BYTES + 1
+        for rows in _chunks(len(ok)):
+            starts = self.line_starts[rows]
+            good = ok[rows]
+            for offset, byte in _TIMESTAMP_SEPARATORS.items():
+                good &= self._column(starts, offset) == byte
+            for field, offsets in enumerate(_TIMESTAMP_FIELDS):
+                value = np.zeros(len(starts), dtype=np.int32)
+                for offset in offsets:
+                    # Bytes below "0" wrap around to large values, so one test rejects both sides
+                    digit = self._column(starts, offset) - np.uint8(ord("0"))
+                    good &= digit <= 9
+                    value = value * 10 + digit
+                fields[rows, field] = value
+            ok[rows] = good
+        # Same calendar rules as strptime: real month lengths, hours below 24 and so on
+        months = _months(fields)
+        month_days = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int32)
+        ok &= (fields[:, 0] >= 1) & (fields[:, 1] >= 1) & (fields[:, 1] <= 12)
+        ok &= (fields[:, 2] >= 1) & (fields[:, 2] <= month_days)
+        ok &= (fields[:, 3] < 24) & (fields[:, 4] < 60) & (fields[:, 5] < 60)
+        return fields, ok
+
+    @cached_property
+    def _commas(self):
+        return self._find(ord(","))
+
+    @cached_property
+    def _username_ends(self):
+        """Offset of the comma after the username, or -1 where there is none."""
+        commas = self._commas
+        if not len(commas):
+            return np.full(len(self.line_ends), -1, dtype=np.int64)
+        following = np.searchsorted(commas, self.line_starts + TIMESTAMP_BYTES + 1)
+        ends = commas[np.minimum(following, len(commas) - 1)]
+        found = (following < len(commas)) & (ends < self.line_ends)
+        return np.where(found, ends, -1)
+
+    @cached_property
+    def _plain_codes(self):
+        """Mood codes of the rows settled by byte checks alone; UNKNOWN_MOOD_CODE for the rest."""
+        codes = np.full(len(self.line_ends), UNKNOWN_MOOD_CODE, dtype=np.uint8)
+        # Three or four columns when nothing is quoted
+        commas = self._count_per_row(self._commas)
+        # Quotes, carriage returns and non-ASCII text are left to the CSV parser,
+        # so the only ones a plain row may hold are the mood's bytes and a final "\r"
+        special = self._find_where(lambda chunk: (chunk >= 0x80) | (chunk == ord('"')) | (chunk == ord("\r")))
+        crlf = self.buffer[np.maximum(self.line_ends - 1, 0)] == ord("\r")
+        plain = (self._count_per_row(special) == _MOOD_BYTES + crlf) & (commas >= 2) & (commas <= 3)
+        for rows in _chunks(len(codes)):
+            moods = self._username_ends[rows] + 1
+            key = np.zeros(len(moods), dtype=np.uint64)
+            for offset in range(_MOOD_BYTES):
+                key = (key << np.uint64(8)) | self._column(moods, offset)
+            slot = np.minimum(np.searchsorted(_MOOD_KEYS, key), len(_MOOD_KEYS) - 1)
+            match = (_MOOD_KEYS[slot] == key) & _TERMINATORS[self._column(moods, _MOOD_BYTES)]
+            match &= self._timestamp[1][rows] & (moods > 0) & plain[rows]
+            codes[rows] = np.where(match, _MOOD_KEY_CODES[slot], UNKNOWN_MOOD_CODE)
+        return codes
+
+    @cached_property
+    def _parsed(self):
+        """``{row: MoodRecord}`` for the rows byte checks left open that MoodReader accepts."""
+        parser = MoodReader(self.path)
+        parsed = {}
+        for row in np.flatnonzero(self._plain_codes == UNKNOWN_MOOD_CODE):
+            raw_line = self.buffer[self.line_starts[row]:self.line_ends[row] + 1].tobytes()
+            record, _ = parser._parse(raw_line)
+            if record is not None:
+                parsed[int(row)] = record
+        return parsed
+
+    @cached_property
+    def mood_codes(self):
+        """Mood code (index into EMOJIS) per row as uint8; UNKNOWN_MOOD_CODE for rejected rows."""
+        codes = self._plain_codes.copy()
+        for row, record in self._parsed.items():
+            codes[row] = MOOD_CODES[record.mood]
+        return codes
+
+    @cached_property
+    def valid(self):
+        return self.mood_codes != UNKNOWN_MOOD_CODE
+
+    @cached_property
+    def _fields(self):
+        fields = self._timestamp[0].copy()
+        for row, record in self._parsed.items():
+            parsed = datetime.strptime(record.timestamp, TIMESTAMP_FORMAT)
+            fields[row] = parsed.timetuple()[:6]
+        return fields
+
+    @cached_property
+    def dates(self):
+        """Check-in day per row as datetime64[D] (NaT for rejected rows)."""
+        fields = self._fields
+        dates = _months(fields).astype("datetime64[D]") + (fields[:, 2] - 1).astype("timedelta64[D]")
+        return np.where(self.valid, dates, np.datetime64("NaT"))
+
+    @cached_property
+    def timestamps(self):
+        """Check-in time per row as datetime64[s] (NaT for rejected rows)."""
+        fields = self._fields.astype(np.int64)
+        seconds = (fields[:, 3] * 3600 + fields[:, 4] * 60 + fields[:, 5]).astype("timedelta64[s]")
+        return self.dates.astype("datetime64[s]") + seconds
+
+    @cached_property
+    def _usernames(self):
+        starts = self.line_starts + TIMESTAMP_BYTES + 1
+        plain = self._plain_codes != UNKNOWN_MOOD_CODE
+        lengths = np.where(plain, self._username_ends - starts, 0)
+        parsed = {row: record.username.encode("utf-8") for row, record in self._parsed.items()}
+        width = max([1, int(lengths.max()) if len(lengths) else 1] + [len(name) for name in parsed.values()])
+        names = np.empty(len(starts), dtype=f"S{width}")
+        for rows in _chunks(len(names)):
+            window = self._gather(starts[rows], width)
+            window[np.arange(width) >= lengths[rows, None]] = 0
+            names[rows] = np.ascontiguousarray(window).view(f"S{width}").ravel()
+        for row, name in parsed.items():
+            names[row] = name
+        unique, inverse = np.unique(names[self.valid], return_inverse=True)
+        user_ids = np.full(len(names), -1, dtype=np.int32)
+        user_ids[self.valid] = inverse
+        return [name.decode("utf-8") for name in unique], user_ids
+
+    @property
+    def usernames(self):
+        """Distinct usernames, indexed by ``user_ids``."""
+        return self._usernames[0]
+
+    @property
+    def user_ids(self):
+        """Index into ``usernames`` per row as int32 (-1 for rejected rows)."""
+        return self._usernames[1]
+
+    def mood_counts(self):
+        """Number of valid check-ins per mood code."""
+        return np.bincount(self.mood_codes[self.valid], minlength=len(EMOJIS))
+
+
+def _months(fields):
+    return ((fields[:, 0].astype(np.int64) - 1970) * 12 + fields[:, 1] - 1).astype("datetime64[M]")
+
+
+def _chunks(count):
+    for start in range(0, count, CHUNK_ROWS):
+        yield slice(start, min(start + CHUNK_ROWS, count))
+
+
+def mood_counts(path):
+    """Check-ins per mood code for a mood CSV or a columnar (.mcol) store."""
+    if path.endswith(".mcol"):
+        from columnar_store import ColumnarMoodStore
+        codes = ColumnarMoodStore(path).scan()["mood"]
+        return np.bincount(codes[codes < len(EMOJIS)], minlength=len(EMOJIS))
+    with MoodScan(path) as scan:
+        return scan.mood_counts()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count check-ins per mood with a memory-mapped scan.")
+    parser.add_argument("path", nargs="?", default="employee_mood_data.csv")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    counts = mood_counts(args.path)
+    elapsed = time.perf_counter() - start
+    for emoji, count in zip(EMOJIS, counts):
+        print(f"{emoji} {EMOJI_STATE_MAP[emoji]}: {count}")
+    print(f"{int(counts.sum())} check-ins in {elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
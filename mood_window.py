@@ -0,0 +1,490 @@
+import getpass
+from datetime import date
+from functools import lru_cache
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
+                              QPushButton, QLabel, QMessageBox, QSizePolicy, QStackedWidget)
+from PySide6.QtCore import Qt, QTimer
+import main
+import resources
+import startup_profile
+from checkin_writer import CheckinWriter
+from spinner import EmojiSpinner
+from user_history import day_range
+from moods import EMOJI_STATE_MAP, MOOD_RESPONSE_MAP
+ 
+# Define colors for each mood
+EMOJI_COLOR_MAP = {
+    "😄": {"hover": "#90EE90", "pressed": "#70e000", "checked": "#9ef01a"},
+    "😊": {"hover": "#ADD8E6", "pressed": "#00b4d8", "checked": "#56cfe1"},
+    "😐": {"hover": "#D3D3D3", "pressed": "#A9A9A9", "checked": "#ced4da"},
+    "😔": {"hover": "#FFDAB9", "pressed": "#FFA07A", "checked": "#FF7F50"},
+    "😞": {"hover": "#FFB6C1", "pressed": "#FF6347", "checked": "#FF4500"},
+}
+ 
+SPINNER_DURATION_MS = 2000
+ 
+SPINNER_FRAMES = ["😄", "😊", "😐", "😔", "😞"]
+SPINNER_INTERVAL_MS = 150
+SPINNER_FONT_PX = 50
+FINAL_EMOJI_FONT_PX = 80
+ 
+# Days shown in the history strip on the result page
+HISTORY_DAYS = 7
+HISTORY_CELL_WIDTH = 56
+ 
+# Minimum gap between button restyles while the window is being resized
+RESIZE_DEBOUNCE_MS = 16
+STYLE_CACHE_SIZE = 64
+ 
+@lru_cache(maxsize=STYLE_CACHE_SIZE)
+def emoji_button_style(emoji, font_size, button_width, button_height):
+    """Build (once per distinct size) the stylesheet for an emoji button"""
+    colors = EMOJI_COLOR_MAP.get(emoji, {"hover": "#f0f9ff", "pressed": "#d1e7ff", "checked": "#d1e7ff"})
+    return """
+        QPushButton {
+            font-size: %dpx;
+            background-color: #ffffff;
+            color: #2c3e50;
+            border: none;
+            border-radius: 15px;
+            padding: 15px;
+            min-width: %dpx;
+            min-height: %dpx;
+        }
+        QPushButton:hover {
+            background-color: %s;
+        }
+        QPushButton:pressed {
+            background-color: %s;
+        }
+        QPushButton:checked {
+            background-color: %s;
+            border: 3px solid %s;
+        }
+    """ % (
+        font_size,
+        button_width,
+        button_height,
+        colors['hover'],
+        colors['pressed'],
+        colors['checked'],
+        colors['pressed']
+    )
+ 
+class HistoryStrip(QWidget):
+    """The user's latest mood on each of the last ``days`` days, oldest first.
+
+    The cells are created once at a fixed size; ``set_history`` only
+    changes their text.
+    """
+
+    def __init__(self, days=HISTORY_DAYS, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        title = QLabel(f"Your last {days} days")
+        title.setAlignment(Qt.AlignCenter)
+        title.setStyleSheet("font-size: 16px; color: #003049; background: transparent;")
+        layout.addWidget(title)
+
+        cells = QHBoxLayout()
+        cells.addStretch(1)
+        self.mood_labels = []
+        self.day_labels = []
+        for _ in range(days):
+            cell = QVBoxLayout()
+            mood_label = QLabel()
+            mood_label.setAlignment(Qt.AlignCenter)
+            mood_label.setFixedSize(HISTORY_CELL_WIDTH, 40)
+            mood_label.setStyleSheet("font-size: 28px; background: transparent;")
+            day_label = QLabel()
+            day_label.setAlignment(Qt.AlignCenter)
+            day_label.setFixedSize(HISTORY_CELL_WIDTH, 20)
+            day_label.setStyleSheet("font-size: 12px; color: #6c757d; background: transparent;")
+            cell.addWidget(mood_label)
+            cell.addWidget(day_label)
+            cells.addLayout(cell)
+            self.mood_labels.append(mood_label)
+            self.day_labels.append(day_label)
+        cells.addStretch(1)
+        layout.addLayout(cells)
+
+    def set_history(self, history):
+        """Show ``[(iso_day, mood or None), ...]``; days without a check-in show a dot."""
+        for (day, mood), mood_label, day_label in zip(history, self.mood_labels, self.day_labels):
+            mood_label.setText(mood or "·")
+            day_label.setText(date.fromisoformat(day).strftime("%a"))
+
+    def moods(self):
+        return [label.text() for label in self.mood_labels]
+
+ 
+class MoodWindow(QWidget):
+    def __init__(self, show=True):
+        super().__init__()
+        # Set window flags to show standard window decorations
+        self.setWindowFlags(
+            Qt.Window |  # Use Window to get standard title bar
+            Qt.WindowTitleHint |  # Show title
+            Qt.WindowSystemMenuHint |  # Show system menu
+            Qt.WindowMinimizeButtonHint |  # Show minimize button
+            Qt.WindowMaximizeButtonHint |  # Show maximize button
+            Qt.WindowCloseButtonHint  # Show close button
+        )
+        # Coalesces resize storms; see resizeEvent
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(RESIZE_DEBOUNCE_MS)
+        self.resize_timer.timeout.connect(self.apply_pending_resize)
+        self.pending_resize = None
+        self.button_style_keys = {}
+        self.final_emoji_timer = QTimer(self)
+        self.final_emoji_timer.setSingleShot(True)
+        # Show final emoji slightly before animation ends
+        self.final_emoji_timer.setInterval(SPINNER_DURATION_MS - 500)
+        self.final_emoji_timer.timeout.connect(self.show_final_emoji)
+        # Set minimum size but allow resizing
+        self.setMinimumSize(800, 450)
+        self.setWindowTitle("Mood Check-in")
+        self.setStyleSheet("""
+            background-color: #ffffff;
+            border-radius: 20px;
+            font-family: Arial, Helvetica, sans-serif;
+        """)
+        
+        self.selected_mood = None
+        self.selected_button = None
+        self.spinner = None
+        self.response_label = None
+        self.history_strip = None
+        self.result_page = None
+        
+        # Check-ins are written off the GUI thread so slow shares can't freeze the spinner
+        # Resolved at call time so tests can patch main.get_user_history
+        self.load_history = lambda username, days: main.get_user_history(username, days)
+        self.checkin_writer = CheckinWriter(
+            parent=self, load_history=lambda: self.load_history(getpass.getuser(), HISTORY_DAYS))
+        self.checkin_writer.failed.connect(self.on_save_failed)
+        self.checkin_writer.history_loaded.connect(self.on_history_loaded)
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.checkin_writer.close)
+        
+        # Create a central container widget that can resize
+        self.central_widget = QWidget(self)
+        self.central_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.central_widget.setStyleSheet("""
+            background-color: #ffffff;
+            border-radius: 20px;
+        """)
+        
+        self.init_ui()
+        startup_profile.mark("init_ui")
+        if not show:
+            # Kept hidden until present(); polish now so showing it is instant
+            self.ensurePolished()
+            return
+        # Center window after showing it
+        self.show()
+        QApplication.processEvents()
+        startup_profile.mark("first_show")
+        self.center_window()
+        startup_profile.mark("center_window")
+
+    def present(self):
+        """Show a fresh check-in page, centred and in front"""
+        self.reset()
+        self.show()
+        self.center_window()
+        self.raise_()
+        self.activateWindow()
+
+    def reset(self):
+        """Return to an unanswered check-in page, reusing the existing widgets"""
+        self.final_emoji_timer.stop()
+        if self.spinner:
+            self.spinner.stop()
+        if self.selected_button:
+            self.selected_button.setChecked(False)
+        self.selected_mood = None
+        self.selected_button = None
+        self.pages.setCurrentWidget(self.checkin_page)
+
+    def resizeEvent(self, event):
+        """Handle window resize events"""
+        super().resizeEvent(event)
+        # Make central widget fill the window
+        self.central_widget.setGeometry(0, 0, event.size().width(), event.size().height())
+
+        # The initial layout (no previous size) is applied straight away.
+        # After that, restyle on the leading edge of a resize storm and then
+        # at most once per RESIZE_DEBOUNCE_MS with the latest size
+        if not event.oldSize().isValid():
+            self.update_button_styles(event.size())
+        elif self.resize_timer.isActive():
+            self.pending_resize = event.size()
+        else:
+            self.update_button_styles(event.size())
+            self.resize_timer.start()
+
+    def apply_pending_resize(self):
+        if self.pending_resize is not None:
+            size, self.pending_resize = self.pending_resize, None
+            self.update_button_styles(size)
+            self.resize_timer.start()
+
+    def update_button_styles(self, size):
+        """Scale the emoji buttons to the window size, skipping unchanged styles"""
+        # Calculate new sizes based on window dimensions
+        window_width = size.width()
+        window_height = size.height()
+        
+        # Base size calculation that ensures scaling
+        base_size = min(window_width // 8, window_height // 4)
+        base_size = max(base_size, 80)  # Ensure minimum size
+        button_width = max(base_size, window_width // 8)
+        button_height = int(button_width * 1.1)  # Keep aspect ratio
+        font_size = max(30, min(50, button_width // 2))
+        
+        # Update button sizes
+        for layout in self.emoji_layouts:
+            for i in range(layout.count()):
+                item = layout.itemAt(i)
+                if isinstance(item.widget(), QPushButton):
+                    button = item.widget()
+                    emoji = button.text()
+                    style_key = (emoji, font_size, button_width, button_height)
+                    if self.button_style_keys.get(emoji) == style_key:
+                        continue
+                    self.button_style_keys[emoji] = style_key
+                    button.setStyleSheet(emoji_button_style(*style_key))
+                    button.updateGeometry()
+
+    def center_window(self):
+        """Center the window on the screen"""
+        # Get the screen geometry
+        screen = QApplication.primaryScreen().availableGeometry()
+        
+        # Get the window geometry
+        window_frame = self.frameGeometry()
+        
+        # Calculate the center point
+        center_point = screen.center()
+        
+        # Move the window's center to the screen's center
+        window_frame.moveCenter(center_point)
+        
+        # Use move instead of setGeometry to preserve size
+        self.move(window_frame.x(), window_frame.y())
+        
+        # Process events to ensure the window is positioned
+        QApplication.processEvents()
+
+    def init_ui(self):
+        # The check-in page is built now; the result page on first submit.
+        # Switching between them is then just a change of current page
+        page_layout = QVBoxLayout(self.central_widget)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self.pages = QStackedWidget()
+        page_layout.addWidget(self.pages)
+
+        self.checkin_page = QWidget()
+        self.pages.addWidget(self.checkin_page)
+        self.main_layout = QVBoxLayout(self.checkin_page)
+        self.main_layout.setContentsMargins(20, 20, 20, 20)
+        self.main_layout.setSpacing(20)
+
+        # Top layout for logo and label
+        top_layout = QHBoxLayout()
+        top_layout.setContentsMargins(0, 30, 0, 0)  # Added 30px top margin
+        top_layout.setSpacing(20)
+
+        # Label
+        label = QLabel("How did yesterday treat you?")
+        label.setObjectName("question_label")
+        label.setStyleSheet("""
+            font-size: 24px;
+            font-weight: bold;
+            color: #003049;
+            background: transparent;
+            margin-top: 10px;
+            margin-left: 40px;  /* Added left margin to shift text right */
+        """)
+        label.setAlignment(Qt.AlignCenter)
+        top_layout.addWidget(label, 1)
+
+        # Logo
+        self.logo_label = QLabel()
+        self.logo_label.setPixmap(resources.pixmap(resources.LOGO, resources.LOGO_SIZE, self.devicePixelRatioF()))
+        startup_profile.mark("load_logo_pixmap")
+        top_layout.addWidget(self.logo_label)
+
+        # Add top layout to main layout
+        self.main_layout.addLayout(top_layout)
+
+        # Add spacer to push content to center
+        self.main_layout.addStretch(2)  # Increased weight for top stretch
+
+        # Emoji buttons layout
+        self.button_layout = QHBoxLayout()
+        self.button_layout.setSpacing(30)
+        self.button_layout.setAlignment(Qt.AlignCenter)
+
+        self.emoji_layouts = []  # Initialize the list
+        for emoji, state in EMOJI_STATE_MAP.items():
+            emoji_layout = QVBoxLayout()
+            emoji_layout.setSpacing(5)
+            style_key = (emoji, 50, 80, 90)
+            self.button_style_keys[emoji] = style_key
+            btn = QPushButton(emoji)
+            btn.setStyleSheet(emoji_button_style(*style_key))
+            btn.setCheckable(True)
+            btn.clicked.connect(lambda checked, e=emoji, b=btn: self.on_mood_select(e, b))
+            emoji_layout.addWidget(btn, alignment=Qt.AlignCenter)
+            text_label = QLabel(state)
+            text_label.setStyleSheet("""
+                font-size: 16px;
+                font-weight: bold;
+                color: #003049;
+                background: transparent;
+            """)
+            text_label.setAlignment(Qt.AlignCenter)
+            emoji_layout.addWidget(text_label, alignment=Qt.AlignCenter)
+            self.button_layout.addLayout(emoji_layout)
+            self.emoji_layouts.append(emoji_layout)
+
+        self.main_layout.addLayout(self.button_layout)
+
+        # Add spacer to push content to center
+        self.main_layout.addStretch(3)  # Increased weight for bottom stretch
+
+        self.send_button = QPushButton("Send")
+        self.send_button.setStyleSheet("""
+            QPushButton {
+                font-family: Helvetica;
+                font-size: 20px;
+                font-weight: bold;
+                color: white;
+                background-color: #FF6F61;
+                border: 2px solid #283618;
+                border-radius: 15px;
+                padding: 8px;
+                min-width: 100px;
+                background-clip: padding-box;
+            }
+            QPushButton:hover {
+                background-color: #E65C50;
+            }
+            QPushButton:pressed {
+                background-color: #CC5247;
+            }
+        """)
+        self.send_button.clicked.connect(self.submit_mood)
+        self.main_layout.addWidget(self.send_button, alignment=Qt.AlignCenter)
+
+    def on_mood_select(self, mood, button):
+        if self.selected_button:
+            self.selected_button.setChecked(False)
+        self.selected_mood = mood
+        self.selected_button = button
+        button.setChecked(True)
+ 
+    def submit_mood(self):
+        if self.selected_mood:
+            # Show animation and message together
+            self.show_animation_with_message()
+        else:
+            QMessageBox.warning(self, "Select Mood", "Please select a mood before submitting.")
+
+    def show_animation_with_message(self):
+        # Save the mood data in the background; the history follows once it is written
+        self.checkin_writer.submit(self.selected_mood)
+
+        if self.result_page is None:
+            self.build_result_page()
+        self.response_label.setText(MOOD_RESPONSE_MAP.get(self.selected_mood, ""))
+        self.show_history(None, self.selected_mood)
+        self.pages.setCurrentWidget(self.result_page)
+
+        # Start the animation
+        self.spinner.start(self.selected_mood)
+
+        # Show final emoji after animation
+        self.final_emoji_timer.start()
+
+    def show_history(self, history, mood):
+        """Fill the history strip, with today's check-in ``mood``; without a history only today is shown"""
+        history = list(history or [(day, None) for day in day_range(HISTORY_DAYS)])
+        history[-1] = (history[-1][0], mood)
+        self.history_strip.set_history(history)
+
+    def on_history_loaded(self, mood, history):
+        if self.history_strip is not None and history is not None:
+            self.show_history(history, mood)
+
+    def build_result_page(self):
+        """Build the spinner and response page; called once, on first submit"""
+        # Create white background container
+        self.result_page = QWidget()
+        self.result_page.setStyleSheet("background-color: white;")
+        final_layout = QVBoxLayout(self.result_page)
+        
+        # Create top layout with logo only on the right
+        top_layout = QHBoxLayout()
+        top_layout.setContentsMargins(0, 0, 0, 0)
+        top_layout.setSpacing(20)
+
+        # Add stretch to push logo to the right
+        top_layout.addStretch(1)
+
+        # Logo on the right
+        logo_label = QLabel()
+        logo_label.setPixmap(resources.pixmap(resources.LOGO, resources.LOGO_SIZE, self.devicePixelRatioF()))
+        top_layout.addWidget(logo_label)
+
+        final_layout.addLayout(top_layout)
+        
+        # Add top spacing to move content slightly above center
+        top_spacer = QWidget()
+        top_spacer.setFixedHeight(20)  # Reduced top spacing to move content up
+        final_layout.addWidget(top_spacer)
+
+        # Spinner animation; sized for the final emoji so finishing doesn't relayout
+        self.spinner = EmojiSpinner(SPINNER_FRAMES, SPINNER_FONT_PX, FINAL_EMOJI_FONT_PX, SPINNER_INTERVAL_MS)
+        final_layout.addWidget(self.spinner)
+
+        # Mood response text, filled in on each submit
+        self.response_label = QLabel()
+        self.response_label.setWordWrap(True)
+        self.response_label.setAlignment(Qt.AlignCenter)
+        self.response_label.setStyleSheet("""
+            font-size: 24px;
+            font-weight: bold;
+            color: #003049;
+            background: transparent;
+            font-family: Arial, Helvetica, sans-serif;
+            padding: 20px;
+        """)
+        final_layout.addWidget(self.response_label)
+
+        # The user's recent moods, filled in on each submit
+        self.history_strip = HistoryStrip()
+        final_layout.addWidget(self.history_strip)
+        
+        # Add bottom spacing to balance the layout
+        bottom_spacer = QWidget()
+        bottom_spacer.setFixedHeight(100)  # Leaves room for the history strip
+        final_layout.addWidget(bottom_spacer)
+
+        self.pages.addWidget(self.result_page)
+
+    def on_save_failed(self, mood, error):
+        QMessageBox.warning(self, "Check-in not saved", f"Your check-in could not be saved: {error}")
+
+    def update_spinner_frame(self):
+        # Update the spinner frame
+        self.spinner.advance()
+
+    def show_final_emoji(self):
+        if self.spinner:
+            self.spinner.finish(self.selected_mood)  # Large size for final emoji
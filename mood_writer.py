@@ -0,0 +1,157 @@
+import contextlib
+import csv
+import io
+import os
+import struct
+import threading
+import zlib
+
+from file_lock import FileLock
+
+FSYNC_POLICIES = ("none", "batch", "always")
+
+# Journal layout: offset the batch was appended at, payload length, payload
+# crc32, then the payload itself. A journal left behind by a crash is
+# replayed on the next flush by truncating the data file back to the
+# recorded offset and re-appending the payload, so a batch lands either
+# completely or not at all.
+JOURNAL_HEADER = struct.Struct("<QQI")
+
+
+class JournaledWriteError(OSError):
+    """A flush failed after its journal was complete.
+
+    The batch is committed: the next flush or ``recover()`` writes it from
+    the journal, so callers must not resubmit the rows.
+    """
+
+
+def encode_rows(rows):
+    """Encode rows as UTF-8 CSV bytes in the same dialect as the existing data file."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+class MoodWriter:
+    """Group-commit CSV appender shared by every process writing the same file.
+
+    Rows passed to ``append`` are buffered and written by ``flush`` under a
+    single cross-process lock and a single write, so a burst of check-ins
+    costs one lock and one flush rather than one per row.
+    """
+
+    def __init__(self, path, fsync="batch", batch_size=64, header=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}; expected one of {FSYNC_POLICIES}")
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.fsync = fsync
+        self.batch_size = batch_size
+        self.header = header
+        self.lock = FileLock(path)
+        self.pending = []
+        self._pending_lock = threading.Lock()
+
+    def append(self, row):
+        """Queue a row; the batch is flushed automatically once it reaches ``batch_size``."""
+        with self._pending_lock:
+            self.pending.append(row)
+            full = len(self.pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def write(self, rows):
+        """Queue ``rows`` and flush them immediately."""
+        with self._pending_lock:
+            self.pending.extend(rows)
+        self.flush()
+
+    def flush(self):
+        """Write every pending row. Returns the number of rows written."""
+        with self._pending_lock:
+            rows, self.pending = self.pending, []
+        if not rows:
+            if os.path.exists(self.journal_path):
+                self.recover()
+            return 0
+        journaled = False
+        try:
+            with self.lock:
+                self.recover()
+                offset = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+                if offset == 0 and self.header:
+                    rows = [self.header] + rows
+                payload = encode_rows(rows)
+                try:
+                    self._write_journal(offset, payload)
+                except BaseException:
+                    # The rows are requeued below, so a partial journal must not be replayed too
+                    with contextlib.suppress(OSError):
+                        os.remove(self.journal_path)
+                    raise
+                # From here the batch is committed: recover() writes it if this flush doesn't finish
+                journaled = True
+                with open(self.path, 'ab') as f:
+                    if self.fsync == "always":
+                        for row in rows:
+                            f.write(encode_rows([row]))
+                            _fsync(f)
+                    else:
+                        f.write(payload)
+                        if self.fsync == "batch":
+                            _fsync(f)
+                os.remove(self.journal_path)
+        except Exception as e:
+            if journaled:
+                raise JournaledWriteError(f"batch journaled but not yet applied: {e}") from e
+            # Keep the rows so a later flush can retry them
+            with self._pending_lock:
+                self.pending[:0] = [row for row in rows if row is not self.header]
+            raise
+        return len(rows)
+
+    def discard_pending(self):
+        """Drop rows left queued by a failed flush, for callers that retry them another way."""
+        with self._pending_lock:
+            self.pending = []
+
+    def _write_journal(self, offset, payload):
+        with open(self.journal_path, 'wb') as f:
+            f.write(JOURNAL_HEADER.pack(offset, len(payload), zlib.crc32(payload)))
+            f.write(payload)
+            if self.fsync != "none":
+                _fsync(f)
+
+    def recover(self):
+        """Replay a journal left behind by a crashed flush. Returns True if one was replayed."""
+        with self.lock:
+            try:
+                with open(self.journal_path, 'rb') as f:
+                    header = f.read(JOURNAL_HEADER.size)
+                    payload = f.read()
+            except FileNotFoundError:
+                return False
+            replayed = False
+            if len(header) == JOURNAL_HEADER.size:
+                offset, length, crc = JOURNAL_HEADER.unpack(header)
+                if len(payload) == length and zlib.crc32(payload) == crc:
+                    with open(self.path, 'ab') as f:
+                        f.truncate(offset)
+                        f.write(payload)
+                        if self.fsync != "none":
+                            _fsync(f)
+                    replayed = True
+            # A torn journal means the crash happened before the data file
+            # was touched, so there is nothing to undo
+            os.remove(self.journal_path)
+            return replayed
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,32 @@
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+MOOD_HEADER = ["Timestamp", "Username", "Mood", "State"]
+
+# Emojis and their corresponding states
+EMOJI_STATE_MAP = {
+    "😄": "Thrivin'",
+    "😊": "Chillin'",
+    "😐": "Meh!",
+    "😔": "Low Key",
+    "😞": "Cooked >_>"
+}
+EMOJIS = list(EMOJI_STATE_MAP.keys())
+
+MOOD_RESPONSE_MAP = {
+    "😄": "Yaaas! Love to see you thriving! Keep that energy up!",
+    "😊": "Smooth sailing. Glad you're vibing. Keep it mellow!",
+    "😐": "Fair enough. Not every day's a banger. Tomorrow's a reset.",
+    "😔": "Aww, sending a little sunshine your way. Hope today feels lighter.",
+    "😞": "Oh no, you got roasted by the day! Hope today serves better vibes."
+}
+
+# Compact mood codes are the index into EMOJIS; anything else is UNKNOWN_MOOD_CODE
+UNKNOWN_MOOD_CODE = 255
+MOOD_CODES = {emoji: code for code, emoji in enumerate(EMOJIS)}
+
+
+def mood_code(mood):
+    return MOOD_CODES.get(mood, UNKNOWN_MOOD_CODE)
+
+
+def mood_from_code(code):
+    return EMOJIS[code] if code < len(EMOJIS) else None
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import struct
+from datetime import date
+
+from file_lock import FileLock
+
+# On-disk layout: a small header followed by a power-of-two table of
+# fixed-size slots addressed by a hash of the username (open addressing,
+# linear probing). Lookups and upserts touch the header plus a handful of
+# slots, independent of how many users the ledger holds.
+MAGIC = b"MCNL"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxII")  # magic, version, slot count, used slots
+SLOT = struct.Struct("<Q64sI")  # key hash, username (utf-8, NUL padded), date ordinal
+MAX_USERNAME_BYTES = 64
+INITIAL_SLOTS = 1024
+MAX_LOAD = 0.7
+
+
+def _key(username):
+    digest = hashlib.blake2b(username.encode("utf-8"), digest_size=8).digest()
+    # Zero marks an empty slot, so never hand it out as a key
+    return int.from_bytes(digest, "little") | 1
+
+
+def _encode_username(username):
+    raw = username.encode("utf-8")
+    if len(raw) > MAX_USERNAME_BYTES:
+        raise ValueError(f"Username longer than {MAX_USERNAME_BYTES} bytes: {username!r}")
+    return raw
+
+
+class NotificationLedger:
+    """Per-user 'last notified on' dates with O(1) lookup and upsert.
+
+    Writers hold ``lock``; ``get()`` reads without it. The file is only ever
+    modified in place (never replaced), so a reader's open handle cannot
+    block a writer on Windows, and slot values are never rewritten to
+    anything but a newer date. A lookup that misses while a resize is in
+    flight (its snapshot exists or the slot count changed under the probe)
+    is repeated under the lock; any other miss answers None without it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.snapshot_path = path + ".grow"
+        self.lock = FileLock(path)
+
+    def _create(self, slots=INITIAL_SLOTS):
+        with open(self.path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, slots, 0))
+            f.truncate(HEADER.size + slots * SLOT.size)
+
+    @staticmethod
+    def _read_header(f):
+        f.seek(0)
+        magic, version, slots, used = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a notification ledger file")
+        return slots, used
+
+    @staticmethod
+    def _probe(f, slots, key, raw_name):
+        """Return (index, slot tuple or None) for the username's slot or the first free one."""
+        index = key & (slots - 1)
+        for _ in range(slots):
+            f.seek(HEADER.size + index * SLOT.size)
+            slot_key, name, ordinal = SLOT.unpack(f.read(SLOT.size))
+            if slot_key == 0:
+                return index, None
+            if slot_key == key and name.rstrip(b"\0") == raw_name:
+                return index, (slot_key, name, ordinal)
+            index = (index + 1) & (slots - 1)
+        raise RuntimeError("Notification ledger is full")
+
+    def _lookup(self, username, raw_name):
+        """Return (slot tuple or None, whether the miss may have raced a resize)."""
+        try:
+            with open(self.path, 'rb') as f:
+                slots, _ = self._read_header(f)
+                resizing = os.path.exists(self.snapshot_path)
+                slot = self._probe(f, slots, _key(username), raw_name)[1]
+                if slot is None and not resizing:
+                    # A resize that started after the header was read either
+                    # still has its snapshot or has already changed the header
+                    resizing = os.path.exists(self.snapshot_path) or self._read_header(f)[0] != slots
+                return slot, resizing
+        except FileNotFoundError:
+            return None, os.path.exists(self.snapshot_path)
+
+    def get(self, username):
+        """Return the ISO date the user was last notified, or None."""
+        raw_name = _encode_username(username)
+        slot, resizing = self._lookup(username, raw_name)
+        if slot is None and resizing:
+            try:
+                with self.lock:
+                    self._recover()
+                    slot, _ = self._lookup(username, raw_name)
+            except TimeoutError:
+                # A writer is stuck mid-resize; treat the user as not notified
+                return None
+        if slot is None:
+            return None
+        return date.fromordinal(slot[2]).isoformat()
+
+    def set(self, username, day):
+        """Record ``day`` (ISO date string) as the user's last notification date."""
+        self.update({username: day})
+
+    def update(self, entries):
+        """Upsert many ``{username: iso_date}`` entries under a single lock."""
+        with self.lock:
+            self._recover()
+            if not os.path.exists(self.path):
+                self._create()
+            for username, day in entries.items():
+                self._upsert(username, day)
+
+    def _upsert(self, username, day):
+        raw_name = _encode_username(username)
+        key = _key(username)
+        ordinal = date.fromisoformat(day).toordinal()
+        with open(self.path, 'r+b') as f:
+            slots, used = self._read_header(f)
+            index, slot = self._probe(f, slots, key, raw_name)
+            f.seek(HEADER.size + index * SLOT.size)
+            f.write(SLOT.pack(key, raw_name, ordinal))
+            if slot is None:
+                used += 1
+                f.seek(0)
+                f.write(HEADER.pack(MAGIC, VERSION, slots, used))
+        if used > slots * MAX_LOAD:
+            self._grow(slots * 2)
+
+    def _grow(self, slots):
+        # Rehash in place, because replacing the file fails on Windows while a
+        # reader has it open. The old table is saved first so a crash midway
+        # can be finished by _recover() instead of losing entries.
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(self.path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            dst.write(src.read())
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._rehash(slots)
+
+    def _rehash(self, slots):
+        entries = list(NotificationLedger(self.snapshot_path).items())
+        with open(self.path, 'r+b') as f:
+            # Extend first so a reader never reads past the end of the file
+            f.truncate(HEADER.size + slots * SLOT.size)
+            f.seek(HEADER.size)
+            f.write(bytes(slots * SLOT.size))
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, slots, len(entries)))
+            for username, day in entries:
+                raw_name = _encode_username(username)
+                key = _key(username)
+                index, _ = self._probe(f, slots, key, raw_name)
+                f.seek(HEADER.size + index * SLOT.size)
+                f.write(SLOT.pack(key, raw_name, date.fromisoformat(day).toordinal()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.remove(self.snapshot_path)
+
+    def _recover(self):
+        """Finish a resize interrupted by a crash. Call with the lock held."""
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                slots, _ = self._read_header(f)
+        except FileNotFoundError:
+            return
+        self._rehash(slots * 2)
+
+    def items(self):
+        """Yield (username, iso_date) for every user in the ledger."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            slots, _ = self._read_header(f)
+            for _ in range(slots):
+                slot_key, name, ordinal = SLOT.unpack(f.read(SLOT.size))
+                if slot_key:
+                    yield name.rstrip(b"\0").decode("utf-8"), date.fromordinal(ordinal).isoformat()
+
+    def __len__(self):
+        try:
+            with open(self.path, 'rb') as f:
+                return self._read_header(f)[1]
+        except FileNotFoundError:
+            return 0
+
+
+def migrate_text_ledger(text_path, ledger_path):
+    """Import a legacy ``user,date`` text file into a ledger. Returns the number of users."""
+    entries = {}
+    try:
+        with open(text_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                parts = line.strip().split(',')
+                if len(parts) != 2:
+                    continue
+                user, last_date = parts
+                try:
+                    date.fromisoformat(last_date)
+                except ValueError:
+                    continue
+                entries[user] = last_date
+    except FileNotFoundError:
+        return 0
+    NotificationLedger(ledger_path).update(entries)
+    return len(entries)
@@ -0,0 +1,201 @@
+import argparse
+import glob
+import os
+import shutil
+import sys
+from datetime import datetime, timedelta
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    # Only the BI export needs pyarrow; the desktop app never imports this module
+    pa = pq = None
+
+from log_checkpoint import LogCheckpoint
+from mood_reader import MoodReader
+from moods import EMOJIS, EMOJI_STATE_MAP, MOOD_CODES
+
+STATE_FILE = "_export_state.json"
+CHECKINS_DIR = "checkins"
+DAILY_DIR = os.path.join("rollups", "daily")
+USERS_DIR = os.path.join("rollups", "users")
+WEEKLY_FILE = os.path.join("rollups", "weekly.parquet")
+ROLLUP_FILE = "rollup.parquet"
+STATES = [EMOJI_STATE_MAP[emoji] for emoji in EMOJIS]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("parquet_export needs pyarrow: pip install pyarrow")
+
+
+def _month_dir(out_dir, kind, month):
+    return os.path.join(out_dir, kind, f"month={month}")
+
+
+def _codes_column(codes, values):
+    """Dictionary-encode small integer codes against the fixed ``values`` dictionary."""
+    return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int8()), pa.array(values, type=pa.string()))
+
+
+def _checkins_table(columns):
+    return pa.table({
+        "timestamp": pa.array(columns["timestamp"], type=pa.timestamp("s")),
+        "day": pa.array(columns["day"], type=pa.date32()),
+        "username": pa.array(columns["username"], type=pa.string()).dictionary_encode(),
+        "mood": _codes_column(columns["mood_code"], EMOJIS),
+        "state": _codes_column(columns["mood_code"], STATES),
+        "mood_code": pa.array(columns["mood_code"], type=pa.uint8()),
+        # 5 (😄) down to 1 (😞), as in mood_analytics.MOOD_SCORES
+        "score": pa.array([len(EMOJIS) - code for code in columns["mood_code"]], type=pa.uint8()),
+    })
+
+
+def _rollup(table, keys):
+    """Check-ins, mean score, last check-in and per-state counts grouped by ``keys``."""
+    stats = {}
+    for row in table.group_by(keys).aggregate(
+            [("score", "count"), ("score", "mean"), ("timestamp", "max")]).to_pylist():
+        stats[tuple(row[key] for key in keys)] = row
+    counts = {key: [0] * len(EMOJIS) for key in stats}
+    for row in table.group_by(keys + ["mood_code"]).aggregate([("score", "count")]).to_pylist():
+        counts[tuple(row[key] for key in keys)][row["mood_code"]] = row["score_count"]
+
+    ordered = sorted(stats)
+    columns = {key: [group[i] for group in ordered] for i, key in enumerate(keys)}
+    columns["check_ins"] = [stats[group]["score_count"] for group in ordered]
+    columns["mean_score"] = [stats[group]["score_mean"] for group in ordered]
+    columns["last_check_in"] = [stats[group]["timestamp_max"] for group in ordered]
+    for code, state in enumerate(STATES):
+        columns[state] = [counts[group][code] for group in ordered]
+    return pa.table(columns)
+
+
+class ParquetExporter:
+    """Incremental export of the mood log into month-partitioned Parquet files.
+
+    Layout under ``out_dir``::
+
+        checkins/month=YYYY-MM/part-<offset>.parquet   typed, dictionary-encoded rows
+        rollups/daily/month=YYYY-MM/rollup.parquet     per-day counts and mean score
+        rollups/users/month=YYYY-MM/rollup.parquet     per-user-per-month counts
+        rollups/weekly.parquet                         per-week counts (from the daily rollups)
+
+    Each ``export`` reads only rows appended since the last one, adds one
+    part file to each month they fall in and rebuilds the rollups of just
+    those months. Untouched partitions are never rewritten.
+    """
+
+    def __init__(self, mood_path, out_dir):
+        _require_pyarrow()
+        self.mood_path = mood_path
+        self.out_dir = out_dir
+        self.state_path = os.path.join(out_dir, STATE_FILE)
+        os.makedirs(out_dir, exist_ok=True)
+        self.checkpoint = LogCheckpoint(mood_path, self.state_path)
+        self.lock = self.checkpoint.lock
+
+    def _clear(self):
+        for name in (CHECKINS_DIR, "rollups"):
+            shutil.rmtree(os.path.join(self.out_dir, name), ignore_errors=True)
+
+    def export(self, rebuild=False):
+        """Export newly appended rows. Returns the sorted list of months written."""
+        with self.lock:
+            if not os.path.exists(self.mood_path):
+                return []
+            state = self.checkpoint.load()
+            if rebuild or self.checkpoint.is_stale(state):
+                self._clear()
+                state = self.checkpoint.reset(rejected=0)
+            start = state["offset"]
+            reader = MoodReader(self.mood_path, start_offset=start)
+            months = {}
+            for record in reader:
+                timestamp = datetime.fromisoformat(record.timestamp)
+                columns = months.setdefault(record.timestamp[:7], {
+                    "timestamp": [], "day": [], "username": [], "mood_code": []})
+                columns["timestamp"].append(timestamp)
+                columns["day"].append(timestamp.date())
+                columns["username"].append(record.username)
+                columns["mood_code"].append(MOOD_CODES[record.mood])
+
+            for month, columns in months.items():
+                part_dir = _month_dir(self.out_dir, CHECKINS_DIR, month)
+                os.makedirs(part_dir, exist_ok=True)
+                # Named after the start offset, so a re-run after a crash overwrites it
+                pq.write_table(_checkins_table(columns), os.path.join(part_dir, f"part-{start:012d}.parquet"))
+                self._write_month_rollups(month)
+            if months:
+                self._write_weekly_rollup()
+
+            self.checkpoint.advance(state, reader.offset)
+            state["rejected"] += sum(reader.rejected.values())
+            self.checkpoint.save(state)
+            return sorted(months)
+
+    def _write_month_rollups(self, month):
+        table = read_checkins(self.out_dir, [month], ["timestamp", "day", "username", "mood_code", "score"])
+        table = table.set_column(table.schema.get_field_index("username"), "username",
+                                 table.column("username").cast(pa.string()))
+        for kind, keys in ((DAILY_DIR, ["day"]), (USERS_DIR, ["username"])):
+            rollup_dir = _month_dir(self.out_dir, kind, month)
+            os.makedirs(rollup_dir, exist_ok=True)
+            pq.write_table(_rollup(table, keys), os.path.join(rollup_dir, ROLLUP_FILE))
+
+    def _write_weekly_rollup(self):
+        weeks = {}
+        for path in sorted(glob.glob(os.path.join(self.out_dir, DAILY_DIR, "month=*", ROLLUP_FILE))):
+            for row in pq.read_table(path).to_pylist():
+                week = row["day"] - timedelta(days=row["day"].weekday())
+                totals = weeks.setdefault(week, {"check_ins": 0, "score_sum": 0.0, "counts": [0] * len(EMOJIS)})
+                totals["check_ins"] += row["check_ins"]
+                totals["score_sum"] += row["mean_score"] * row["check_ins"]
+                for code, state in enumerate(STATES):
+                    totals["counts"][code] += row[state]
+        ordered = sorted(weeks)
+        columns = {
+            "week": pa.array(ordered, type=pa.date32()),
+            "check_ins": [weeks[week]["check_ins"] for week in ordered],
+            "mean_score": [weeks[week]["score_sum"] / weeks[week]["check_ins"] for week in ordered],
+        }
+        for code, state in enumerate(STATES):
+            columns[state] = [weeks[week]["counts"][code] for week in ordered]
+        pq.write_table(pa.table(columns), os.path.join(self.out_dir, WEEKLY_FILE))
+
+
+def read_checkins(out_dir, months=None, columns=None):
+    """Read exported check-ins, opening only the ``months`` partitions and ``columns`` asked for."""
+    _require_pyarrow()
+    if months is None:
+        pattern = os.path.join(out_dir, CHECKINS_DIR, "month=*", "*.parquet")
+        paths = sorted(glob.glob(pattern))
+    else:
+        paths = []
+        for month in months:
+            paths.extend(sorted(glob.glob(os.path.join(_month_dir(out_dir, CHECKINS_DIR, month), "*.parquet"))))
+    if not paths:
+        return None
+    return pa.concat_tables([pq.read_table(path, columns=columns) for path in paths])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the mood history to month-partitioned Parquet.")
+    parser.add_argument("path", nargs="?", default="employee_mood_data.csv")
+    parser.add_argument("--output", default="mood_export", help="export directory")
+    parser.add_argument("--rebuild", action="store_true", help="discard earlier exports and start over")
+    args = parser.parse_args(argv)
+
+    try:
+        exporter = ParquetExporter(args.path, args.output)
+    except ImportError as e:
+        print(e)
+        return 1
+    months = exporter.export(rebuild=args.rebuild)
+    print(f"Wrote {len(months)} month partition(s): {', '.join(months) or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
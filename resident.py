@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QAction
+from PySide6.QtWidgets import QApplication, QMenu, QSystemTrayIcon
+
+import main
+import resources
+from mood_window import MoodWindow
+
+# How often the schedule is checked. Polling the wall clock, rather than one
+# long timer, keeps the prompt on time across sleep, hibernate and clock changes
+SCHEDULE_CHECK_MS = 60 * 1000
+
+
+def parse_prompt_time(text):
+    """Parse an "HH:MM" prompt time."""
+    try:
+        return datetime.strptime(text, "%H:%M").time()
+    except ValueError:
+        raise ValueError(f"Prompt time must be HH:MM, got {text!r}") from None
+
+
+def next_prompt_after(now, prompt_time):
+    """The first prompt strictly after ``now``."""
+    candidate = datetime.combine(now.date(), prompt_time)
+    if candidate <= now:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class ResidentTray(QObject):
+    """Long-running tray process that keeps a hidden ``MoodWindow`` ready.
+
+    The window and its result page are built once at startup, so the daily
+    prompt (or a click on the tray icon) only has to show it.
+    """
+
+    def __init__(self, prompt_time, clock=datetime.now, parent=None):
+        super().__init__(parent)
+        self.prompt_time = prompt_time
+        self.clock = clock
+        self.window = MoodWindow(show=False)
+        self.window.build_result_page()
+
+        self.tray = QSystemTrayIcon(resources.icon(resources.LOGO), self)
+        self.tray.setToolTip("Daily Mood Check")
+        self.menu = QMenu()
+        check_in_action = QAction("Check in now", self.menu)
+        check_in_action.triggered.connect(self.on_check_in_requested)
+        quit_action = QAction("Quit", self.menu)
+        quit_action.triggered.connect(QApplication.quit)
+        self.menu.addAction(check_in_action)
+        self.menu.addAction(quit_action)
+        self.tray.setContextMenu(self.menu)
+        self.tray.activated.connect(self.on_activated)
+
+        # Logging on after today's prompt time still gets today's prompt
+        self.next_prompt = datetime.combine(clock().date(), prompt_time)
+        self.timer = QTimer(self)
+        self.timer.setInterval(SCHEDULE_CHECK_MS)
+        self.timer.timeout.connect(self.check_schedule)
+
+    def start(self):
+        self.tray.show()
+        self.timer.start()
+        self.check_schedule()
+
+    def check_schedule(self):
+        now = self.clock()
+        if now < self.next_prompt:
+            return
+        self.next_prompt = next_prompt_after(now, self.prompt_time)
+        if main.check_notification_eligibility():
+            self.prompt()
+
+    def prompt(self):
+        self.tray.showMessage("Daily Mood Check", "Hey user, how was your day?",
+                              QSystemTrayIcon.Information, 10000)
+        self.window.present()
+
+    def on_activated(self, reason):
+        if reason in (QSystemTrayIcon.Trigger, QSystemTrayIcon.DoubleClick):
+            self.on_check_in_requested()
+
+    def on_check_in_requested(self):
+        if self.window.isVisible():
+            self.window.raise_()
+            self.window.activateWindow()
+        elif main.check_notification_eligibility():
+            self.window.present()
+        else:
+            self.tray.showMessage("Daily Mood Check", "You have already checked in today.",
+                                  QSystemTrayIcon.Information, 5000)
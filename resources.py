@@ -0,0 +1,97 @@
+import base64
+import os
+import sys
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PySide6.QtGui import QIcon, QPixmap
+
+# Assets live next to the code rather than in the working directory, which
+# for the scheduled task is the data directory
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+LOGO = "Shorthills Logo Light Bg.png"
+LOGO_SIZE = 80
+
+# Pre-scaled variants written by embed_assets() into embedded_assets.py
+EMBEDDED_SIZES = [(LOGO, LOGO_SIZE), (LOGO, LOGO_SIZE * 2)]
+
+_sources = {}
+_scaled = {}
+_icons = {}
+
+
+def asset_path(name):
+    return os.path.join(ASSET_DIR, name)
+
+
+def _embedded_bytes(name, pixel_size):
+    try:
+        import embedded_assets
+    except ImportError:
+        return None
+    data = embedded_assets.ASSETS.get((name, pixel_size))
+    return base64.b64decode(data) if data else None
+
+
+def source_pixmap(name):
+    """Decode an asset from disk once per process."""
+    if name not in _sources:
+        _sources[name] = QPixmap(asset_path(name))
+    return _sources[name]
+
+
+def pixmap(name, size, dpr=1.0):
+    """Return ``name`` scaled to fit ``size`` x ``size`` logical pixels at device pixel ratio ``dpr``.
+
+    Each (asset, size, dpr) variant is scaled once and then served from
+    memory; an embedded pre-scaled copy is used instead of decoding and
+    rescaling the full-size file when one is available.
+    """
+    key = (name, size, dpr)
+    if key not in _scaled:
+        pixel_size = round(size * dpr)
+        data = _embedded_bytes(name, pixel_size)
+        if data is not None:
+            result = QPixmap()
+            result.loadFromData(data, "PNG")
+        else:
+            result = source_pixmap(name).scaled(pixel_size, pixel_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        result.setDevicePixelRatio(dpr)
+        _scaled[key] = result
+    return _scaled[key]
+
+
+def icon(name):
+    if name not in _icons:
+        _icons[name] = QIcon(source_pixmap(name))
+    return _icons[name]
+
+
+def clear_cache():
+    _sources.clear()
+    _scaled.clear()
+    _icons.clear()
+
+
+def embed_assets(output_path=None, sizes=EMBEDDED_SIZES):
+    """Write pre-scaled PNG bytes for ``sizes`` into an importable embedded_assets module."""
+    output_path = output_path or os.path.join(ASSET_DIR, "embedded_assets.py")
+    lines = ["# Generated by resources.embed_assets(); do not edit.", "ASSETS = {"]
+    for name, pixel_size in sizes:
+        scaled = source_pixmap(name).scaled(pixel_size, pixel_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        scaled.save(buffer, "PNG")
+        buffer.close()
+        encoded = base64.b64encode(bytes(data)).decode("ascii")
+        lines.append(f"    ({name!r}, {pixel_size}): {encoded!r},")
+    lines.append("}")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return output_path
+
+
+if __name__ == "__main__":
+    from PySide6.QtGui import QGuiApplication
+    app = QGuiApplication(sys.argv)
+    print(f"Wrote {embed_assets()}")
@@ -0,0 +1,326 @@
+import argparse
+import gzip
+import json
+import os
+import shutil
+import sys
+import uuid
+from collections import Counter
+from datetime import date
+
+from file_lock import FileLock
+from mood_reader import MoodReader
+from mood_writer import MoodWriter, encode_rows
+from moods import EMOJI_STATE_MAP, EMOJIS, MOOD_HEADER
+
+MANIFEST_FILE = "manifest.json"
+SEGMENT_PREFIX = "moods-"
+# Rows read from a legacy single-file log before they are written out
+IMPORT_BATCH = 10000
+
+
+def segment_name(month, compacted=False, compress=False, generation=0):
+    """File name of a segment for the "YYYY-MM" ``month``.
+
+    Recompacting a month writes the next ``generation``, so the segment
+    being written is never one of the segments being read.
+    """
+    if not compacted:
+        return f"{SEGMENT_PREFIX}{month}.csv"
+    suffix = f".{generation}" if generation else ""
+    return f"{SEGMENT_PREFIX}{month}.compact{suffix}.csv" + (".gz" if compress else "")
+
+
+def month_of(day):
+    return day[:7]
+
+
+def months_before(today, count):
+    """The "YYYY-MM" month ``count`` months before ``today``'s month."""
+    index = today.year * 12 + today.month - 1 - count
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+class SegmentedMoodStore:
+    """Mood log split into one CSV segment per calendar month, listed in a manifest.
+
+    ``write`` appends each row to the segment for its month through a
+    ``MoodWriter``, so the current month stays a plain, journaled CSV.
+    ``maintain`` compacts finished months into a single sorted (and
+    optionally gzip-compressed) segment and drops months past the retention
+    age. Range queries and backups use the manifest to open only the
+    segments they need.
+    """
+
+    def __init__(self, directory, fsync="batch"):
+        self.path = directory
+        self.fsync = fsync
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        os.makedirs(directory, exist_ok=True)
+        # Held while the manifest changes and around every append, so a
+        # segment is never compacted or dropped underneath a writer
+        self.lock = FileLock(self.manifest_path)
+        self.writers = {}
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"segments": {}}
+
+    def _save_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def segments(self):
+        """``{month: [segment entry, ...]}`` as recorded in the manifest."""
+        return self._load_manifest()["segments"]
+
+    def _segment_path(self, name):
+        return os.path.join(self.path, name)
+
+    def _writer(self, month):
+        writer = self.writers.get(month)
+        if writer is None:
+            path = self._segment_path(segment_name(month))
+            writer = self.writers[month] = MoodWriter(path, fsync=self.fsync, header=MOOD_HEADER)
+        return writer
+
+    def write(self, rows):
+        by_month = {}
+        for row in rows:
+            by_month.setdefault(month_of(row[0]), []).append(row)
+        with self.lock:
+            manifest = self._load_manifest()
+            changed = False
+            for month in by_month:
+                name = segment_name(month)
+                entries = manifest["segments"].setdefault(month, [])
+                if not any(entry["file"] == name for entry in entries):
+                    # A segment on disk but not in the manifest was already
+                    # compacted and only outlived a crash; appending to it
+                    # would bring its rows back a second time
+                    self.writers.pop(month, None)
+                    self._remove_segment(name)
+                    # Lets backups tell a recreated segment from the one they copied
+                    entries.append({"file": name, "compacted": False, "id": uuid.uuid4().hex})
+                    changed = True
+            if changed:
+                self._save_manifest(manifest)
+            for month, month_rows in sorted(by_month.items()):
+                self._writer(month).write(month_rows)
+
+    def flush(self):
+        for writer in self.writers.values():
+            writer.flush()
+
+    def close(self):
+        self.flush()
+
+    def _records(self, entries):
+        for entry in entries:
+            path = self._segment_path(entry["file"])
+            if os.path.exists(path):
+                yield from MoodReader(path)
+
+    def read_range(self, start=None, end=None):
+        """Yield records with ISO days in [start, end], opening only the segments for those months."""
+        segments = self.segments()
+        for month in sorted(segments):
+            if (start is not None and month < month_of(start)) or (end is not None and month > month_of(end)):
+                continue
+            for record in self._records(segments[month]):
+                day = record.timestamp[:10]
+                if (start is None or day >= start) and (end is None or day <= end):
+                    yield record
+
+    def compact(self, month, compress=True):
+        """Rewrite every segment of ``month`` as one timestamp-sorted segment. Returns its row count.
+
+        Rows the ``MoodReader`` rejects are moved to ``<segment>.rejected.csv``.
+        The new segment is written and listed in the manifest before the
+        segments it replaces are deleted, so a crash at any point leaves the
+        manifest naming files that hold every row.
+        """
+        with self.lock:
+            manifest = self._load_manifest()
+            entries = manifest["segments"].get(month, [])
+            if any(not entry["compacted"] for entry in entries):
+                # Finish pending and crashed appends before reading the segment
+                writer = self._writer(month)
+                writer.flush()
+                writer.recover()
+            inputs = {entry["file"] for entry in entries}
+            generation = 0
+            while segment_name(month, True, compress, generation) in inputs:
+                generation += 1
+            name = segment_name(month, compacted=True, compress=compress, generation=generation)
+            quarantine = self._segment_path(segment_name(month) + ".rejected.csv")
+            records = []
+            for entry in entries:
+                path = self._segment_path(entry["file"])
+                if os.path.exists(path):
+                    records.extend(MoodReader(path, quarantine=quarantine))
+            records.sort(key=lambda record: record.timestamp)
+
+            payload = encode_rows([MOOD_HEADER] + [list(record) for record in records])
+            tmp_path = self._segment_path(name + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(payload) if compress else payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._segment_path(name))
+            self.writers.pop(month, None)
+            manifest["segments"][month] = [{
+                "file": name,
+                "compacted": True,
+                "id": uuid.uuid4().hex,
+                "rows": len(records),
+                "first": records[0].timestamp if records else None,
+                "last": records[-1].timestamp if records else None,
+            }]
+            self._save_manifest(manifest)
+            for old in inputs - {name}:
+                self._remove_segment(old)
+            return len(records)
+
+    def _remove_segment(self, name):
+        # Segment locks are only taken under self.lock, so nobody holds this one
+        path = self._segment_path(name)
+        for leftover in (path, path + ".journal", path + ".lock"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+    def drop(self, month):
+        """Delete every segment of ``month``."""
+        with self.lock:
+            manifest = self._load_manifest()
+            for entry in manifest["segments"].pop(month, []):
+                self._remove_segment(entry["file"])
+            self.writers.pop(month, None)
+            self._save_manifest(manifest)
+
+    def maintain(self, today=None, compress=True, retention_months=None):
+        """Compact finished months and drop those past ``retention_months``.
+
+        Returns ``{"compacted": [...], "dropped": [...]}`` listing the months affected.
+        """
+        today = today or date.today()
+        current = today.isoformat()[:7]
+        cutoff = months_before(today, retention_months) if retention_months is not None else None
+        result = {"compacted": [], "dropped": []}
+        for month, entries in sorted(self.segments().items()):
+            if cutoff is not None and month < cutoff:
+                self.drop(month)
+                result["dropped"].append(month)
+            elif month < current and not (len(entries) == 1 and entries[0]["compacted"]):
+                self.compact(month, compress=compress)
+                result["compacted"].append(month)
+        return result
+
+    def import_csv(self, csv_path):
+        """Split a single-file mood log into monthly segments. Returns the number of rows imported."""
+        imported = 0
+        batch = []
+        for record in MoodReader(csv_path):
+            batch.append(list(record))
+            if len(batch) >= IMPORT_BATCH:
+                self.write(batch)
+                imported += len(batch)
+                batch = []
+        if batch:
+            self.write(batch)
+            imported += len(batch)
+        return imported
+
+    def backup(self, dest):
+        """Bring the copy of this store in ``dest`` up to date. Returns the number of bytes copied.
+
+        Active segments are append-only, so only the bytes appended since the
+        last backup are copied; compacted segments are copied once. A segment
+        is only extended if the backup's manifest shows it is the same
+        segment (same ``id``), not one recreated under the same name.
+        """
+        os.makedirs(dest, exist_ok=True)
+        copied = 0
+        with self.lock:
+            manifest = self._load_manifest()
+            backed_up = SegmentedMoodStore(dest).segments()
+            backed_up_ids = {entry["file"]: entry.get("id") for entries in backed_up.values() for entry in entries}
+            names = set()
+            for entries in manifest["segments"].values():
+                for entry in entries:
+                    name = entry["file"]
+                    names.add(name)
+                    source = self._segment_path(name)
+                    target = os.path.join(dest, name)
+                    if not os.path.exists(source):
+                        continue
+                    size = os.path.getsize(source)
+                    done = os.path.getsize(target) if os.path.exists(target) else 0
+                    if backed_up_ids.get(name) != entry.get("id"):
+                        done = 0
+                        if os.path.exists(target):
+                            os.remove(target)
+                    if entry["compacted"]:
+                        if done == size and os.path.getmtime(target) == os.path.getmtime(source):
+                            continue
+                        shutil.copy2(source, target)
+                        copied += size
+                    elif done < size:
+                        with open(source, 'rb') as src, open(target, 'ab') as dst:
+                            src.seek(done)
+                            shutil.copyfileobj(src, dst)
+                        copied += size - done
+                    elif done > size:
+                        shutil.copyfile(source, target)
+                        copied += size
+            # Segments replaced by compaction or dropped by retention
+            for name in os.listdir(dest):
+                if name.startswith(SEGMENT_PREFIX) and name not in names:
+                    os.remove(os.path.join(dest, name))
+            tmp_path = os.path.join(dest, MANIFEST_FILE + ".tmp")
+            shutil.copyfile(self.manifest_path, tmp_path)
+            os.replace(tmp_path, os.path.join(dest, MANIFEST_FILE))
+        return copied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the month-partitioned mood log.")
+    parser.add_argument("--dir", default="mood_segments", help="segment directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="split a single-file mood CSV into segments")
+    import_parser.add_argument("csv", nargs="?", default="employee_mood_data.csv")
+    maintain_parser = commands.add_parser("maintain", help="compact finished months and apply retention")
+    maintain_parser.add_argument("--retention-months", type=int, help="drop months older than this")
+    maintain_parser.add_argument("--no-compress", action="store_true", help="keep compacted segments as plain CSV")
+    query_parser = commands.add_parser("query", help="count check-ins per mood between two days")
+    query_parser.add_argument("--start", help="first ISO day")
+    query_parser.add_argument("--end", help="last ISO day")
+    backup_parser = commands.add_parser("backup", help="copy new data to a backup directory")
+    backup_parser.add_argument("dest")
+    args = parser.parse_args(argv)
+
+    store = SegmentedMoodStore(args.dir)
+    if args.command == "import":
+        print(f"Imported {store.import_csv(args.csv)} rows into {args.dir}")
+    elif args.command == "maintain":
+        result = store.maintain(compress=not args.no_compress, retention_months=args.retention_months)
+        print(f"Compacted: {', '.join(result['compacted']) or 'none'}")
+        print(f"Dropped: {', '.join(result['dropped']) or 'none'}")
+    elif args.command == "query":
+        counts = Counter(record.mood for record in store.read_range(args.start, args.end))
+        for emoji in EMOJIS:
+            print(f"{emoji} {EMOJI_STATE_MAP[emoji]}: {counts[emoji]}")
+    elif args.command == "backup":
+        print(f"Copied {store.backup(args.dest)} bytes to {args.dest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+from PySide6.QtCore import QAbstractAnimation, QRectF, QSize, Qt, QVariantAnimation
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPixmap
+from PySide6.QtWidgets import QSizePolicy, QWidget
+
+_glyphs = {}
+
+
+def glyph_pixmap(text, pixel_size, dpr=1.0):
+    """Render ``text`` at ``pixel_size`` px once per process and return the cached pixmap.
+
+    Shaping a colour emoji is the expensive part of drawing it; after this
+    every frame is a plain pixmap blit.
+    """
+    key = (text, pixel_size, dpr)
+    if key not in _glyphs:
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        metrics = QFontMetrics(font)
+        width = max(1, metrics.horizontalAdvance(text))
+        height = max(1, metrics.height())
+        result = QPixmap(round(width * dpr), round(height * dpr))
+        result.setDevicePixelRatio(dpr)
+        result.fill(Qt.transparent)
+        painter = QPainter(result)
+        painter.setFont(font)
+        painter.drawText(QRectF(0, 0, width, height), Qt.AlignCenter, text)
+        painter.end()
+        _glyphs[key] = result
+    return _glyphs[key]
+
+
+def clear_cache():
+    _glyphs.clear()
+
+
+class EmojiSpinner(QWidget):
+    """Cycles through ``frames`` by blitting pre-rendered glyphs.
+
+    A ``QVariantAnimation`` picks the frame and each change only schedules a
+    repaint of this widget: no text is set, no style sheet is parsed and the
+    widget's size never changes, so nothing around it is laid out again.
+    """
+
+    def __init__(self, frames, frame_size=50, final_size=80, interval_ms=150, parent=None):
+        super().__init__(parent)
+        self.frames = list(frames)
+        self.frame_size = frame_size
+        self.final_size = final_size
+        self.frame_interval = interval_ms
+        self.current = self.frames[0]
+        self.glyph_size = frame_size
+        self.offset = 0
+        self.index = 0
+        # Every pixel is painted in paintEvent, so Qt can skip the parent underneath
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(QFontMetrics(self._font(final_size)).height())
+
+        self.animation = QVariantAnimation(self)
+        self.animation.setStartValue(0)
+        self.animation.setEndValue(len(self.frames))
+        self.animation.setDuration(interval_ms * len(self.frames))
+        self.animation.setLoopCount(-1)
+        self.animation.valueChanged.connect(self._on_value)
+
+        for frame in self.frames:
+            for size in (frame_size, final_size):
+                glyph_pixmap(frame, size, self.devicePixelRatioF())
+
+    @staticmethod
+    def _font(pixel_size):
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        return font
+
+    def sizeHint(self):
+        return QSize(self.final_size * 2, self.height())
+
+    def text(self):
+        return self.current
+
+    def is_running(self):
+        return self.animation.state() == QAbstractAnimation.Running
+
+    def start(self, first):
+        """Show ``first`` and start cycling through the frames from there."""
+        self.offset = self.frames.index(first) if first in self.frames else 0
+        self.index = 0
+        self._show(first, self.frame_size)
+        self.animation.start()
+
+    def advance(self):
+        """Step to the next frame by hand."""
+        self.index += 1
+        self._show(self.frames[(self.offset + self.index) % len(self.frames)], self.frame_size)
+
+    def stop(self):
+        self.animation.stop()
+
+    def finish(self, text):
+        """Stop cycling and show ``text`` at the final size."""
+        self.animation.stop()
+        self._show(text, self.final_size)
+
+    def _on_value(self, value):
+        index = min(int(value), len(self.frames) - 1)
+        if index != self.index:
+            self.index = index
+            self._show(self.frames[(self.offset + index) % len(self.frames)], self.frame_size)
+
+    def _show(self, text, size):
+        if (text, size) != (self.current, self.glyph_size):
+            self.current = text
+            self.glyph_size = size
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor("white"))
+        glyph = glyph_pixmap(self.current, self.glyph_size, self.devicePixelRatioF())
+        size = glyph.deviceIndependentSize()
+        painter.drawPixmap(round((self.width() - size.width()) / 2), round((self.height() - size.height()) / 2), glyph)
+        painter.end()
@@ -0,0 +1,209 @@
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from mood_reader import MoodReader
+from notification_ledger import NotificationLedger, migrate_text_ledger
+
+LEGACY_NOTIFICATION_FILE = "last_notification.txt"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS moods (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    day TEXT NOT NULL,
+    username TEXT NOT NULL,
+    mood TEXT NOT NULL,
+    state TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS moods_username_day ON moods (username, day);
+CREATE TABLE IF NOT EXISTS notifications (
+    username TEXT PRIMARY KEY,
+    last_date TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Statements are kept as module constants so sqlite3's per-connection
+# statement cache re-uses the prepared form on every call
+INSERT_MOOD = "INSERT INTO moods (timestamp, day, username, mood, state) VALUES (?, ?, ?, ?, ?)"
+SELECT_HISTORY = ("SELECT timestamp, username, mood, state FROM moods "
+                  "WHERE username = ? AND day >= ? ORDER BY day, timestamp")
+SELECT_CHECKED_IN = "SELECT 1 FROM moods WHERE username = ? AND day = ? LIMIT 1"
+SELECT_NOTIFICATION = "SELECT last_date FROM notifications WHERE username = ?"
+UPSERT_NOTIFICATION = ("INSERT INTO notifications (username, last_date) VALUES (?, ?) "
+                       "ON CONFLICT (username) DO UPDATE SET last_date = excluded.last_date")
+
+POOL_SIZE = 4
+
+
+class ConnectionPool:
+    """A handful of reusable connections, handed out one per thread at a time."""
+
+    def __init__(self, path, size=POOL_SIZE, timeout=10.0):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=self.timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+class SqliteMoodStore:
+    """Mood rows and the notification ledger in one WAL-mode SQLite database.
+
+    Per-user lookups go through the (username, day) index, so saving a
+    check-in and checking eligibility are single indexed row operations.
+    """
+
+    def __init__(self, path, pool_size=POOL_SIZE):
+        self.path = path
+        self.pool = ConnectionPool(path, pool_size)
+        self.ledger = SqliteNotificationLedger(self)
+
+    def write(self, rows):
+        """Insert ``[timestamp, username, mood, state]`` rows in one transaction."""
+        params = [(row[0], row[0][:10], row[1], row[2], row[3]) for row in rows]
+        with self.pool.connection() as conn, conn:
+            conn.executemany(INSERT_MOOD, params)
+        return len(params)
+
+    def flush(self):
+        return 0
+
+    def close(self):
+        self.pool.close()
+
+    def has_checked_in(self, username, day):
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_CHECKED_IN, (username, day)).fetchone() is not None
+
+    def user_history(self, username, since_day):
+        """Return the user's ``(timestamp, username, mood, state)`` rows from ``since_day`` on."""
+        with self.pool.connection() as conn:
+            return conn.execute(SELECT_HISTORY, (username, since_day)).fetchall()
+
+    def import_csv(self, csv_path, batch_size=10000):
+        """Bulk-load a mood CSV (any legacy schema). Returns the number of rows imported."""
+        reader = MoodReader(csv_path)
+        batch = []
+        for record in reader:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                self.write(batch)
+                batch = []
+        self.write(batch)
+        return reader.stats["rows"]
+
+
+class SqliteNotificationLedger:
+    """``NotificationLedger``-compatible view of the notifications table."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, username):
+        with self.store.pool.connection() as conn:
+            row = conn.execute(SELECT_NOTIFICATION, (username,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, username, day):
+        self.update({username: day})
+
+    def update(self, entries):
+        with self.store.pool.connection() as conn, conn:
+            conn.executemany(UPSERT_NOTIFICATION, list(entries.items()))
+
+    def items(self):
+        with self.store.pool.connection() as conn:
+            return conn.execute("SELECT username, last_date FROM notifications").fetchall()
+
+
+def import_legacy(db_path, csv_path=None, notification_path=None, ledger_path=None):
+    """One-shot import of the existing data files. Returns (mood rows, ledger users)."""
+    store = SqliteMoodStore(db_path)
+    try:
+        rows = store.import_csv(csv_path) if csv_path else 0
+        users = 0
+        if ledger_path:
+            entries = dict(NotificationLedger(ledger_path).items())
+            store.ledger.update(entries)
+            users = len(entries)
+        elif notification_path:
+            # Reuse the text-file parser by migrating through a throwaway ledger
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                tmp_ledger = os.path.join(tmp_dir, "ledger.idx")
+                users = migrate_text_ledger(notification_path, tmp_ledger)
+                store.ledger.update(dict(NotificationLedger(tmp_ledger).items()))
+        return rows, users
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import the legacy mood files into SQLite.")
+    parser.add_argument("--db", default="moodcheck.db")
+    parser.add_argument("--csv", default="employee_mood_data.csv", help="mood history CSV to import")
+    parser.add_argument("--ledger", default="last_notification.idx", help="indexed notification ledger to import")
+    parser.add_argument("--notifications",
+                        help="legacy user,date file to import instead of the ledger "
+                             "(default: last_notification.txt, only if the ledger does not exist)")
+    args = parser.parse_args(argv)
+
+    # The app migrated to the indexed ledger and stopped updating the text
+    # file, so the text file is only a fallback for installs that never ran it
+    ledger, notifications = args.ledger, args.notifications
+    if notifications or not os.path.exists(ledger):
+        ledger = None
+        if notifications is None and os.path.exists(LEGACY_NOTIFICATION_FILE):
+            notifications = LEGACY_NOTIFICATION_FILE
+    rows, users = import_legacy(args.db, args.csv, notifications, ledger)
+    print(f"Imported {rows} check-ins and {users} notification dates into {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import builtins
+import getpass
+import os
+import sys
+import time
+from datetime import datetime
+
+# Taken when this module is first imported, which main.py does before
+# anything else, so it is the closest in-process stand-in for launch time
+PROCESS_START = time.monotonic()
+
+# How many of the slowest imports to keep in each profile record
+TOP_IMPORTS = 30
+
+_profile = None
+
+
+class ImportTimer:
+    """Time first-time imports by wrapping ``builtins.__import__``.
+
+    Produces the same self/cumulative split as ``python -X importtime`` but
+    in-process, so it also works under ``pythonw.exe`` where there is no
+    stderr to read the built-in report from.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._original = None
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.records.append((name, elapsed - children, elapsed))
+
+    def slowest(self, limit=TOP_IMPORTS):
+        ranked = sorted(self.records, key=lambda record: record[2], reverse=True)[:limit]
+        return [
+            {"module": name, "self_ms": round(own * 1000, 3), "cumulative_ms": round(total * 1000, 3)}
+            for name, own, total in ranked
+        ]
+
+
+class StartupProfile:
+    """Monotonic timestamps for each named startup phase, relative to ``start``."""
+
+    def __init__(self, start=PROCESS_START, import_timer=None):
+        self.start = start
+        self.phases = []
+        self.import_timer = import_timer
+
+    def mark(self, name):
+        self.phases.append((name, time.monotonic() - self.start))
+
+    def to_dict(self):
+        import platform
+        phases = []
+        previous = 0.0
+        for name, at in self.phases:
+            phases.append({"phase": name, "at_ms": round(at * 1000, 3), "duration_ms": round((at - previous) * 1000, 3)})
+            previous = at
+        record = {
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "username": getpass.getuser(),
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "total_ms": round(previous * 1000, 3),
+            "phases": phases,
+        }
+        if self.import_timer is not None:
+            record["imports"] = self.import_timer.slowest()
+        return record
+
+
+def enable(import_times=False):
+    """Start recording phases for this process; optionally time imports too."""
+    global _profile
+    timer = None
+    if import_times:
+        timer = ImportTimer()
+        timer.install()
+    _profile = StartupProfile(import_timer=timer)
+    return _profile
+
+
+def mark(name):
+    """Record that ``name`` has just finished. A no-op unless profiling is enabled."""
+    if _profile is not None:
+        _profile.mark(name)
+
+
+def finish(path):
+    """Append the profile as one JSON line to ``path`` and stop profiling."""
+    global _profile
+    profile, _profile = _profile, None
+    if profile is None:
+        return None
+    if profile.import_timer is not None:
+        profile.import_timer.uninstall()
+    import json
+    record = profile.to_dict()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + "\n")
+    return record
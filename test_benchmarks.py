@@ -0,0 +1,71 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import benchmarks
+import main
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_generate_history_and_ledger(self):
+        history = os.path.join(self.tmp_dir, "history.csv")
+        names = benchmarks.generate_history(history, 300, 10)
+        with open(history, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(len(rows), 301)
+        self.assertEqual(len(names), 10)
+        self.assertEqual([row[0] for row in rows[1:]], sorted(row[0] for row in rows[1:]))
+
+        ledger = benchmarks.generate_ledger(os.path.join(self.tmp_dir, "ledger.idx"), 500)
+        self.assertEqual(len(ledger), 500)
+        self.assertEqual(ledger.get("user_0000499"), "2024-01-01")
+
+    def test_summarize(self):
+        stats = benchmarks.summarize([0.001] * 98 + [0.002, 0.1], ops_per_sample=10)
+        self.assertEqual(stats["samples"], 100)
+        self.assertEqual(stats["p50_ms"], 1.0)
+        self.assertEqual(stats["p99_ms"], 2.0)
+        self.assertAlmostEqual(stats["ops_per_sec"], 1000 / 0.2, delta=1)
+
+    def test_run_restores_main(self):
+        for storage in benchmarks.STORAGES:
+            with self.subTest(storage=storage):
+                report = benchmarks.run([200], storage, calls=5, passes=1)
+                self.assertIn("save_mood@200", report)
+                self.assertIn("check_notification_eligibility@200", report)
+                self.assertIn("read_moods@200", report)
+                self.assertEqual(main.MOOD_STORAGE, "csv")
+                self.assertEqual(main.MOOD_FILE, "employee_mood_data.csv")
+
+    def test_regression_gate(self):
+        baseline = {"save_mood@100": {"samples": 10, "p50_ms": 1.0, "p99_ms": 2.0, "ops_per_sec": 1000.0}}
+        same = {"save_mood@100": dict(baseline["save_mood@100"])}
+        slower = {"save_mood@100": {"samples": 10, "p50_ms": 1.5, "p99_ms": 2.0, "ops_per_sec": 700.0}}
+        self.assertEqual(benchmarks.compare(same, baseline), [])
+        regressions = benchmarks.compare(slower, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(message.startswith("save_mood@100") for message in regressions))
+        self.assertEqual(benchmarks.compare({"other@1": same["save_mood@100"]}, baseline), [])
+
+    def test_cli_saves_baseline_and_checks(self):
+        baseline = os.path.join(self.tmp_dir, "baseline.json")
+        args = ["--sizes", "100", "--calls", "3", "--passes", "1", "--baseline", baseline]
+        self.assertEqual(benchmarks.main(args + ["--check"]), 1)
+        self.assertEqual(benchmarks.main(args + ["--save-baseline"]), 0)
+        with open(baseline, encoding='utf-8') as f:
+            self.assertIn("save_mood@100", json.load(f)["csv"])
+        # A generous tolerance keeps the re-run from tripping on timing noise
+        self.assertEqual(benchmarks.main(args + ["--check", "--tolerance", "1000", "--p99-tolerance", "1000"]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
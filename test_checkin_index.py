@@ -0,0 +1,142 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from checkin_index import CheckinIndex, main
+from mood_analytics import last_per_day, load_checkins, load_history, rolling_scores
+
+HISTORY_CSV = (
+    "Timestamp,Username,Mood,State\r\n"
+    "2025-05-29 09:00:00,shtlp_0034,😞,Cooked >_>\r\n"
+    "2025-05-29 09:10:00,shtlp_0034,😐,Meh!\r\n"
+    "2025-05-29 09:05:00,shtlp_0034,😔,Low Key\r\n"
+    "2025-05-29 09:30:00,alice,😊,Chillin'\r\n"
+    "2025-05-30 09:00:00,shtlp_0034,😄,Thrivin'\r\n"
+    "2025-05-30 10:00:00,alice,😊👍\r\n"
+)
+
+
+class TestCheckinIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write(HISTORY_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def append(self, line):
+        with open(self.mood_file, 'a', newline='', encoding='utf-8') as f:
+            f.write(line)
+
+    def test_latest_check_in_wins(self):
+        """Test the latest timestamp of each user-day is kept, even if appended out of order"""
+        index = CheckinIndex(self.mood_file)
+        self.assertEqual(index.refresh(), 5)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.get("shtlp_0034", "2025-05-29").mood, "😐")
+        self.assertEqual(index.get("alice", "2025-05-29").timestamp, "2025-05-29 09:30:00")
+        self.assertIsNone(index.get("alice", "2025-05-30"))
+
+    def test_incremental_refresh(self):
+        """Test refresh reads only appended rows and survives a restart"""
+        CheckinIndex(self.mood_file).refresh()
+        self.append("2025-05-30 17:00:00,shtlp_0034,😔,Low Key\r\n")
+        index = CheckinIndex(self.mood_file)
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(index.get("shtlp_0034", "2025-05-30").mood, "😔")
+        self.assertEqual(index.refresh(), 0)
+
+    def test_refresh_appends_only_new_rows(self):
+        """Test a refresh writes the new rows to the delta and leaves the base alone"""
+        index = CheckinIndex(self.mood_file)
+        with patch('checkin_index.COMPACT_MIN_ROWS', 0):
+            index.refresh()
+        self.assertTrue(os.path.exists(index.base_path))
+        base = os.path.getsize(index.base_path)
+        self.append("2025-05-31 08:00:00,bob,😄,Thrivin'\r\n")
+        self.assertEqual(CheckinIndex(self.mood_file).refresh(), 1)
+        self.assertEqual(os.path.getsize(index.base_path), base)
+        with open(index.delta_path, encoding='utf-8') as f:
+            self.assertEqual(f.read().splitlines(), ['["2025-05-31 08:00:00", "bob", "😄"]'])
+        reopened = CheckinIndex(self.mood_file)
+        self.assertEqual(len(reopened), 4)
+        self.assertEqual(reopened.get("bob", "2025-05-31").mood, "😄")
+
+    def test_delta_compacted_into_base(self):
+        """Test the delta is merged into the base once it outgrows it"""
+        with patch('checkin_index.COMPACT_MIN_ROWS', 2):
+            index = CheckinIndex(self.mood_file)
+            index.refresh()
+            self.append("2025-05-31 08:00:00,bob,😄,Thrivin'\r\n")
+            index.refresh()
+            self.assertGreater(os.path.getsize(index.delta_path), 0)
+            for hour in range(10, 13):
+                self.append(f"2025-06-01 {hour}:00:00,bob,😊,Chillin'\r\n")
+            index.refresh()
+        self.assertEqual(os.path.getsize(index.delta_path), 0)
+        reopened = CheckinIndex(self.mood_file)
+        self.assertEqual(reopened.records(), index.records())
+        self.assertEqual(reopened.get("bob", "2025-06-01").timestamp, "2025-06-01 12:00:00")
+
+    def test_torn_delta_append_is_dropped(self):
+        """Test rows appended to the delta by a refresh that crashed before its checkpoint are not kept twice"""
+        index = CheckinIndex(self.mood_file)
+        index.refresh()
+        self.append("2025-05-31 08:00:00,bob,😄,Thrivin'\r\n")
+        with patch.object(index.checkpoint, 'save', side_effect=OSError("power loss")):
+            with self.assertRaises(OSError):
+                index.refresh()
+        reopened = CheckinIndex(self.mood_file)
+        self.assertIsNone(reopened.get("bob", "2025-05-31"))
+        self.assertEqual(reopened.refresh(), 1)
+        with open(index.delta_path, encoding='utf-8') as f:
+            self.assertEqual(sum(1 for line in f if '"bob"' in line), 1)
+
+    def test_add_updates_in_memory(self):
+        """Test check-ins added directly are indexed and not double counted on refresh"""
+        index = CheckinIndex(self.mood_file)
+        index.refresh()
+        row = "2025-05-31 08:00:00,alice,😄,Thrivin'\r\n"
+        self.append(row)
+        self.assertTrue(index.add("2025-05-31 08:00:00", "alice", "😄"))
+        self.assertFalse(index.add("2025-05-31 07:00:00", "alice", "😞"))
+        self.assertEqual(index.get("alice", "2025-05-31").mood, "😄")
+        index.refresh()
+        self.assertEqual(len(index), 4)
+
+    def test_rewritten_log_is_reindexed(self):
+        """Test a rewritten log is indexed from scratch"""
+        CheckinIndex(self.mood_file).refresh()
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write("Timestamp,Username,Mood,State\r\n2025-06-01 09:00:00,bob,😊,Chillin'\r\n")
+        index = CheckinIndex(self.mood_file)
+        index.refresh()
+        self.assertEqual([r.username for r in index.records()], ["bob"])
+
+    def test_analytics_view_matches_raw_dedup(self):
+        """Test the indexed view equals sorting and grouping the raw log"""
+        checkins = load_checkins(self.mood_file)
+        raw = last_per_day(load_history(self.mood_file))
+        self.assertIs(last_per_day(checkins), checkins)
+        self.assertEqual(list(checkins["username"]), list(raw["username"]))
+        self.assertEqual(list(checkins["mood"]), list(raw["mood"]))
+        self.assertTrue((checkins["timestamp"] == raw["timestamp"]).all())
+        self.assertEqual(list(rolling_scores(checkins)["score"]), list(rolling_scores(raw)["score"]))
+
+    def test_cli(self):
+        """Test the command line summary"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main([self.mood_file, "--start", "2025-05-30"]), 0)
+        self.assertIn("1 user-days", output.getvalue())
+        self.assertIn("Thrivin': 1", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
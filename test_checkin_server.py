@@ -0,0 +1,227 @@
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import main
+from checkin_server import CheckinServer, load_test, load_tokens
+from moods import EMOJIS, EMOJI_STATE_MAP, MOOD_RESPONSE_MAP
+
+
+def token(username):
+    return f"token-for-{username}-0123456789"
+
+
+async def request(port, method, target, body=None, user=None, headers=None):
+    """Send one HTTP/1.1 request as ``user`` and return (status, decoded JSON or text)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode("utf-8") if body is not None else b""
+    headers = dict(headers or {})
+    if user:
+        headers["Authorization"] = f"Bearer {token(user)}"
+    extra = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n{extra}"
+                 f"Content-Length: {len(data)}\r\n\r\n".encode("ascii") + data)
+    head = await reader.readuntil(b"\r\n\r\n")
+    _, headers = head.decode("latin-1").split("\r\n", 1)
+    length = int(CheckinServer._parse_head(head)[2]["content-length"])
+    payload = (await reader.readexactly(length)).decode("utf-8")
+    writer.close()
+    status = int(head.split(b" ", 2)[1])
+    if "application/json" in headers:
+        payload = json.loads(payload)
+    return status, payload
+
+
+class TestCheckinServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.mood_file = os.path.join(self.tmp_dir.name, "employee_mood_data.csv")
+        self.patches = [
+            patch('main.MOOD_FILE', self.mood_file),
+            patch('main.NOTIFICATION_LEDGER_FILE', os.path.join(self.tmp_dir.name, "last_notification.idx")),
+            patch('main.MOOD_STORAGE', 'csv'),
+            patch('main._user_history', None),
+            patch('main._checkin_index', None),
+        ]
+        for p in self.patches:
+            p.start()
+        users = ["alice", "bob", "carol", "dave"] + [f"user{i}" for i in range(100)]
+        self.server = await CheckinServer(port=0, tokens={token(user): user for user in users}).start()
+        self.port = self.server.address[1]
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        main.get_mood_writer().close()
+        for p in self.patches:
+            p.stop()
+        self.tmp_dir.cleanup()
+
+    def saved_rows(self):
+        main.get_mood_writer().flush()
+        with open(self.mood_file, newline='', encoding='utf-8') as f:
+            return [row[1:] for row in list(csv.reader(f))[1:]]
+
+    async def test_moods_and_index_page(self):
+        status, body = await request(self.port, "GET", "/moods")
+        self.assertEqual(status, 200)
+        self.assertEqual([m["emoji"] for m in body["moods"]], EMOJIS)
+        self.assertEqual(body["moods"][0]["response"], MOOD_RESPONSE_MAP[EMOJIS[0]])
+        status, page = await request(self.port, "GET", "/")
+        self.assertEqual(status, 200)
+        self.assertIn("/checkins", page)
+
+    async def test_submit_persists_and_blocks_second_checkin(self):
+        status, body = await request(self.port, "POST", "/checkins", {"mood": "😊"}, user="alice")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["username"], "alice")
+        self.assertEqual(body["state"], EMOJI_STATE_MAP["😊"])
+        self.assertEqual(body["response"], MOOD_RESPONSE_MAP["😊"])
+        self.assertEqual(self.saved_rows(), [["alice", "😊", EMOJI_STATE_MAP["😊"]]])
+        self.assertFalse(main.check_notification_eligibility("alice"))
+
+        status, _ = await request(self.port, "POST", "/checkins", {"mood": "😄"}, user="alice")
+        self.assertEqual(status, 409)
+        status, body = await request(self.port, "GET", "/eligibility", user="alice")
+        self.assertEqual((status, body["eligible"]), (200, False))
+        status, body = await request(self.port, "GET", "/history?days=3", user="alice")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["history"][-1][1], "😊")
+        self.assertEqual(len(body["history"]), 3)
+
+    async def test_history_includes_other_processes_checkins(self):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        status, body = await request(self.port, "GET", "/history?days=2", user="alice")
+        self.assertEqual(body["history"], [[yesterday, None], [date.today().isoformat(), None]])
+        # A desktop app appends to the shared log behind the server's back
+        with open(self.mood_file, 'a', newline='', encoding='utf-8') as f:
+            f.write(("" if os.path.exists(self.mood_file) and os.path.getsize(self.mood_file) else "Timestamp,Username,Mood,State\r\n")
+                    + f"{yesterday} 09:00:00,alice,😔,{EMOJI_STATE_MAP['😔']}\r\n")
+        await request(self.port, "POST", "/checkins", {"mood": "😊"}, user="alice")
+        status, body = await request(self.port, "GET", "/history?days=2", user="alice")
+        self.assertEqual(body["history"], [[yesterday, "😔"], [date.today().isoformat(), "😊"]])
+
+    async def test_ledger_shared_with_desktop_app(self):
+        main.update_notification_time("bob")
+        status, _ = await request(self.port, "POST", "/checkins", {"mood": "😊"}, user="bob")
+        self.assertEqual(status, 409)
+        self.assertFalse(os.path.exists(self.mood_file) and self.saved_rows())
+
+    async def test_requires_authentication(self):
+        cases = [
+            ("POST", "/checkins", {"mood": "😊"}, {}),
+            ("POST", "/checkins", {"username": "alice", "mood": "😊"}, {}),
+            ("POST", "/checkins", {"mood": "😊"}, {"Authorization": "Bearer not-a-real-token"}),
+            ("GET", "/history?username=alice", None, {}),
+            ("GET", "/eligibility?username=alice", None, {}),
+            # No proxy is configured, so the header is not trusted
+            ("POST", "/checkins", {"mood": "😊"}, {"X-Remote-User": "alice"}),
+        ]
+        for method, target, body, headers in cases:
+            with self.subTest(target=target, headers=headers):
+                status, _ = await request(self.port, method, target, body, headers=headers)
+                self.assertEqual(status, 401)
+        self.assertFalse(os.path.exists(self.mood_file) and self.saved_rows())
+
+    async def test_cannot_act_as_someone_else(self):
+        status, _ = await request(self.port, "POST", "/checkins", {"username": "alice", "mood": "😞"}, user="bob")
+        self.assertEqual(status, 403)
+        status, _ = await request(self.port, "GET", "/history?username=alice", user="bob")
+        self.assertEqual(status, 403)
+        status, _ = await request(self.port, "GET", "/eligibility?username=alice", user="bob")
+        self.assertEqual(status, 403)
+        self.assertTrue(main.check_notification_eligibility("alice"))
+        self.assertFalse(os.path.exists(self.mood_file) and self.saved_rows())
+
+    async def test_rejects_bad_requests(self):
+        cases = [
+            ("POST", "/checkins", {"mood": "🙃"}, 400),
+            ("POST", "/checkins", {"feeling": "😊"}, 400),
+            ("POST", "/checkins", ["alice", "😊"], 400),
+            ("GET", "/checkins", None, 405),
+            ("GET", "/nowhere", None, 404),
+        ]
+        for method, target, body, expected in cases:
+            with self.subTest(target=target, body=body):
+                status, payload = await request(self.port, method, target, body, user="alice")
+                self.assertEqual(status, expected)
+                self.assertIn("error", payload)
+        self.assertFalse(os.path.exists(self.mood_file) and self.saved_rows())
+
+    async def test_concurrent_submits_group_committed(self):
+        with patch('main.save_moods', wraps=main.save_moods) as mock_save:
+            results = await asyncio.gather(*(
+                request(self.port, "POST", "/checkins", {"mood": EMOJIS[i % 5]}, user=f"user{i}")
+                for i in range(100)
+            ))
+        self.assertEqual([status for status, _ in results], [200] * 100)
+        self.assertLess(mock_save.call_count, 100)
+        self.assertEqual(sorted(row[0] for row in self.saved_rows()), sorted(f"user{i}" for i in range(100)))
+
+    async def test_concurrent_duplicates_accept_one(self):
+        results = await asyncio.gather(*(
+            request(self.port, "POST", "/checkins", {"mood": "😐"}, user="carol") for _ in range(10)
+        ))
+        self.assertEqual(sorted(status for status, _ in results), [200] + [409] * 9)
+        self.assertEqual(self.saved_rows(), [["carol", "😐", EMOJI_STATE_MAP["😐"]]])
+
+    async def test_failed_write_releases_reservation(self):
+        with patch('main.save_moods', side_effect=OSError("disk full")):
+            status, body = await request(self.port, "POST", "/checkins", {"mood": "😊"}, user="dave")
+        self.assertEqual(status, 500)
+        self.assertIn("disk full", body["error"])
+        status, _ = await request(self.port, "POST", "/checkins", {"mood": "😊"}, user="dave")
+        self.assertEqual(status, 200)
+
+
+class TestTrustedHeader(unittest.IsolatedAsyncioTestCase):
+    async def test_identity_from_proxy_header(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, \
+             patch('main.MOOD_FILE', os.path.join(tmp_dir, "employee_mood_data.csv")), \
+             patch('main.NOTIFICATION_LEDGER_FILE', os.path.join(tmp_dir, "last_notification.idx")), \
+             patch('main.MOOD_STORAGE', 'csv'), patch('main._checkin_index', None):
+            server = await CheckinServer(port=0, trusted_header="X-Remote-User").start()
+            try:
+                port = server.address[1]
+                status, body = await request(port, "POST", "/checkins", {"mood": "😄"},
+                                             headers={"X-Remote-User": "erin"})
+                self.assertEqual((status, body["username"]), (200, "erin"))
+                status, _ = await request(port, "POST", "/checkins", {"mood": "😄"})
+                self.assertEqual(status, 401)
+            finally:
+                await server.close()
+                main.get_mood_writer().close()
+
+
+class TestTokens(unittest.TestCase):
+    def test_server_needs_an_identity_source(self):
+        with self.assertRaises(ValueError):
+            CheckinServer(port=0)
+
+    def test_load_tokens(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "tokens.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"alice": token("alice"), "bob": token("bob")}, f)
+            self.assertEqual(load_tokens(path), {token("alice"): "alice", token("bob"): "bob"})
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({"alice": "short"}, f)
+            with self.assertRaises(ValueError):
+                load_tokens(path)
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_load_test_restores_main(self):
+        mood_file = main.MOOD_FILE
+        rate, batches = asyncio.run(load_test(200, 20))
+        self.assertGreater(rate, 0)
+        self.assertLessEqual(batches, 200)
+        self.assertEqual(main.MOOD_FILE, mood_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import csv
+import http.client
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from collector import CollectorServer, CollectorSink
+
+ROW = ["2025-05-29 10:54:11", "shtlp_0034", "😐", "Meh!"]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestCollector(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.tmp_dir, "collected.csv")
+        self.spool_file = os.path.join(self.tmp_dir, "collector_spool.jsonl")
+        self.port = free_port()
+        self.server = None
+
+    def tearDown(self):
+        if self.server:
+            self.server.stop()
+        shutil.rmtree(self.tmp_dir)
+
+    def start_server(self, **kwargs):
+        self.server = CollectorServer(self.store_file, port=self.port, **kwargs).start()
+        return self.server
+
+    def sink(self):
+        return CollectorSink(f"http://127.0.0.1:{self.port}", self.spool_file)
+
+    def stored_rows(self):
+        with open(self.store_file, newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+    def test_rows_reach_store_over_one_connection(self):
+        """Test sink deliveries land in the store and reuse the connection"""
+        self.start_server()
+        sink = self.sink()
+        sink.write([ROW])
+        connection = sink.connection
+        sink.write([ROW, ROW])
+        self.assertIs(sink.connection, connection)
+        sink.close()
+        self.assertEqual(self.stored_rows(), [["Timestamp", "Username", "Mood", "State"], ROW, ROW, ROW])
+        self.assertEqual(os.path.getsize(self.spool_file), 0)
+
+    def test_spool_and_backoff_while_unreachable(self):
+        """Test rows are spooled with growing backoff, then delivered once the collector is back"""
+        sink = self.sink()
+        sink.write([ROW])
+        first_backoff = sink.backoff
+        self.assertGreater(first_backoff, 0)
+        # Within the backoff window nothing is attempted
+        sink.write([ROW])
+        self.assertEqual(sink.backoff, first_backoff)
+        sink.flush(force=True)
+        self.assertEqual(sink.backoff, first_backoff * 2)
+
+        self.start_server()
+        self.assertEqual(sink.flush(force=True), 2)
+        self.assertEqual(sink.backoff, 0)
+        self.assertEqual(len(self.stored_rows()), 3)
+
+    def test_concurrent_posts_are_batched(self):
+        """Test simultaneous clients share flushes"""
+        server = self.start_server(flush_interval=0.2)
+        clients = [CollectorSink(f"http://127.0.0.1:{self.port}", os.path.join(self.tmp_dir, f"spool{i}.jsonl"))
+                   for i in range(8)]
+        threads = [threading.Thread(target=client.write, args=([ROW],)) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.stored_rows()), 9)
+        self.assertLess(server.generation, 8)
+
+    def test_invalid_payload_rejected(self):
+        """Test malformed rows get a 400 and are not stored"""
+        self.start_server()
+        body = json.dumps({"rows": [["only", "three", "fields"]]})
+        connection = http.client.HTTPConnection("127.0.0.1", self.port)
+        connection.request("POST", "/checkins", body, {"Content-Type": "application/json"})
+        self.assertEqual(connection.getresponse().status, 400)
+        connection.close()
+        self.assertFalse(os.path.exists(self.store_file))
+
+    def test_rejected_rows_quarantined(self):
+        """Test rows the collector can never accept are set aside instead of blocking the spool"""
+        self.start_server()
+        sink = self.sink()
+        sink.write([["only", "three", "fields"]])
+        self.assertEqual(sink.backoff, 0)
+        with open(self.spool_file + ".rejected", encoding='utf-8') as f:
+            self.assertEqual(json.loads(f.read())["row"], ["only", "three", "fields"])
+        sink.write([ROW])
+        sink.close()
+        self.assertEqual(self.stored_rows()[1:], [ROW])
+
+    def test_retried_rows_not_duplicated(self):
+        """Test rows resent after a lost reply are written once"""
+        server = self.start_server()
+        self.assertIsNone(server.submit([ROW], ["row-1"]))
+        self.assertIsNone(server.submit([ROW, ROW], ["row-1", "row-2"]))
+        self.assertEqual(len(self.stored_rows()), 3)
+
+    def test_journaled_failure_is_committed(self):
+        """Test a batch whose write failed after journaling is acknowledged and never written twice"""
+        server = self.start_server()
+        server.submit([ROW], ["row-0"])
+        # The journal syncs, then syncing the appended batch fails
+        with patch('mood_writer._fsync', side_effect=[None, OSError("share offline")]):
+            self.assertIsNone(server.submit([ROW], ["row-1"]))
+        self.assertIsNone(server.submit([ROW], ["row-1"]))
+        self.assertIsNone(server.submit([ROW], ["row-2"]))
+        self.assertEqual(len(self.stored_rows()), 4)
+
+    def test_ack_waits_for_own_batch(self):
+        """Test a submit queued behind a running flush is answered by its own batch"""
+        server = self.start_server(flush_interval=0)
+        writing, release = threading.Event(), threading.Event()
+        write = server.writer.write
+        calls = []
+
+        def slow_then_failing_write(rows):
+            calls.append(rows)
+            if len(calls) == 1:
+                writing.set()
+                release.wait(5)
+                return write(rows)
+            raise OSError("disk full")
+
+        server.writer.write = slow_then_failing_write
+        results = {}
+        first = threading.Thread(target=lambda: results.update(first=server.submit([ROW])))
+        first.start()
+        self.assertTrue(writing.wait(5))
+        second = threading.Thread(target=lambda: results.update(second=server.submit([ROW])))
+        second.start()
+        release.set()
+        first.join()
+        second.join()
+        self.assertIsNone(results["first"])
+        self.assertEqual(results["second"], "disk full")
+        self.assertEqual(len(self.stored_rows()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
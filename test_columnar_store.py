@@ -0,0 +1,133 @@
+import csv
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from columnar_store import (MERGE_FANOUT, ColumnarMoodStore, _block_index, _encode_block, convert_csv,
+                            from_epoch, to_epoch)
+from moods import EMOJIS, EMOJI_STATE_MAP, UNKNOWN_MOOD_CODE
+
+ROWS = [
+    ["2025-05-29 10:54:11", "shtlp_0034", "😐", "Meh!"],
+    ["2025-05-29 10:56:47", "shtlp_0034", "😞", "Cooked >_>"],
+    ["2025-05-30 09:01:00", "shtlp_0101", "😄", "Thrivin'"],
+]
+
+
+class TestColumnarMoodStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store_file = os.path.join(self.tmp_dir, "employee_mood_data.mcol")
+        self.store = ColumnarMoodStore(self.store_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_epoch_round_trip(self):
+        """Test timestamp encoding is exact and timezone independent"""
+        self.assertEqual(to_epoch("1970-01-01 00:00:10"), 10)
+        self.assertEqual(from_epoch(to_epoch(ROWS[0][0])), ROWS[0][0])
+
+    def test_write_and_scan(self):
+        """Test appended rows come back as typed columns and decoded rows"""
+        self.store.write(ROWS[:2])
+        self.store.write(ROWS[2:])
+        columns = self.store.scan()
+        self.assertEqual(columns["mood"].dtype.name, "uint8")
+        self.assertEqual(columns["timestamp"].dtype.name, "int64")
+        self.assertEqual(list(columns["mood"]), [EMOJIS.index(r[2]) for r in ROWS])
+        self.assertEqual(list(columns["user_id"]), [0, 0, 1])
+        self.assertEqual(self.store.usernames, ["shtlp_0034", "shtlp_0101"])
+        self.assertEqual([list(r) for r in self.store.rows()], ROWS)
+
+    def test_unknown_mood(self):
+        """Test moods outside EMOJIS are stored with the unknown code"""
+        self.store.write([["2025-05-27 15:23:42", "shtlp_0034", "😊👍", "Unknown"]])
+        self.assertEqual(list(self.store.scan()["mood"]), [UNKNOWN_MOOD_CODE])
+        self.assertEqual(next(self.store.rows())[2:], ("", "Unknown"))
+
+    def test_compact_preserves_rows(self):
+        """Test compaction merges blocks without changing the data"""
+        for row in ROWS:
+            self.store.write([row])
+        before = os.path.getsize(self.store_file)
+        self.store.compact()
+        self.assertLess(os.path.getsize(self.store_file), before)
+        self.assertEqual([list(r) for r in self.store.rows()], ROWS)
+
+    def test_truncated_block_ignored(self):
+        """Test a partially written trailing block is skipped on scan"""
+        self.store.write(ROWS[:2])
+        self.store.write(ROWS[2:])
+        with open(self.store_file, 'r+b') as f:
+            f.truncate(os.path.getsize(self.store_file) - 3)
+        self.assertEqual(len(self.store.scan()["mood"]), 2)
+
+    def test_write_after_torn_block(self):
+        """Test a write cuts off a torn trailing block instead of appending after it"""
+        self.store.write(ROWS[:1])
+        self.store.write(ROWS[1:2])
+        with open(self.store_file, 'r+b') as f:
+            f.truncate(os.path.getsize(self.store_file) - 3)
+        self.store.write(ROWS[2:])
+        self.store.write(ROWS[:1])
+        self.assertEqual([list(r) for r in self.store.rows()], [ROWS[0], ROWS[2], ROWS[0]])
+
+    def test_single_row_writes_are_merged(self):
+        """Test one-check-in writes are merged as they accumulate, close to a full compaction"""
+        rng = random.Random(0)
+        rows = []
+        seconds = 1748500000
+        for _ in range(MERGE_FANOUT ** 2 + 5):
+            seconds += rng.randint(1, 600)
+            emoji = rng.choice(EMOJIS)
+            rows.append([from_epoch(seconds), f"shtlp_{rng.randint(0, 1999):04d}", emoji, EMOJI_STATE_MAP[emoji]])
+        for row in rows:
+            self.store.write([row])
+        with open(self.store_file, 'rb') as f:
+            blocks, _ = _block_index(f)
+        self.assertEqual([count for _, count in blocks], [MERGE_FANOUT ** 2] + [1] * 5)
+        self.assertEqual([list(r) for r in self.store.rows()], rows)
+        merged = os.path.getsize(self.store_file)
+        self.store.compact()
+        self.assertLess(merged, os.path.getsize(self.store_file) * 1.25)
+
+    def test_interrupted_merge_replayed(self):
+        """Test a merge journal left by a crash is applied before the next read"""
+        for row in ROWS:
+            self.store.write([row])
+        with open(self.store_file, 'rb') as f:
+            blocks, _ = _block_index(f)
+            start = blocks[0][0]
+            f.seek(start)
+            tail = f.read()
+        columns = self.store.scan()
+        merged = _encode_block(columns["timestamp"], columns["user_id"], columns["mood"])
+        self.store._write_journal(start, merged)
+        # The crash tore the tail while rewriting it
+        with open(self.store_file, 'r+b') as f:
+            f.truncate(start + len(tail) // 2)
+        self.assertEqual([list(r) for r in self.store.rows()], ROWS)
+        self.assertFalse(os.path.exists(self.store.journal_path))
+
+    def test_convert_csv(self):
+        """Test conversion from a mixed-schema CSV is compact and lossless for valid rows"""
+        csv_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Timestamp", "Username", "Mood"])
+            writer.writerow(["2025-05-27 15:08:27", "shtlp_0034", "😔"])
+            writer.writerow(["2025-05-27 15:23:42", "shtlp_0034", "😊👍"])
+            for i in range(5000):
+                emoji = EMOJIS[i % len(EMOJIS)]
+                writer.writerow([from_epoch(1748500000 + i * 60), f"shtlp_{i % 50:04d}", emoji, EMOJI_STATE_MAP[emoji]])
+        converted, skipped = convert_csv(csv_file, self.store_file)
+        self.assertEqual((converted, skipped), (5001, 1))
+        self.assertEqual(next(self.store.rows())[3], "Low Key")
+        self.assertLess(os.path.getsize(self.store_file) * 10, os.path.getsize(csv_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
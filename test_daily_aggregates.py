@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from daily_aggregates import DailyAggregates
+from mood_reader import MoodReader
+
+HISTORY_CSV = (
+    "Timestamp,Username,Mood\r\n"
+    "2025-05-27 15:08:27,shtlp_0034,😔\r\n"
+    "2025-05-27 15:23:42,shtlp_0034,😊👍\r\n"
+    "2025-05-29 10:54:11,shtlp_0034,😐,Meh!\r\n"
+)
+
+
+class TestDailyAggregates(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write(HISTORY_CSV)
+        self.aggregates = DailyAggregates(self.mood_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def append(self, line):
+        with open(self.mood_file, 'a', newline='', encoding='utf-8') as f:
+            f.write(line + "\r\n")
+
+    def test_initial_build(self):
+        """Test the first refresh counts the whole log"""
+        self.assertEqual(self.aggregates.refresh(), 2)
+        counts = self.aggregates.counts()
+        self.assertEqual(counts["2025-05-27"]["Low Key"], 1)
+        self.assertEqual(counts["2025-05-29"]["Meh!"], 1)
+        self.assertEqual(sum(counts["2025-05-27"].values()), 1)
+
+    def test_incremental_refresh_reads_only_new_rows(self):
+        """Test later refreshes resume from the checkpointed offset"""
+        self.aggregates.refresh()
+        self.append("2025-05-29 11:00:00,shtlp_0034,😐,Meh!")
+        with patch('daily_aggregates.MoodReader', wraps=MoodReader) as mock_reader:
+            self.assertEqual(self.aggregates.refresh(), 1)
+            self.assertGreater(mock_reader.call_args.kwargs["start_offset"], 0)
+        self.assertEqual(self.aggregates.counts()["2025-05-29"]["Meh!"], 2)
+        self.assertEqual(self.aggregates.refresh(), 0)
+
+    def test_rewritten_log_triggers_rebuild(self):
+        """Test an externally edited log is recounted from scratch"""
+        self.aggregates.refresh()
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write("Timestamp,Username,Mood,State\r\n2025-06-02 12:02:53,shtlp_0034,😄,Thrivin'\r\n")
+        self.assertEqual(self.aggregates.refresh(), 1)
+        self.assertEqual(list(self.aggregates.counts()), ["2025-06-02"])
+
+    def test_rebuild_and_range_query(self):
+        """Test forced rebuilds and day range filtering"""
+        self.aggregates.refresh()
+        self.assertEqual(self.aggregates.refresh(rebuild=True), 2)
+        self.assertEqual(list(self.aggregates.counts(start="2025-05-28")), ["2025-05-29"])
+        self.assertEqual(list(self.aggregates.counts(end="2025-05-28")), ["2025-05-27"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+"""Smoke tests for gui_benchmark.py using the pytest-qt ``qtbot`` fixture.
+
+Run headless with ``QT_QPA_PLATFORM=offscreen``. Counts are kept tiny: these
+check that the harness measures what it claims to, not how fast it is.
+"""
+import os
+import time
+
+import gui_benchmark
+
+
+def test_construction_samples(qtbot):
+    samples = gui_benchmark.bench_construction(2)
+    assert len(samples) == 2
+    assert all(sample > 0 for sample in samples)
+
+
+def test_resize_storm_samples(qtbot):
+    samples = gui_benchmark.bench_resize_storm(50)
+    assert len(samples) == 50
+
+
+def test_submit_latency_measures_spinner_paint(qtbot, tmp_path, monkeypatch):
+    # Nothing may reach the real data files
+    monkeypatch.chdir(tmp_path)
+    samples = gui_benchmark.bench_submit(2)
+    assert len(samples) == 2
+    assert all(0 < sample < gui_benchmark.PAINT_TIMEOUT_S for sample in samples)
+    assert os.listdir(tmp_path) == []
+
+
+def test_stall_monitor_detects_blocked_loop(qtbot):
+    monitor = gui_benchmark.StallMonitor(threshold_ms=30)
+    monitor.start()
+    qtbot.waitUntil(lambda: len(monitor.gaps) > 2)
+    # Block the GUI thread the way a synchronous save would
+    time.sleep(0.08)
+    qtbot.wait(20)
+    monitor.stop()
+    assert monitor.stalls >= 1
+    assert max(monitor.gaps) >= 0.08
+
+
+def test_run_report_and_cli_gate(qtbot, tmp_path):
+    baseline = str(tmp_path / "baseline.json")
+    args = ["--constructions", "1", "--resize-events", "10", "--submits", "1", "--stall-ms", "100",
+            "--baseline", baseline]
+    assert gui_benchmark.main(args + ["--save-baseline"]) == 0
+    report = gui_benchmark.run(1, 10, 1, 100)
+    assert set(report) == {"window_construction", "resize_event", "submit_to_spinner_paint", "event_loop_gap"}
+    assert "stalls" in report["event_loop_gap"]
+    assert gui_benchmark.main(args + ["--check", "--tolerance", "1000", "--p99-tolerance", "1000"]) == 0
@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from log_checkpoint import FINGERPRINT_BYTES, LogCheckpoint
+
+
+class TestLogCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(self.log_path, 'wb') as f:
+            f.write(b"Timestamp,Username,Mood\r\n" + b"x" * FINGERPRINT_BYTES)
+        self.checkpoint = LogCheckpoint(self.log_path, self.log_path + ".state.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_round_trip(self):
+        """Test a saved state is loaded back with the view's own fields"""
+        self.assertIsNone(self.checkpoint.load())
+        state = self.checkpoint.reset(days={})
+        self.checkpoint.advance(state, 10)
+        self.checkpoint.save(state)
+        self.assertEqual(self.checkpoint.load(), state)
+        self.assertEqual(self.checkpoint.load()["offset"], 10)
+        self.assertFalse(os.path.exists(self.checkpoint.state_path + ".tmp"))
+
+    def test_unreadable_state_is_none(self):
+        """Test a corrupt sidecar is treated as missing"""
+        with open(self.checkpoint.state_path, 'w', encoding='utf-8') as f:
+            f.write("{not json")
+        self.assertIsNone(self.checkpoint.load())
+
+    def test_appends_keep_state(self):
+        """Test appending to the log leaves the checkpoint usable"""
+        state = self.checkpoint.reset()
+        self.checkpoint.advance(state, os.path.getsize(self.log_path))
+        self.assertFalse(self.checkpoint.is_stale(state))
+        with open(self.log_path, 'ab') as f:
+            f.write(b"more\r\n")
+        self.assertFalse(self.checkpoint.is_stale(state))
+
+    def test_rewritten_or_missing_log_is_stale(self):
+        """Test a shrunken, rewritten or removed log invalidates the checkpoint"""
+        self.assertTrue(self.checkpoint.is_stale(None))
+        state = self.checkpoint.reset()
+        self.checkpoint.advance(state, os.path.getsize(self.log_path))
+        with open(self.log_path, 'r+b') as f:
+            f.write(b"timestamp")
+        self.assertTrue(self.checkpoint.is_stale(state))
+        with open(self.log_path, 'wb') as f:
+            f.write(b"Timestamp,Username,Mood\r\n")
+        self.assertTrue(self.checkpoint.is_stale(state))
+        os.remove(self.log_path)
+        self.assertTrue(self.checkpoint.is_stale(state))
+
+
+if __name__ == '__main__':
+    unittest.main()
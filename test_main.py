@@ -2,6 +2,11 @@ import unittest
 import sys
 import os
 import csv
+import getpass
+import json
+import subprocess
+import tempfile
+import threading
 from datetime import datetime, date
 from unittest.mock import patch, mock_open, MagicMock, call
 from PySide6.QtWidgets import QApplication, QPushButton, QLabel, QMessageBox, QWidget
@@ -17,8 +22,12 @@ from main import (
     MOOD_FILE,
     LAST_NOTIFICATION_FILE,
     MOOD_RESPONSE_MAP,
-    SPINNER_FRAMES
+    SPINNER_FRAMES,
+    main
 )
+from notification_ledger import NotificationLedger
+from columnar_store import ColumnarMoodStore
+from mood_window import emoji_button_style
 
 # Mock date for testing
 TEST_DATE = date(2024, 3, 20)
@@ -47,9 +56,11 @@ class TestMoodCheck(unittest.TestCase):
         # Create temporary test files
         self.test_mood_file = "test_mood_data.csv"
         self.test_notification_file = "test_notification.txt"
+        self.test_ledger_file = "test_notification.idx"
         
     def tearDown(self):
         # Clean up after each test
+        self.window.checkin_writer.close()
         self.window.close()
         
         # Remove test files if they exist
@@ -57,6 +68,10 @@ class TestMoodCheck(unittest.TestCase):
             os.remove(self.test_mood_file)
         if os.path.exists(self.test_notification_file):
             os.remove(self.test_notification_file)
+        for path in (self.test_ledger_file, self.test_ledger_file + ".lock", self.test_mood_file + ".lock",
+                     self.test_mood_file + ".tidx", self.test_mood_file + ".tidx.lock"):
+            if os.path.exists(path):
+                os.remove(path)
 
     # Window Tests
     def test_window_initialization(self):
@@ -112,6 +127,36 @@ class TestMoodCheck(unittest.TestCase):
         # Clean up
         self.window.hide()
 
+    def test_resize_skips_unchanged_styles(self):
+        """Test buttons are only restyled when their computed style changes"""
+        self.window.show()
+        QApplication.processEvents()
+        self.window.resize_timer.stop()
+        size = self.window.size() * 1.5
+        self.window.update_button_styles(size)
+        with patch.object(QPushButton, 'setStyleSheet') as mock_set_style:
+            self.window.update_button_styles(size)
+            mock_set_style.assert_not_called()
+        hits = emoji_button_style.cache_info().hits
+        self.window.button_style_keys.clear()
+        self.window.update_button_styles(size)
+        self.assertEqual(emoji_button_style.cache_info().hits, hits + len(EMOJI_STATE_MAP))
+
+    def test_resize_storm_is_coalesced(self):
+        """Test a burst of resizes restyles once up front and once with the final size"""
+        self.window.show()
+        QApplication.processEvents()
+        self.window.resize_timer.stop()
+        with patch.object(self.window, 'update_button_styles') as mock_update:
+            for step in range(10):
+                self.window.resize(900 + step * 20, 500 + step * 10)
+            self.assertEqual(mock_update.call_count, 1)
+            self.window.apply_pending_resize()
+            self.assertEqual(mock_update.call_count, 2)
+            final_size = mock_update.call_args[0][0]
+            self.assertEqual((final_size.width(), final_size.height()), (1080, 590))
+        self.window.hide()
+
     def test_window_center_position(self):
         """Test if window is properly centered on screen"""
         # Show the window to get proper geometry
@@ -221,6 +266,7 @@ class TestMoodCheck(unittest.TestCase):
             self.window = MoodWindow()  # Fresh window for each mood
             self.window.selected_mood = emoji
             QTest.mouseClick(self.window.send_button, Qt.LeftButton)
+            self.window.checkin_writer.flush()
             mock_save_mood.assert_called_with(emoji)
             self.assertFalse(self.window.send_button.isVisible())
 
@@ -247,10 +293,11 @@ class TestMoodCheck(unittest.TestCase):
             QApplication.processEvents()
             
             # Check if new elements are shown
-            self.assertIsNotNone(self.window.spinner_label)
-            self.assertTrue(self.window.spinner_label.isVisible())
+            self.assertIsNotNone(self.window.spinner)
+            self.assertTrue(self.window.spinner.isVisible())
             
             # Verify save_mood was called
+            self.window.checkin_writer.flush()
             mock_save.assert_called_once_with("😄")
 
     # File Operation Tests
@@ -265,31 +312,251 @@ class TestMoodCheck(unittest.TestCase):
             mock_file.assert_any_call(LAST_NOTIFICATION_FILE, 'w')
 
     @patch('getpass.getuser', return_value='test_user')
-    @patch('builtins.open', new_callable=mock_open)
     @patch('main.date')
-    def test_check_notification_eligibility(self, mock_date, mock_file, mock_getuser):
+    def test_check_notification_eligibility(self, mock_date, mock_getuser):
         """Test notification eligibility checking"""
-        # Test when user has not received notification today
         mock_date.today.return_value = TEST_DATE
-        mock_file.return_value.read.return_value = "other_user,2024-03-20\n"
-        result = check_notification_eligibility()
-        self.assertTrue(result)
+        with patch('main.NOTIFICATION_LEDGER_FILE', self.test_ledger_file):
+            # Test when user has not received notification today
+            NotificationLedger(self.test_ledger_file).set("other_user", "2024-03-20")
+            result = check_notification_eligibility()
+            self.assertTrue(result)
+
+            # Test when user has received notification today
+            NotificationLedger(self.test_ledger_file).set("test_user", "2024-03-20")
+            result = check_notification_eligibility()
+            self.assertFalse(result)
+
+            # Test when user last received a notification on an earlier day
+            NotificationLedger(self.test_ledger_file).set("test_user", "2024-03-19")
+            result = check_notification_eligibility()
+            self.assertTrue(result)
+
+    @patch('main.show_notification')
+    @patch('main.initialize_files')
+    def test_main_only_shows_window_when_eligible(self, mock_init, mock_show):
+        """Test main() skips the window once the user has checked in"""
+        with patch('main.check_notification_eligibility', return_value=False):
+            main([])
+        mock_show.assert_not_called()
+        with patch('main.check_notification_eligibility', return_value=True):
+            main([])
+        mock_show.assert_called_once()
 
-        # Test when user has received notification today
-        mock_file.return_value.read.return_value = "test_user,2024-03-20\n"
-        result = check_notification_eligibility()
-        self.assertTrue(result)
+    @patch('main.show_notification')
+    @patch('main.initialize_files')
+    @patch('main.check_notification_eligibility', return_value=False)
+    def test_profile_startup_flag(self, mock_eligible, mock_init, mock_show):
+        """Test --profile-startup writes a phase record to the profile log"""
+        profile_file = self.test_mood_file + ".jsonl"
+        try:
+            with patch('main.STARTUP_PROFILE_FILE', profile_file):
+                main(["--profile-startup"])
+            with open(profile_file, encoding='utf-8') as f:
+                record = json.loads(f.readline())
+            phases = [p["phase"] for p in record["phases"]]
+            self.assertEqual(phases, ["import_main", "initialize_files", "eligibility_check"])
+        finally:
+            if os.path.exists(profile_file):
+                os.remove(profile_file)
+
+    def test_fast_path_does_not_import_qt(self):
+        """Test a user who already checked in exits without importing PySide6"""
+        repo_dir = os.path.dirname(os.path.abspath(__file__))
+        with tempfile.TemporaryDirectory() as data_dir:
+            ledger = NotificationLedger(os.path.join(data_dir, "last_notification.idx"))
+            ledger.set(getpass.getuser(), date.today().isoformat())
+            env = dict(os.environ, PYTHONPATH=repo_dir)
+            result = subprocess.run(
+                [sys.executable, "-c", "import sys, main; main.main(); print('PySide6' in sys.modules)"],
+                cwd=data_dir, env=env, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "False")
 
     @patch('getpass.getuser', return_value='test_user')
-    @patch('builtins.open', new_callable=mock_open)
-    def test_save_mood(self, mock_file, mock_getuser):
+    @patch('main.date')
+    def test_update_notification_time(self, mock_date, mock_getuser):
+        """Test that a check-in records today's date in the ledger"""
+        mock_date.today.return_value = TEST_DATE
+        with patch('main.NOTIFICATION_LEDGER_FILE', self.test_ledger_file):
+            update_notification_time()
+            update_notification_time()
+        ledger = NotificationLedger(self.test_ledger_file)
+        self.assertEqual(ledger.get("test_user"), "2024-03-20")
+        self.assertEqual(len(ledger), 1)
+
+    @patch('getpass.getuser', return_value='test_user')
+    @patch('main.update_notification_time')
+    def test_save_mood(self, mock_update, mock_getuser):
         """Test mood saving functionality"""
-        mock_csv = MockCSV()
         test_mood = "😄"
-        
-        with patch('csv.writer', return_value=mock_csv.writer()):
+
+        with patch('main.MOOD_FILE', self.test_mood_file):
             save_mood(test_mood)
-            mock_file.assert_any_call(MOOD_FILE, 'a', newline='')
+            save_mood("😞")
+        mock_update.assert_called()
+
+        with open(self.test_mood_file, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ["Timestamp", "Username", "Mood", "State"])
+        self.assertEqual(rows[1][1:], ["test_user", test_mood, EMOJI_STATE_MAP[test_mood]])
+        self.assertEqual(rows[2][1:], ["test_user", "😞", EMOJI_STATE_MAP["😞"]])
+
+    @patch('getpass.getuser', return_value='test_user')
+    @patch('main.update_notification_time')
+    def test_save_mood_columnar_storage(self, mock_update, mock_getuser):
+        """Test that save_mood writes to the columnar store when configured"""
+        store_file = self.test_mood_file + ".mcol"
+        try:
+            with patch('main.MOOD_STORAGE', 'columnar'), patch('main.COLUMNAR_MOOD_FILE', store_file):
+                save_mood("😔")
+            rows = list(ColumnarMoodStore(store_file).rows())
+            self.assertEqual(rows[0][1:], ("test_user", "😔", EMOJI_STATE_MAP["😔"]))
+        finally:
+            for path in (store_file, store_file + ".users", store_file + ".lock"):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    @patch('getpass.getuser', return_value='test_user')
+    def test_save_mood_sqlite_storage(self, mock_getuser):
+        """Test that the SQLite backend holds both the check-in and the ledger"""
+        import main as main_module
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_file = os.path.join(tmp_dir, "moodcheck.db")
+            with patch('main.MOOD_STORAGE', 'sqlite'), patch('main.SQLITE_DB_FILE', db_file), \
+                 patch('main.NOTIFICATION_LEDGER_FILE', self.test_ledger_file):
+                self.assertTrue(check_notification_eligibility())
+                save_mood("😊")
+                self.assertFalse(check_notification_eligibility())
+                store = main_module.get_mood_writer()
+                try:
+                    rows = store.user_history("test_user", date.today().isoformat())
+                    self.assertEqual([row[1:] for row in rows], [("test_user", "😊", EMOJI_STATE_MAP["😊"])])
+                finally:
+                    store.close()
+            self.assertFalse(os.path.exists(self.test_ledger_file))
+
+    @patch('getpass.getuser', return_value='test_user')
+    @patch('main.update_notification_time')
+    def test_save_mood_segmented_storage(self, mock_update, mock_getuser):
+        """Test that save_mood appends to this month's segment when configured"""
+        from segment_store import SegmentedMoodStore
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            segment_dir = os.path.join(tmp_dir, "mood_segments")
+            with patch('main.MOOD_STORAGE', 'segmented'), patch('main.MOOD_SEGMENT_DIR', segment_dir):
+                save_mood("😐")
+            store = SegmentedMoodStore(segment_dir)
+            self.assertEqual(list(store.segments()), [date.today().isoformat()[:7]])
+            records = list(store.read_range(date.today().isoformat(), date.today().isoformat()))
+            self.assertEqual(records[0][1:], ("test_user", "😐", EMOJI_STATE_MAP["😐"]))
+
+    @patch('getpass.getuser', return_value='test_user')
+    @patch('main.update_notification_time')
+    def test_save_mood_updates_checkin_index(self, mock_update, mock_getuser):
+        """Test that a loaded check-in index follows save_mood and answers history from it"""
+        import main as main_module
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mood_file = os.path.join(tmp_dir, "employee_mood_data.csv")
+            with patch('main.MOOD_FILE', mood_file), patch('main._checkin_index', None), \
+                 patch('main._user_history', None):
+                index = main_module.get_checkin_index()
+                save_mood("😞")
+                save_mood("😄")
+                today = date.today().isoformat()
+                self.assertEqual(index.get("test_user", today).mood, "😄")
+                self.assertEqual(len(index), 1)
+                with patch('main._load_user_history') as mock_load:
+                    self.assertEqual(main_module.get_user_history("test_user", 1), [(today, "😄")])
+                mock_load.assert_not_called()
+                main_module.get_mood_writer().close()
+
+    @patch('getpass.getuser', return_value='test_user')
+    @patch('main.update_notification_time')
+    def test_save_mood_extends_time_index(self, mock_update, mock_getuser):
+        """Test that save_mood keeps the sparse date index current"""
+        from time_index import TimeIndex
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mood_file = os.path.join(tmp_dir, "employee_mood_data.csv")
+            with patch('main.MOOD_FILE', mood_file):
+                save_mood("😊")
+                import main as main_module
+                main_module.get_mood_writer().close()
+            index = TimeIndex(mood_file)
+            self.assertEqual(index.refresh(), 0)
+            self.assertTrue(index.validate())
+            today = date.today().isoformat()
+            self.assertEqual([r.mood for r in index.query(today, today)], ["😊"])
+
+    def test_save_moods_batch(self):
+        """Test that save_moods writes a batch of users and marks each one checked in"""
+        import main as main_module
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mood_file = os.path.join(tmp_dir, "employee_mood_data.csv")
+            with patch('main.MOOD_FILE', mood_file), \
+                 patch('main.NOTIFICATION_LEDGER_FILE', self.test_ledger_file):
+                rows = main_module.save_moods([("alice", "😄"), ("bob", "😞")])
+                main_module.get_mood_writer().close()
+                self.assertEqual(len({row[0] for row in rows}), 1)
+                self.assertFalse(check_notification_eligibility("alice"))
+                self.assertFalse(check_notification_eligibility("bob"))
+                self.assertTrue(check_notification_eligibility("carol"))
+                self.assertEqual(main_module.save_moods([]), [])
+            with open(mood_file, newline='', encoding='utf-8') as f:
+                saved = list(csv.reader(f))[1:]
+            self.assertEqual([row[1:] for row in saved],
+                             [["alice", "😄", EMOJI_STATE_MAP["😄"]], ["bob", "😞", EMOJI_STATE_MAP["😞"]]])
+
+    @patch('getpass.getuser', return_value='test_user')
+    @patch('main.update_notification_time')
+    def test_get_user_history_cached_until_save(self, mock_update, mock_getuser):
+        """Test user history is cached and reloaded only after that user's next save"""
+        import main as main_module
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mood_file = os.path.join(tmp_dir, "employee_mood_data.csv")
+            with patch('main.MOOD_FILE', mood_file), patch('main._user_history', None), \
+                 patch('main._load_user_history', wraps=main_module._load_user_history) as mock_load:
+                self.assertEqual(main_module.get_user_history("test_user", 7)[-1], (date.today().isoformat(), None))
+                main_module.get_user_history("test_user", 7)
+                self.assertEqual(mock_load.call_count, 1)
+                save_mood("😔")
+                main_module.get_mood_writer().close()
+                history = main_module.get_user_history("test_user", 7)
+                self.assertEqual(len(history), 7)
+                self.assertEqual(history[-1], (date.today().isoformat(), "😔"))
+                self.assertEqual(mock_load.call_count, 2)
+
+    def test_result_page_shows_history(self):
+        """Test the result page shows the last 7 days with today's mood once the save is written"""
+        days = ["2025-05-23", "2025-05-24", "2025-05-25", "2025-05-26", "2025-05-27", "2025-05-28", "2025-05-29"]
+        loads = []
+
+        def load_history(username, count):
+            loads.append(threading.current_thread())
+            return [(day, "😐" if day == days[0] else None) for day in days]
+
+        self.window.checkin_writer.save = lambda mood: None
+        self.window.load_history = load_history
+        self.window.selected_mood = "😄"
+        self.window.submit_mood()
+        strip = self.window.history_strip
+        self.assertEqual(strip.moods(), ["·"] * 6 + ["😄"])
+        self.window.checkin_writer.flush()
+        QApplication.processEvents()
+        self.assertEqual(strip.moods(), ["😐", "·", "·", "·", "·", "·", "😄"])
+        self.assertEqual(strip.day_labels[-1].text(), "Thu")
+        self.assertIsNot(loads[0], threading.main_thread())
+
+    def test_history_failure_does_not_block_save(self):
+        """Test a failing history read still saves the check-in and leaves only today on the strip"""
+        saved = []
+        self.window.checkin_writer.save = saved.append
+        self.window.load_history = MagicMock(side_effect=OSError("lock timed out"))
+        self.window.selected_mood = "😔"
+        self.window.submit_mood()
+        self.window.checkin_writer.flush()
+        QApplication.processEvents()
+        self.assertEqual(saved, ["😔"])
+        self.assertEqual(self.window.history_strip.moods(), ["·"] * 6 + ["😔"])
 
     # Animation Tests
     def test_spinner_animation(self):
@@ -298,18 +565,41 @@ class TestMoodCheck(unittest.TestCase):
         self.window.show_animation_with_message()
         
         # Verify spinner setup
-        self.assertIsNotNone(self.window.spinner_label)
-        self.assertIsNotNone(self.window.spinner_timer)
-        self.assertTrue(self.window.spinner_timer.isActive())
-        self.assertEqual(self.window.spinner_timer.interval(), 150)
+        self.assertIsNotNone(self.window.spinner)
+        self.assertTrue(self.window.spinner.is_running())
+        self.assertEqual(self.window.spinner.frame_interval, 150)
+        self.assertEqual(self.window.spinner.animation.duration(), 150 * len(SPINNER_FRAMES))
+        self.assertEqual(self.window.spinner.text(), "😄")
 
         # Test spinner frame updates
-        initial_frame = self.window.spinner_label.text()
+        initial_frame = self.window.spinner.text()
         self.window.update_spinner_frame()
-        next_frame = self.window.spinner_label.text()
+        next_frame = self.window.spinner.text()
         self.assertNotEqual(initial_frame, next_frame)
         self.assertIn(next_frame, SPINNER_FRAMES)
 
+    def test_spinner_frames_do_not_relayout(self):
+        """Test that animating the spinner only repaints it"""
+        self.window.checkin_writer.save = lambda mood: None
+        self.window.load_history = lambda username, days: []
+        self.window.selected_mood = "😊"
+        self.window.show_animation_with_message()
+        QApplication.processEvents()
+        geometry = self.window.spinner.geometry()
+        with patch.object(self.window.spinner, 'setText', create=True) as mock_set_text, \
+             patch.object(self.window.spinner, 'setStyleSheet') as mock_set_style:
+            seen = set()
+            for _ in range(len(SPINNER_FRAMES)):
+                self.window.update_spinner_frame()
+                QApplication.processEvents()
+                seen.add(self.window.spinner.text())
+            self.window.show_final_emoji()
+            QApplication.processEvents()
+        self.assertEqual(seen, set(SPINNER_FRAMES))
+        self.assertEqual(self.window.spinner.geometry(), geometry)
+        mock_set_text.assert_not_called()
+        mock_set_style.assert_not_called()
+
     def test_final_emoji_display(self):
         """Test final emoji display after animation"""
         test_mood = "😄"
@@ -318,9 +608,39 @@ class TestMoodCheck(unittest.TestCase):
         self.window.show_final_emoji()
         
         # Verify final state
-        self.assertEqual(self.window.spinner_label.text(), test_mood)
-        self.assertFalse(self.window.spinner_timer.isActive())
-        self.assertIn("font-size: 80px", self.window.spinner_label.styleSheet())
+        self.assertEqual(self.window.spinner.text(), test_mood)
+        self.assertFalse(self.window.spinner.is_running())
+        self.assertEqual(self.window.spinner.glyph_size, 80)
+
+    def test_save_runs_off_gui_thread(self):
+        """Test the check-in is written on the background writer thread"""
+        threads = []
+        with patch('main.save_mood', side_effect=lambda mood: threads.append(threading.current_thread())):
+            self.window.selected_mood = "😄"
+            self.window.show_animation_with_message()
+            self.window.checkin_writer.flush()
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.main_thread())
+
+    def test_save_failure_reported(self):
+        """Test a failed background write is reported back on the GUI thread"""
+        with patch('main.save_mood', side_effect=IOError("share offline")), \
+             patch('mood_window.QMessageBox.warning') as mock_warning:
+            self.window.selected_mood = "😞"
+            self.window.show_animation_with_message()
+            self.window.checkin_writer.flush()
+            QApplication.processEvents()
+            mock_warning.assert_called_once()
+            self.assertIn("share offline", mock_warning.call_args[0][2])
+
+    def test_writer_drains_on_close(self):
+        """Test queued check-ins are written before the writer shuts down"""
+        saved = []
+        with patch('main.save_mood', side_effect=saved.append):
+            for mood in EMOJI_STATE_MAP:
+                self.window.checkin_writer.submit(mood)
+            self.window.checkin_writer.close()
+        self.assertEqual(saved, list(EMOJI_STATE_MAP))
 
     def test_mood_response_display(self):
         """Test if correct response message is displayed"""
@@ -328,20 +648,36 @@ class TestMoodCheck(unittest.TestCase):
         self.window.selected_mood = test_mood
         self.window.show_animation_with_message()
         
-        # Find response label
-        response_label = None
-        for i in range(self.window.dynamic_container.count()):
-            item = self.window.dynamic_container.itemAt(i)
-            if item.widget():
-                for child in item.widget().findChildren(QLabel):
-                    if child.text() == MOOD_RESPONSE_MAP[test_mood]:
-                        response_label = child
-                        break
-
+        response_label = self.window.response_label
         self.assertIsNotNone(response_label)
+        self.assertIs(self.window.pages.currentWidget(), self.window.result_page)
         self.assertEqual(response_label.text(), MOOD_RESPONSE_MAP[test_mood])
         self.assertTrue(response_label.wordWrap())
 
+    def test_result_page_built_once(self):
+        """Test that later submits reuse the result page instead of rebuilding it"""
+        self.window.checkin_writer.save = lambda mood: None
+        self.window.load_history = lambda username, days: []
+        self.assertIsNone(self.window.result_page)
+        self.window.selected_mood = "😄"
+        self.window.submit_mood()
+        result_page = self.window.result_page
+        spinner = self.window.spinner
+        widget_count = len(self.window.findChildren(QWidget))
+
+        self.window.pages.setCurrentWidget(self.window.checkin_page)
+        self.window.selected_mood = "😞"
+        with patch.object(self.window, 'findChildren') as mock_find_children, \
+             patch.object(self.window, 'build_result_page') as mock_build:
+            self.window.submit_mood()
+            mock_find_children.assert_not_called()
+            mock_build.assert_not_called()
+        self.assertIs(self.window.result_page, result_page)
+        self.assertIs(self.window.spinner, spinner)
+        self.assertEqual(len(self.window.findChildren(QWidget)), widget_count)
+        self.assertEqual(self.window.response_label.text(), MOOD_RESPONSE_MAP["😞"])
+        self.assertEqual(self.window.spinner.text(), "😞")
+
     # Error Handling Tests
     def test_error_message_on_empty_submission(self):
         """Test error message when submitting without selecting mood"""
@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from columnar_store import convert_csv
+from mood_analytics import (load_history, load_checkins, daily_summary, weekly_summary, user_summary,
+                            rolling_scores, low_streaks, main)
+from moods import EMOJIS, EMOJI_STATE_MAP
+from segment_store import SegmentedMoodStore
+
+HISTORY_CSV = (
+    "Timestamp,Username,Mood,State\r\n"
+    "2025-05-26 09:00:00,alice,😔,Low Key\r\n"
+    "2025-05-27 09:00:00,alice,😄,Thrivin'\r\n"
+    "2025-05-27 17:00:00,alice,😞,Cooked >_>\r\n"
+    "2025-05-28 09:00:00,alice,😔,Low Key\r\n"
+    "2025-05-29 09:00:00,alice,😊,Chillin'\r\n"
+    "2025-05-26 09:30:00,bob,😄,Thrivin'\r\n"
+    "2025-06-02 09:30:00,bob,😐\r\n"
+    "2025-06-02 09:31:00,bob,😊👍\r\n"
+)
+
+
+class TestMoodAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write(HISTORY_CSV)
+        self.df = load_history(self.mood_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_csv_and_columnar_load_identically(self):
+        """Test both storage formats produce the same frame"""
+        store_file = os.path.join(self.tmp_dir, "employee_mood_data.mcol")
+        convert_csv(self.mood_file, store_file)
+        columnar = load_history(store_file)
+        self.assertEqual(len(self.df), 7)
+        self.assertEqual(list(columnar["mood"]), list(self.df["mood"]))
+        self.assertEqual(list(columnar["username"]), list(self.df["username"]))
+        self.assertTrue((columnar["timestamp"] == self.df["timestamp"]).all())
+
+    def test_segmented_store_and_checkins_load_identically(self):
+        """Test segmented stores and the check-in index parse to the same codes and times"""
+        segment_dir = os.path.join(self.tmp_dir, "segments")
+        SegmentedMoodStore(segment_dir).write(
+            [[ts.strftime("%Y-%m-%d %H:%M:%S"), name, EMOJIS[mood], EMOJI_STATE_MAP[EMOJIS[mood]]]
+             for ts, name, mood in zip(self.df["timestamp"], self.df["username"], self.df["mood"])])
+        segmented = load_history(segment_dir).sort_values(["username", "timestamp"], ignore_index=True)
+        expected = self.df.sort_values(["username", "timestamp"], ignore_index=True)
+        self.assertEqual(list(segmented["mood"]), list(expected["mood"]))
+        self.assertTrue((segmented["timestamp"] == expected["timestamp"]).all())
+        checkins = load_checkins(self.mood_file)
+        self.assertEqual(len(checkins), 6)
+        latest = checkins[(checkins["username"] == "alice") & (checkins["day"] == "2025-05-27")]
+        self.assertEqual(list(latest["mood"]), [EMOJIS.index("😞")])
+        self.assertEqual(str(latest["timestamp"].iloc[0]), "2025-05-27 17:00:00")
+        self.assertEqual(checkins["mood"].dtype, expected["mood"].dtype)
+
+    def test_daily_and_weekly_distribution(self):
+        """Test per-day and per-week counts over the five moods"""
+        daily = daily_summary(self.df)
+        self.assertEqual(daily.loc["2025-05-27", "check_ins"], 2)
+        self.assertEqual(daily.loc["2025-05-27", "Cooked >_>"], 1)
+        self.assertAlmostEqual(daily.loc["2025-05-27", "mean_score"], 3.0)
+        weekly = weekly_summary(self.df)
+        self.assertEqual(list(weekly["check_ins"]), [6, 1])
+
+    def test_user_summary_and_streaks(self):
+        """Test low streaks use each day's final check-in"""
+        streaks = low_streaks(self.df)
+        self.assertEqual(list(streaks["days"]), [3])
+        self.assertEqual(str(streaks.loc[0, "start"].date()), "2025-05-26")
+        users = user_summary(self.df)
+        self.assertEqual(users.loc["alice", "longest_low_streak"], 3)
+        self.assertEqual(users.loc["bob", "longest_low_streak"], 0)
+        self.assertEqual(users.loc["alice", "check_ins"], 5)
+
+    def test_rolling_scores(self):
+        """Test the rolling mean is computed per user over calendar days"""
+        rolling = rolling_scores(self.df, window=2)
+        alice = rolling[rolling["username"] == "alice"]
+        self.assertEqual(list(alice["rolling_score"]), [2.0, 1.5, 1.5, 3.0])
+        # Bob's 2025-05-26 check-in is a week outside the window on 2025-06-02
+        bob = rolling[rolling["username"] == "bob"]
+        self.assertEqual(list(bob["rolling_score"]), [5.0, 3.0])
+
+    def test_rolling_scores_skip_gaps(self):
+        """Test a long gap between check-ins is not averaged over"""
+        gap_file = os.path.join(self.tmp_dir, "gap.csv")
+        with open(gap_file, 'w', newline='', encoding='utf-8') as f:
+            f.write("Timestamp,Username,Mood,State\r\n"
+                    "2025-01-01 09:00:00,carol,😞,Cooked >_>\r\n"
+                    "2025-03-01 09:00:00,carol,😄,Thrivin'\r\n")
+        df = load_history(gap_file)
+        self.assertEqual(list(rolling_scores(df)["rolling_score"]), [1.0, 5.0])
+
+    def test_cli(self):
+        """Test the command line entry point"""
+        output = os.path.join(self.tmp_dir, "users.csv")
+        self.assertEqual(main([self.mood_file, "--report", "users", "--output", output]), 0)
+        self.assertTrue(os.path.exists(output))
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            main([self.mood_file, "--report", "streaks"])
+        self.assertIn("alice", buffer.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from mood_reader import MoodReader, MoodRecord, read_moods
+
+MIXED_CSV = (
+    "Timestamp,Username,Mood\r\n"
+    "2025-05-27 15:08:27,shtlp_0034,😔\r\n"
+    "2025-05-27 15:23:42,shtlp_0034,😊👍\r\n"
+    "2025-05-27 16:58:48,shtlp_0034,😄,Thrivin'\r\n"
+    "\r\n"
+    "not a timestamp,shtlp_0034,😄,Thrivin'\r\n"
+    "2025-05-27 20:24:52,shtlp_0034\r\n"
+    "2025-05-29 10:54:11,shtlp_0034,😞,Cooked >_>\r\n"
+)
+
+
+class TestMoodReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write(MIXED_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_normalises_mixed_schema(self):
+        """Test legacy rows are filled in and invalid rows rejected"""
+        reader = MoodReader(self.mood_file)
+        records = list(reader)
+        self.assertEqual(records, [
+            MoodRecord("2025-05-27 15:08:27", "shtlp_0034", "😔", "Low Key"),
+            MoodRecord("2025-05-27 16:58:48", "shtlp_0034", "😄", "Thrivin'"),
+            MoodRecord("2025-05-29 10:54:11", "shtlp_0034", "😞", "Cooked >_>"),
+        ])
+        self.assertEqual(reader.stats["rows"], 3)
+        self.assertEqual(reader.stats["legacy_rows"], 1)
+        self.assertEqual(reader.rejected, {"invalid_mood": 1, "bad_timestamp": 1, "bad_columns": 1})
+        self.assertEqual(reader.offset, os.path.getsize(self.mood_file))
+
+    def test_quarantine_file(self):
+        """Test rejected lines are copied verbatim to the quarantine file"""
+        quarantine = os.path.join(self.tmp_dir, "quarantine.csv")
+        list(read_moods(self.mood_file, quarantine=quarantine))
+        with open(quarantine, encoding='utf-8', newline='') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "2025-05-27 15:23:42,shtlp_0034,😊👍")
+        self.assertEqual(len(lines), 3)
+
+    def test_resume_from_offset(self):
+        """Test a second run picks up only rows appended since the first"""
+        reader = MoodReader(self.mood_file)
+        list(reader)
+        with open(self.mood_file, 'a', newline='', encoding='utf-8') as f:
+            f.write("2025-06-02 12:02:53,shtlp_0034,😐,Meh!\r\n")
+            f.write("2025-06-02 12:03:00,shtlp_0034,😐")  # still being written
+        resumed = MoodReader(self.mood_file, start_offset=reader.offset)
+        self.assertEqual([r.timestamp for r in resumed], ["2025-06-02 12:02:53"])
+        self.assertLess(resumed.offset, os.path.getsize(self.mood_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import numpy as np
+
+import mood_scan
+from columnar_store import convert_csv
+from mood_reader import MoodReader
+from mood_scan import MoodScan, mood_counts, main
+from moods import MOOD_CODES, TIMESTAMP_FORMAT, UNKNOWN_MOOD_CODE
+
+HISTORY_CSV = (
+    "Timestamp,Username,Mood,State\r\n"
+    "2025-05-26 09:00:00,alice,😔,Low Key\r\n"
+    "2025-05-27 09:00:00,bob,😄,Thrivin'\r\n"
+    "2025-06-02 09:30:00,bob,😐\r\n"
+    "2025-06-02 09:31:00,bob,😊👍\r\n"
+    "2025-02-30 09:00:00,carol,😊,Chillin'\r\n"
+    "not a timestamp,carol,😊,Chillin'\r\n"
+    "2025-06-03 09:00:00,,😊,Chillin'\r\n"
+    "\r\n"
+    "2025-06-03 10:00:00,carol,😞,Cooked >_>\n"
+    "2025-06-03 11:00:00,dave,😄,Thriv"
+)
+
+# Rows the byte checks cannot settle on their own
+IRREGULAR_CSV = (
+    "Timestamp,Username,Mood,State\r\n"
+    '2025-06-04 09:00:00,"erin",😊,Chillin\'\r\n'
+    '2025-06-04 09:01:00,"smith, j",😄\r\n'
+    "2025-06-04 09:02:00,frank,😐,Meh!,extra\r\n"
+    "2025-06-04 09:03:00,zoë,😞,Cooked >_>\r\n"
+    "2025-6-4 09:04:00,gina,😊\r\n"
+    '"2025-06-04 09:05:00",hank,😄,"Thrivin\'"\r\n'
+    '2025-06-04 09:06:00,ivan,"😔"\r\n'
+    "2025-06-04 09:07:00,erin,😊\r\n"
+).encode("utf-8") + "2025-06-04 09:08:00,\udcff,😊\r\n".encode("utf-8", "surrogateescape")
+
+
+class TestMoodScan(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        self.write(HISTORY_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, text):
+        with open(self.mood_file, 'w', newline='', encoding='utf-8') as f:
+            f.write(text)
+
+    def assert_matches_reader(self):
+        records = list(MoodReader(self.mood_file))
+        with MoodScan(self.mood_file) as scan:
+            valid = scan.valid
+            self.assertEqual(int(valid.sum()), len(records))
+            self.assertEqual(list(scan.mood_codes[valid]), [MOOD_CODES[r.mood] for r in records])
+            self.assertEqual([scan.usernames[i] for i in scan.user_ids[valid]], [r.username for r in records])
+            self.assertEqual([str(t).replace("T", " ") for t in scan.timestamps[valid]],
+                             [datetime.strptime(r.timestamp, TIMESTAMP_FORMAT).isoformat(" ") for r in records])
+        return records
+
+    def test_matches_mood_reader(self):
+        """Test the scan keeps exactly the rows the MoodReader yields"""
+        self.assert_matches_reader()
+        with MoodScan(self.mood_file) as scan:
+            valid = scan.valid
+            self.assertEqual(str(scan.dates[valid][0]), "2025-05-26")
+
+    def test_irregular_rows_match_mood_reader(self):
+        """Test quoted fields, extra columns and non-ASCII names follow the MoodReader's rules"""
+        with open(self.mood_file, 'wb') as f:
+            f.write(IRREGULAR_CSV)
+        records = self.assert_matches_reader()
+        self.assertEqual([r.username for r in records], ["erin", "smith, j", "zoë", "gina", "hank", "ivan", "erin"])
+        with MoodScan(self.mood_file) as scan:
+            self.assertEqual(scan.usernames, ["erin", "gina", "hank", "ivan", "smith, j", "zoë"])
+            self.assertEqual(scan.mood_codes[3], UNKNOWN_MOOD_CODE)  # five columns
+
+    def test_rejected_rows(self):
+        """Test the header, bad rows and the torn last line are marked unknown"""
+        with MoodScan(self.mood_file) as scan:
+            # The torn last line has no newline and is not a row yet
+            self.assertEqual(len(scan.mood_codes), 10)
+            self.assertEqual(scan.mood_codes[0], UNKNOWN_MOOD_CODE)
+            self.assertEqual(scan.mood_codes[4], UNKNOWN_MOOD_CODE)  # 😊👍
+            self.assertEqual(scan.mood_codes[5], UNKNOWN_MOOD_CODE)  # 30 February
+            self.assertEqual(scan.mood_codes[3], MOOD_CODES["😐"])   # legacy row
+            self.assertTrue(np.isnat(scan.dates[0]))
+            self.assertEqual(scan.user_ids[0], -1)
+
+    def test_counts_small_chunks(self):
+        """Test results do not depend on how the rows are chunked"""
+        expected = mood_counts(self.mood_file)
+        with patch.object(mood_scan, 'CHUNK_ROWS', 3), \
+             patch.object(mood_scan, 'CHUNK_BYTES', 16):
+            self.assertEqual(list(mood_counts(self.mood_file)), list(expected))
+        self.assertEqual(list(expected), [1, 1, 1, 1, 1])
+
+    def test_columnar_counts(self):
+        """Test counts from a columnar store match the CSV scan"""
+        store_file = os.path.join(self.tmp_dir, "employee_mood_data.mcol")
+        convert_csv(self.mood_file, store_file)
+        self.assertEqual(list(mood_counts(store_file)), list(mood_counts(self.mood_file)))
+
+    def test_empty_file(self):
+        """Test an empty file scans to empty columns"""
+        self.write("")
+        with MoodScan(self.mood_file) as scan:
+            self.assertEqual(len(scan.mood_codes), 0)
+            self.assertEqual(scan.usernames, [])
+            self.assertEqual(list(scan.mood_counts()), [0] * 5)
+
+    def test_close_releases_mapping(self):
+        """Test the file can be replaced once the scan is closed"""
+        scan = MoodScan(self.mood_file)
+        scan.mood_counts()
+        scan.close()
+        self.write("Timestamp,Username,Mood,State\r\n")
+        with MoodScan(self.mood_file) as scan:
+            self.assertEqual(int(scan.valid.sum()), 0)
+
+    def test_cli(self):
+        """Test the CLI prints per-mood counts"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main([self.mood_file]), 0)
+        self.assertIn("5 check-ins", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+from unittest.mock import patch
+
+from mood_writer import JOURNAL_HEADER, JournaledWriteError, MoodWriter, encode_rows
+
+HEADER = ["Timestamp", "Username", "Mood", "State"]
+ROW = ["2024-03-20 09:00:00", "test_user", "😄", "Thrivin'"]
+
+
+class TestMoodWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def read_rows(self):
+        with open(self.mood_file, newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))
+
+    def test_header_written_once(self):
+        """Test that the header is only written to an empty file"""
+        writer = MoodWriter(self.mood_file, header=HEADER)
+        writer.write([ROW])
+        writer.write([ROW])
+        self.assertEqual(self.read_rows(), [HEADER, ROW, ROW])
+
+    def test_batch_is_one_flush(self):
+        """Test that queued rows are committed with a single lock and write"""
+        writer = MoodWriter(self.mood_file, batch_size=3)
+        with patch('file_lock.os.open', wraps=os.open) as mock_lock_open, \
+             patch.object(writer, '_write_journal', wraps=writer._write_journal) as mock_journal:
+            writer.append(ROW)
+            writer.append(ROW)
+            self.assertFalse(os.path.exists(self.mood_file))
+            writer.append(ROW)
+            self.assertEqual(mock_lock_open.call_count, 1)
+            self.assertEqual(mock_journal.call_count, 1)
+        self.assertEqual(self.read_rows(), [ROW, ROW, ROW])
+        self.assertEqual(writer.flush(), 0)
+
+    def test_fsync_policies(self):
+        """Test how often each policy fsyncs"""
+        for policy, expected in (("none", 0), ("batch", 2), ("always", 4)):
+            if os.path.exists(self.mood_file):
+                os.remove(self.mood_file)
+            writer = MoodWriter(self.mood_file, fsync=policy)
+            with patch('mood_writer.os.fsync') as mock_fsync:
+                writer.write([ROW, ROW, ROW])
+            # One fsync for the journal plus the data file ones
+            self.assertEqual(mock_fsync.call_count, expected, policy)
+        with self.assertRaises(ValueError):
+            MoodWriter(self.mood_file, fsync="sometimes")
+
+    def test_recover_replays_interrupted_flush(self):
+        """Test that a journal from a crashed flush is applied exactly once"""
+        writer = MoodWriter(self.mood_file)
+        writer.write([ROW])
+        offset = os.path.getsize(self.mood_file)
+        payload = encode_rows([ROW, ROW])
+        # Simulate a crash halfway through appending the batch
+        with open(self.mood_file, 'ab') as f:
+            f.write(payload[:10])
+        with open(writer.journal_path, 'wb') as f:
+            f.write(JOURNAL_HEADER.pack(offset, len(payload), zlib.crc32(payload)))
+            f.write(payload)
+
+        self.assertTrue(writer.recover())
+        self.assertEqual(self.read_rows(), [ROW, ROW, ROW])
+        self.assertFalse(os.path.exists(writer.journal_path))
+
+    def test_torn_journal_is_discarded(self):
+        """Test that an incomplete journal leaves the data file untouched"""
+        writer = MoodWriter(self.mood_file)
+        writer.write([ROW])
+        with open(writer.journal_path, 'wb') as f:
+            f.write(b"\x00\x01")
+        self.assertFalse(writer.recover())
+        self.assertEqual(self.read_rows(), [ROW])
+
+    def test_failed_flush_keeps_rows(self):
+        """Test that rows survive a failed flush for a later retry"""
+        writer = MoodWriter(self.mood_file, header=HEADER)
+        with patch.object(writer, '_write_journal', side_effect=IOError):
+            with self.assertRaises(IOError):
+                writer.write([ROW])
+        self.assertEqual(writer.pending, [ROW])
+        writer.flush()
+        self.assertEqual(self.read_rows(), [HEADER, ROW])
+
+    def test_failure_after_journal_writes_once(self):
+        """Test that a batch whose journal is complete is left to recover() rather than requeued"""
+        writer = MoodWriter(self.mood_file, header=HEADER)
+        writer.write([["1", "x", "😄", "Thrivin'"]])
+        with patch('mood_writer.os.remove', side_effect=PermissionError):
+            with self.assertRaises(JournaledWriteError):
+                writer.write([["2", "y", "😄", "Thrivin'"]])
+        self.assertEqual(writer.pending, [])
+        writer.write([["3", "z", "😄", "Thrivin'"]])
+        self.assertEqual([row[:2] for row in self.read_rows()[1:]], [["1", "x"], ["2", "y"], ["3", "z"]])
+        self.assertFalse(os.path.exists(writer.journal_path))
+
+    def test_close_replays_pending_journal(self):
+        """Test that closing with nothing queued still applies a journal left by a failed flush"""
+        writer = MoodWriter(self.mood_file)
+        # The journal syncs, then syncing the appended batch fails
+        with patch('mood_writer._fsync', side_effect=[None, OSError("share offline")]):
+            with self.assertRaises(OSError):
+                writer.write([ROW])
+        self.assertTrue(os.path.exists(writer.journal_path))
+        writer.close()
+        self.assertEqual(self.read_rows(), [ROW])
+
+
+if __name__ == '__main__':
+    unittest.main()
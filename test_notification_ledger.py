@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from notification_ledger import HEADER, INITIAL_SLOTS, SLOT, NotificationLedger, migrate_text_ledger
+
+
+class TestNotificationLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.ledger_file = os.path.join(self.tmp_dir, "last_notification.idx")
+        self.ledger = NotificationLedger(self.ledger_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_missing_ledger_lookup(self):
+        """Test lookups against a ledger that has not been created yet"""
+        self.assertIsNone(self.ledger.get("test_user"))
+        self.assertEqual(len(self.ledger), 0)
+
+    def test_upsert_and_lookup(self):
+        """Test that upserting overwrites the user's previous date"""
+        self.ledger.set("test_user", "2024-03-19")
+        self.ledger.set("test_user", "2024-03-20")
+        self.ledger.set("other_user", "2024-03-18")
+        self.assertEqual(self.ledger.get("test_user"), "2024-03-20")
+        self.assertEqual(self.ledger.get("other_user"), "2024-03-18")
+        self.assertIsNone(self.ledger.get("unknown_user"))
+        self.assertEqual(len(self.ledger), 2)
+
+    def test_ledger_grows_past_initial_capacity(self):
+        """Test that the table rehashes once it fills up"""
+        users = {f"shtlp_{i:05d}": "2024-03-20" for i in range(INITIAL_SLOTS)}
+        self.ledger.update(users)
+        self.assertEqual(len(self.ledger), INITIAL_SLOTS)
+        self.assertEqual(dict(self.ledger.items()), users)
+        self.assertGreater(os.path.getsize(self.ledger_file), INITIAL_SLOTS * 76)
+
+    def test_grow_keeps_file_in_place(self):
+        """Test that a resize rewrites the open file instead of replacing it"""
+        self.ledger.set("reader", "2024-03-19")
+        with open(self.ledger_file, 'rb') as reader:
+            inode = os.fstat(reader.fileno()).st_ino
+            with patch('notification_ledger.os.replace', wraps=os.replace) as mock_replace:
+                self.ledger.update({f"shtlp_{i:05d}": "2024-03-20" for i in range(INITIAL_SLOTS)})
+            self.assertNotIn(self.ledger_file, [call.args[1] for call in mock_replace.call_args_list])
+            self.assertEqual(os.stat(self.ledger_file).st_ino, inode)
+        self.assertEqual(self.ledger.get("reader"), "2024-03-19")
+        self.assertFalse(os.path.exists(self.ledger.snapshot_path))
+
+    def test_interrupted_grow_recovered(self):
+        """Test that a resize cut short by a crash is finished before the next lookup"""
+        users = {f"shtlp_{i:05d}": "2024-03-20" for i in range(INITIAL_SLOTS // 2)}
+        self.ledger.update(users)
+        with patch.object(NotificationLedger, '_rehash', side_effect=OSError("power loss")):
+            with self.assertRaises(OSError):
+                self.ledger._grow(INITIAL_SLOTS * 2)
+        # Simulate the crash wiping the table after the snapshot was taken
+        with open(self.ledger_file, 'r+b') as f:
+            f.seek(HEADER.size)
+            f.write(bytes(INITIAL_SLOTS * SLOT.size))
+        self.assertEqual(NotificationLedger(self.ledger_file).get("shtlp_00007"), "2024-03-20")
+        self.assertEqual(dict(self.ledger.items()), users)
+        self.assertFalse(os.path.exists(self.ledger.snapshot_path))
+
+    def test_miss_does_not_take_lock(self):
+        """Test that an unknown user is answered without waiting on a held lock"""
+        self.ledger.set("test_user", "2024-03-20")
+        with patch.object(NotificationLedger, '_recover', side_effect=AssertionError("locked")):
+            self.assertIsNone(self.ledger.get("unknown_user"))
+            self.assertIsNone(NotificationLedger(os.path.join(self.tmp_dir, "missing.idx")).get("unknown_user"))
+
+    def test_miss_during_resize_retried_under_lock(self):
+        """Test that a miss racing a resize waits for it, and a stuck one answers None"""
+        self.ledger.set("test_user", "2024-03-20")
+        with open(self.ledger.snapshot_path, 'wb') as f:
+            with open(self.ledger_file, 'rb') as src:
+                f.write(src.read())
+        # Simulate the resize having zeroed the table before the lookup
+        with open(self.ledger_file, 'r+b') as f:
+            f.seek(HEADER.size)
+            f.write(bytes(INITIAL_SLOTS * SLOT.size))
+        with patch.object(NotificationLedger, '_recover', side_effect=TimeoutError):
+            self.assertIsNone(self.ledger.get("test_user"))
+        self.assertEqual(self.ledger.get("test_user"), "2024-03-20")
+
+    def test_username_too_long(self):
+        """Test that oversized usernames are rejected"""
+        with self.assertRaises(ValueError):
+            self.ledger.set("x" * 65, "2024-03-20")
+
+    def test_migrate_text_ledger(self):
+        """Test migration from the legacy user,date text format"""
+        text_file = os.path.join(self.tmp_dir, "last_notification.txt")
+        with open(text_file, 'w') as f:
+            f.write("test_user,2024-03-20\n\nbroken line\nother_user,not-a-date\nother_user,2024-03-19\n")
+        self.assertEqual(migrate_text_ledger(text_file, self.ledger_file), 2)
+        self.assertEqual(self.ledger.get("test_user"), "2024-03-20")
+        self.assertEqual(self.ledger.get("other_user"), "2024-03-19")
+
+
+if __name__ == '__main__':
+    unittest.main()
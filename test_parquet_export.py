@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+
+import parquet_export
+from moods import EMOJI_STATE_MAP
+
+if parquet_export.pa is not None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+def row(timestamp, username, mood):
+    return f"{timestamp},{username},{mood},{EMOJI_STATE_MAP[mood]}\n"
+
+
+@unittest.skipIf(parquet_export.pa is None, "pyarrow is not installed")
+class TestParquetExport(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "moods.csv")
+        self.out_dir = os.path.join(self.tmp_dir, "export")
+        with open(self.mood_file, 'w', encoding='utf-8', newline='') as f:
+            f.write("Timestamp,Username,Mood,State\n")
+            f.write(row("2025-04-29 09:00:00", "alice", "😄"))
+            f.write(row("2025-04-30 10:00:00", "bob", "😞"))
+            f.write(row("2025-05-01 09:30:00", "alice", "😐"))
+            f.write("2025-05-01 11:00:00,bob,not a mood\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def append(self, *rows):
+        with open(self.mood_file, 'a', encoding='utf-8', newline='') as f:
+            f.writelines(rows)
+
+    def test_month_partitions_with_typed_columns(self):
+        exporter = parquet_export.ParquetExporter(self.mood_file, self.out_dir)
+        self.assertEqual(exporter.export(), ["2025-04", "2025-05"])
+        table = parquet_export.read_checkins(self.out_dir, ["2025-04"])
+        self.assertEqual(table.num_rows, 2)
+        self.assertTrue(pa.types.is_timestamp(table.schema.field("timestamp").type))
+        self.assertEqual(table.schema.field("day").type, pa.date32())
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("mood").type))
+        self.assertTrue(pa.types.is_dictionary(table.schema.field("state").type))
+        self.assertEqual(table.column("state").to_pylist(), [EMOJI_STATE_MAP["😄"], EMOJI_STATE_MAP["😞"]])
+        self.assertEqual(table.column("score").to_pylist(), [5, 1])
+
+    def test_column_pruned_read(self):
+        parquet_export.ParquetExporter(self.mood_file, self.out_dir).export()
+        table = parquet_export.read_checkins(self.out_dir, columns=["username", "mood_code"])
+        self.assertEqual(table.column_names, ["username", "mood_code"])
+        self.assertEqual(table.num_rows, 3)
+
+    def test_rollups(self):
+        parquet_export.ParquetExporter(self.mood_file, self.out_dir).export()
+        daily = pq.read_table(os.path.join(self.out_dir, parquet_export.DAILY_DIR, "month=2025-04",
+                                           parquet_export.ROLLUP_FILE)).to_pylist()
+        self.assertEqual([(r["day"], r["check_ins"], r["mean_score"]) for r in daily],
+                         [(date(2025, 4, 29), 1, 5.0), (date(2025, 4, 30), 1, 1.0)])
+        self.assertEqual(daily[1][EMOJI_STATE_MAP["😞"]], 1)
+        users = pq.read_table(os.path.join(self.out_dir, parquet_export.USERS_DIR, "month=2025-05",
+                                           parquet_export.ROLLUP_FILE)).to_pylist()
+        self.assertEqual([(r["username"], r["check_ins"]) for r in users], [("alice", 1)])
+        weekly = pq.read_table(os.path.join(self.out_dir, parquet_export.WEEKLY_FILE)).to_pylist()
+        self.assertEqual([(r["week"], r["check_ins"]) for r in weekly], [(date(2025, 4, 28), 3)])
+        self.assertAlmostEqual(weekly[0]["mean_score"], 3.0)
+
+    def test_incremental_export_only_touches_new_months(self):
+        exporter = parquet_export.ParquetExporter(self.mood_file, self.out_dir)
+        exporter.export()
+        april_dir = os.path.join(self.out_dir, parquet_export.CHECKINS_DIR, "month=2025-04")
+        april_mtimes = {name: os.stat(os.path.join(april_dir, name)).st_mtime_ns for name in os.listdir(april_dir)}
+
+        self.assertEqual(exporter.export(), [])
+        self.append(row("2025-05-02 09:00:00", "bob", "😊"), row("2025-06-01 09:00:00", "carol", "😔"))
+        self.assertEqual(exporter.export(), ["2025-05", "2025-06"])
+        self.assertEqual({name: os.stat(os.path.join(april_dir, name)).st_mtime_ns
+                          for name in os.listdir(april_dir)}, april_mtimes)
+        may = parquet_export.read_checkins(self.out_dir, ["2025-05"])
+        self.assertEqual(sorted(may.column("username").to_pylist()), ["alice", "bob"])
+        self.assertEqual(parquet_export.read_checkins(self.out_dir).num_rows, 5)
+
+    def test_rewritten_log_triggers_rebuild(self):
+        exporter = parquet_export.ParquetExporter(self.mood_file, self.out_dir)
+        exporter.export()
+        with open(self.mood_file, 'w', encoding='utf-8', newline='') as f:
+            f.write("Timestamp,Username,Mood,State\n")
+            f.write(row("2025-07-01 09:00:00", "dave", "😄"))
+        self.assertEqual(exporter.export(), ["2025-07"])
+        self.assertEqual(parquet_export.read_checkins(self.out_dir).num_rows, 1)
+
+    def test_cli(self):
+        self.assertEqual(parquet_export.main([self.mood_file, "--output", self.out_dir]), 0)
+        self.assertTrue(os.path.exists(os.path.join(self.out_dir, parquet_export.WEEKLY_FILE)))
+
+
+@unittest.skipIf(parquet_export.pa is not None, "pyarrow is installed")
+class TestParquetExportWithoutPyarrow(unittest.TestCase):
+    def test_reports_missing_dependency(self):
+        with self.assertRaises(ImportError):
+            parquet_export.ParquetExporter("moods.csv", tempfile.gettempdir())
+        self.assertEqual(parquet_export.main(["moods.csv", "--output", tempfile.gettempdir()]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, time
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+import main
+from file_lock import FileLock
+from resident import ResidentTray, next_prompt_after, parse_prompt_time
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestSchedule(unittest.TestCase):
+    def test_parse_prompt_time(self):
+        self.assertEqual(parse_prompt_time("09:30"), time(9, 30))
+        with self.assertRaises(ValueError):
+            parse_prompt_time("half past nine")
+
+    def test_next_prompt_after(self):
+        prompt = time(10, 0)
+        self.assertEqual(next_prompt_after(datetime(2025, 5, 29, 9, 0), prompt), datetime(2025, 5, 29, 10, 0))
+        self.assertEqual(next_prompt_after(datetime(2025, 5, 29, 10, 0), prompt), datetime(2025, 5, 30, 10, 0))
+        self.assertEqual(next_prompt_after(datetime(2025, 5, 29, 23, 0), prompt), datetime(2025, 5, 30, 10, 0))
+
+
+class TestResidentTray(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        self.clock = FakeClock(datetime(2025, 5, 29, 8, 0))
+        self.tray = ResidentTray(time(10, 0), clock=self.clock)
+        self.tray.window.checkin_writer.save = lambda mood: None
+        self.show_message = patch.object(self.tray.tray, 'showMessage').start()
+        self.eligible = patch('main.check_notification_eligibility', return_value=True).start()
+
+    def tearDown(self):
+        patch.stopall()
+        self.tray.timer.stop()
+        self.tray.window.checkin_writer.close()
+        self.tray.window.close()
+
+    def test_window_prebuilt_and_hidden(self):
+        self.assertFalse(self.tray.window.isVisible())
+        self.assertIsNotNone(self.tray.window.result_page)
+        self.tray.start()
+        self.assertFalse(self.tray.window.isVisible())
+
+    def test_prompts_once_per_day_at_prompt_time(self):
+        self.tray.start()
+        self.clock.now = datetime(2025, 5, 29, 10, 0)
+        with patch.object(self.tray.window, 'build_result_page') as mock_build:
+            self.tray.check_schedule()
+            mock_build.assert_not_called()
+        self.assertTrue(self.tray.window.isVisible())
+        self.assertEqual(self.tray.next_prompt, datetime(2025, 5, 30, 10, 0))
+
+        self.tray.window.hide()
+        self.clock.now = datetime(2025, 5, 29, 15, 0)
+        self.tray.check_schedule()
+        self.assertFalse(self.tray.window.isVisible())
+
+    def test_logon_after_prompt_time_prompts_immediately(self):
+        self.clock.now = datetime(2025, 5, 29, 13, 0)
+        self.tray.start()
+        self.assertTrue(self.tray.window.isVisible())
+
+    def test_no_prompt_when_already_checked_in(self):
+        self.eligible.return_value = False
+        self.clock.now = datetime(2025, 5, 29, 11, 0)
+        self.tray.start()
+        self.assertFalse(self.tray.window.isVisible())
+
+    def test_tray_click(self):
+        self.tray.on_check_in_requested()
+        self.assertTrue(self.tray.window.isVisible())
+
+        self.tray.window.hide()
+        self.eligible.return_value = False
+        self.tray.on_check_in_requested()
+        self.assertFalse(self.tray.window.isVisible())
+        self.show_message.assert_called_once()
+
+    def test_present_resets_previous_check_in(self):
+        window = self.tray.window
+        window.present()
+        window.selected_mood = "😄"
+        window.submit_mood()
+        self.assertIs(window.pages.currentWidget(), window.result_page)
+        window.hide()
+
+        window.present()
+        self.assertIs(window.pages.currentWidget(), window.checkin_page)
+        self.assertIsNone(window.selected_mood)
+        self.assertFalse(window.final_emoji_timer.isActive())
+        self.assertFalse(window.spinner.is_running())
+
+
+class TestResidentMain(unittest.TestCase):
+    def test_second_resident_exits(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_base = os.path.join(tmp_dir, "resident")
+            with patch('main.RESIDENT_LOCK_FILE', lock_base), \
+                 patch('main.initialize_files'), \
+                 patch('main.show_notification') as mock_show, \
+                 patch('getpass.getuser', return_value='test_user'):
+                main.main(["--resident", "--prompt-at", "09:15"])
+                mock_show.assert_called_once_with(resident=True, prompt_time="09:15")
+                mock_show.reset_mock()
+
+                with FileLock(f"{lock_base}_test_user"):
+                    main.main(["--resident"])
+                mock_show.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from PySide6.QtWidgets import QApplication
+
+import resources
+
+
+class TestResources(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self):
+        resources.clear_cache()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        resources.clear_cache()
+        sys.modules.pop("embedded_assets", None)
+        shutil.rmtree(self.tmp_dir)
+
+    def test_asset_path_independent_of_cwd(self):
+        """Test assets resolve next to the code, not the working directory"""
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        try:
+            self.assertFalse(resources.pixmap(resources.LOGO, 80).isNull())
+        finally:
+            os.chdir(cwd)
+
+    def test_asset_decoded_once(self):
+        """Test each asset is read from disk once and variants are cached"""
+        with patch('resources.QPixmap', wraps=resources.QPixmap) as mock_pixmap:
+            first = resources.pixmap(resources.LOGO, 80)
+            second = resources.pixmap(resources.LOGO, 80)
+            resources.pixmap(resources.LOGO, 40)
+            resources.icon(resources.LOGO)
+            self.assertEqual(mock_pixmap.call_count, 1)
+        self.assertIs(first, second)
+        self.assertEqual(first.width(), 80)
+
+    def test_high_dpi_variant(self):
+        """Test variants are scaled for the device pixel ratio"""
+        hidpi = resources.pixmap(resources.LOGO, 80, 2.0)
+        self.assertEqual(hidpi.width(), 160)
+        self.assertEqual(hidpi.devicePixelRatio(), 2.0)
+
+    def test_embedded_assets_skip_disk(self):
+        """Test pre-scaled embedded bytes are used when available"""
+        resources.embed_assets(os.path.join(self.tmp_dir, "embedded_assets.py"))
+        resources.clear_cache()
+        sys.path.insert(0, self.tmp_dir)
+        try:
+            with patch('resources.source_pixmap', side_effect=AssertionError("read from disk")):
+                logo = resources.pixmap(resources.LOGO, 80)
+        finally:
+            sys.path.remove(self.tmp_dir)
+        self.assertEqual(logo.width(), 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import date
+from unittest.mock import patch
+
+from mood_analytics import load_history
+from segment_store import SegmentedMoodStore, months_before, segment_name, main
+
+ROWS = [
+    ["2025-04-30 09:00:00", "alice", "😊", "Chillin'"],
+    ["2025-05-02 09:00:00", "alice", "😔", "Low Key"],
+    ["2025-05-01 09:00:00", "bob", "😄", "Thrivin'"],
+    ["2025-06-03 09:00:00", "bob", "😐", "Meh!"],
+]
+
+
+class TestSegmentedMoodStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store_dir = os.path.join(self.tmp_dir, "mood_segments")
+        self.store = SegmentedMoodStore(self.store_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_rows_land_in_month_segments(self):
+        """Test each row is appended to the segment for its month"""
+        self.store.write(ROWS)
+        segments = self.store.segments()
+        self.assertEqual(sorted(segments), ["2025-04", "2025-05", "2025-06"])
+        with open(os.path.join(self.store_dir, segment_name("2025-05")), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[0], "Timestamp,Username,Mood,State")
+        self.assertEqual(len(lines), 3)
+
+    def test_range_query_opens_only_matching_months(self):
+        """Test range queries filter by day and skip other months' segments"""
+        self.store.write(ROWS)
+        os.remove(os.path.join(self.store_dir, segment_name("2025-04")))
+        records = list(self.store.read_range("2025-05-02", "2025-06-30"))
+        self.assertEqual([r.timestamp[:10] for r in records], ["2025-05-02", "2025-06-03"])
+
+    def test_compaction_sorts_and_compresses(self):
+        """Test finished months are compacted into one sorted gzip segment"""
+        self.store.write(ROWS)
+        self.store.write([["2025-05-01 08:00:00", "carol", "😞", "Cooked >_>"]])
+        result = self.store.maintain(today=date(2025, 6, 15))
+        self.assertEqual(result, {"compacted": ["2025-04", "2025-05"], "dropped": []})
+
+        entries = self.store.segments()["2025-05"]
+        self.assertEqual(len(entries), 1)
+        self.assertTrue(entries[0]["compacted"])
+        self.assertEqual(entries[0]["rows"], 3)
+        self.assertFalse(os.path.exists(os.path.join(self.store_dir, segment_name("2025-05"))))
+        with gzip.open(os.path.join(self.store_dir, entries[0]["file"]), 'rt', encoding='utf-8') as f:
+            times = [line.split(",")[0] for line in f.read().splitlines()[1:]]
+        self.assertEqual(times, sorted(times))
+        # The current month stays a plain append-only segment
+        self.assertFalse(self.store.segments()["2025-06"][0]["compacted"])
+        self.assertEqual(len(list(self.store.read_range("2025-05-01", "2025-05-31"))), 3)
+
+    def test_late_row_after_compaction(self):
+        """Test a row for a compacted month is kept and merged on the next compaction"""
+        self.store.write(ROWS)
+        self.store.maintain(today=date(2025, 6, 15))
+        self.store.write([["2025-05-31 23:59:00", "dave", "😊", "Chillin'"]])
+        self.assertEqual(len(self.store.segments()["2025-05"]), 2)
+        self.assertEqual(len(list(self.store.read_range("2025-05-01", "2025-05-31"))), 3)
+        self.store.maintain(today=date(2025, 6, 15))
+        self.assertEqual(self.store.segments()["2025-05"][0]["rows"], 3)
+
+    def test_crash_before_old_segments_removed(self):
+        """Test a crash after the manifest is saved keeps every row and later writes add no duplicates"""
+        self.store.write(ROWS)
+        with patch.object(SegmentedMoodStore, '_remove_segment', side_effect=OSError("power loss")):
+            with self.assertRaises(OSError):
+                self.store.compact("2025-05")
+        store = SegmentedMoodStore(self.store_dir)
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 2)
+        # The superseded segment is still on disk; a late row must not revive its rows
+        self.assertTrue(os.path.exists(os.path.join(self.store_dir, segment_name("2025-05"))))
+        store.write([["2025-05-31 23:59:00", "dave", "😊", "Chillin'"]])
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 3)
+        store.maintain(today=date(2025, 6, 15))
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 3)
+
+    def test_crash_after_segment_removed(self):
+        """Test a crash right after a superseded segment is deleted loses no rows"""
+        self.store.write(ROWS)
+        remove = SegmentedMoodStore._remove_segment
+
+        def remove_then_crash(store, name):
+            remove(store, name)
+            raise OSError("power loss")
+
+        with patch.object(SegmentedMoodStore, '_remove_segment', remove_then_crash):
+            with self.assertRaises(OSError):
+                self.store.compact("2025-05")
+        store = SegmentedMoodStore(self.store_dir)
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 2)
+        store.maintain(today=date(2025, 6, 15))
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 2)
+
+    def test_crash_before_manifest_saved(self):
+        """Test a crash before the manifest is saved leaves the old segments in use"""
+        self.store.write(ROWS)
+        self.store.maintain(today=date(2025, 6, 15))
+        self.store.write([["2025-05-31 23:59:00", "dave", "😊", "Chillin'"]])
+        with patch.object(SegmentedMoodStore, '_save_manifest', side_effect=OSError("power loss")):
+            with self.assertRaises(OSError):
+                self.store.compact("2025-05")
+        store = SegmentedMoodStore(self.store_dir)
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 3)
+        store.maintain(today=date(2025, 6, 15))
+        entries = store.segments()["2025-05"]
+        self.assertEqual(entries[0]["rows"], 3)
+        self.assertEqual(len(list(store.read_range("2025-05-01", "2025-05-31"))), 3)
+
+    def test_clean_compaction_leaves_no_quarantine_file(self):
+        """Test compacting valid rows does not create an empty rejected-rows file"""
+        self.store.write(ROWS)
+        self.store.maintain(today=date(2025, 6, 15))
+        self.assertFalse(any(name.endswith(".rejected.csv") for name in os.listdir(self.store_dir)))
+
+    def test_retention_drops_old_months(self):
+        """Test months older than the retention age are deleted"""
+        self.store.write(ROWS)
+        result = self.store.maintain(today=date(2025, 6, 15), retention_months=1)
+        self.assertEqual(result["dropped"], ["2025-04"])
+        self.assertNotIn("2025-04", self.store.segments())
+        self.assertFalse(any(name.startswith("moods-2025-04") for name in os.listdir(self.store_dir)))
+        self.assertEqual(months_before(date(2025, 1, 10), 1), "2024-12")
+
+    def test_incremental_backup(self):
+        """Test backups copy only appended bytes and mirror compaction"""
+        backup_dir = os.path.join(self.tmp_dir, "backup")
+        self.store.write(ROWS)
+        first = self.store.backup(backup_dir)
+        self.assertGreater(first, 0)
+        self.assertEqual(self.store.backup(backup_dir), 0)
+
+        row = ["2025-06-04 09:00:00", "bob", "😄", "Thrivin'"]
+        self.store.write([row])
+        self.assertEqual(self.store.backup(backup_dir), len(",".join(row).encode("utf-8")) + 2)
+
+        self.store.maintain(today=date(2025, 7, 1))
+        self.store.backup(backup_dir)
+        self.assertEqual(self.store.backup(backup_dir), 0)
+        copy = SegmentedMoodStore(backup_dir)
+        self.assertEqual(list(copy.read_range()), list(self.store.read_range()))
+        self.assertNotIn(segment_name("2025-06"), os.listdir(backup_dir))
+
+    def test_backup_of_recreated_segment(self):
+        """Test a segment recreated by late rows after compaction is copied whole, not appended"""
+        backup_dir = os.path.join(self.tmp_dir, "backup")
+        self.store.write(ROWS)
+        self.store.backup(backup_dir)
+        self.store.maintain(today=date(2025, 6, 15))
+        self.store.write([[f"2025-05-31 23:5{i}:00", f"late{i}", "😊", "Chillin'"] for i in range(5)])
+        self.store.backup(backup_dir)
+        name = segment_name("2025-05")
+        with open(os.path.join(self.store_dir, name), 'rb') as src, open(os.path.join(backup_dir, name), 'rb') as dst:
+            self.assertEqual(dst.read(), src.read())
+        self.assertEqual(list(SegmentedMoodStore(backup_dir).read_range()), list(self.store.read_range()))
+
+    def test_import_and_analytics(self):
+        """Test a legacy CSV can be split into segments and analysed from them"""
+        csv_path = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            f.write("Timestamp,Username,Mood,State\r\n")
+            f.writelines(",".join(row) + "\r\n" for row in ROWS)
+        self.assertEqual(self.store.import_csv(csv_path), 4)
+        df = load_history(self.store_dir)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(list(df["username"]), ["alice", "alice", "bob", "bob"])
+
+    def test_cli(self):
+        """Test the maintain and query commands"""
+        self.store.write(ROWS)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main(["--dir", self.store_dir, "maintain", "--no-compress"]), 0)
+            self.assertEqual(main(["--dir", self.store_dir, "query", "--start", "2025-05-01"]), 0)
+        self.assertIn("Compacted: 2025-04, 2025-05, 2025-06", output.getvalue())
+        self.assertIn("Thrivin': 1", output.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.store_dir, segment_name("2025-05", compacted=True))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from moods import EMOJI_STATE_MAP
+from notification_ledger import NotificationLedger
+from sqlite_store import SELECT_HISTORY, SqliteMoodStore, import_legacy, main
+
+ROWS = [
+    ["2025-05-28 09:00:00", "alice", "😄", EMOJI_STATE_MAP["😄"]],
+    ["2025-05-29 10:54:11", "bob", "😐", EMOJI_STATE_MAP["😐"]],
+    ["2025-05-30 17:20:00", "alice", "😞", EMOJI_STATE_MAP["😞"]],
+]
+
+
+class TestSqliteMoodStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "moodcheck.db")
+        self.store = SqliteMoodStore(self.db_file)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_uses_wal_journal(self):
+        with self.store.pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+    def test_write_and_user_history(self):
+        self.assertEqual(self.store.write(ROWS), 3)
+        history = self.store.user_history("alice", "2025-05-29")
+        self.assertEqual(history, [tuple(ROWS[2])])
+        self.assertTrue(self.store.has_checked_in("bob", "2025-05-29"))
+        self.assertFalse(self.store.has_checked_in("bob", "2025-05-30"))
+
+    def test_history_query_uses_username_day_index(self):
+        with self.store.pool.connection() as conn:
+            plan = " ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + SELECT_HISTORY, ("alice", "2025-01-01")))
+        self.assertIn("moods_username_day", plan)
+
+    def test_ledger_get_set(self):
+        ledger = self.store.ledger
+        self.assertIsNone(ledger.get("alice"))
+        ledger.set("alice", "2025-05-29")
+        ledger.set("alice", "2025-05-30")
+        ledger.set("bob", "2025-05-30")
+        self.assertEqual(ledger.get("alice"), "2025-05-30")
+        self.assertEqual(sorted(ledger.items()), [("alice", "2025-05-30"), ("bob", "2025-05-30")])
+
+    def test_rows_visible_to_other_connections(self):
+        self.store.write(ROWS[:1])
+        other = SqliteMoodStore(self.db_file)
+        try:
+            self.assertTrue(other.has_checked_in("alice", "2025-05-28"))
+        finally:
+            other.close()
+
+    def test_concurrent_writes_share_pool(self):
+        def write_many():
+            for _ in range(50):
+                self.store.write(ROWS)
+
+        threads = [threading.Thread(target=write_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with self.store.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM moods").fetchone()[0], 8 * 50 * 3)
+        self.assertLessEqual(self.store.pool._created, self.store.pool.size)
+
+
+class TestImportLegacy(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.tmp_dir, "moodcheck.db")
+        self.csv_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        self.text_file = os.path.join(self.tmp_dir, "last_notification.txt")
+        with open(self.csv_file, 'w', encoding='utf-8', newline='') as f:
+            f.write("Timestamp,Username,Mood,State\n")
+            for row in ROWS:
+                f.write(",".join(row) + "\n")
+            f.write("not a timestamp,carol,😄\n")
+        with open(self.text_file, 'w', encoding='utf-8') as f:
+            f.write("alice,2025-05-30\nbob,2025-05-29\ngarbage\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_imports_csv_and_text_ledger(self):
+        rows, users = import_legacy(self.db_file, self.csv_file, self.text_file)
+        self.assertEqual((rows, users), (3, 2))
+        store = SqliteMoodStore(self.db_file)
+        try:
+            self.assertEqual(store.user_history("alice", "2025-01-01"), [tuple(ROWS[0]), tuple(ROWS[2])])
+            self.assertEqual(store.ledger.get("bob"), "2025-05-29")
+        finally:
+            store.close()
+
+    def test_imports_indexed_ledger(self):
+        ledger_file = os.path.join(self.tmp_dir, "last_notification.idx")
+        NotificationLedger(ledger_file).set("dave", "2025-06-01")
+        rows, users = import_legacy(self.db_file, ledger_path=ledger_file)
+        self.assertEqual((rows, users), (0, 1))
+        with sqlite3.connect(self.db_file) as conn:
+            self.assertEqual(conn.execute("SELECT last_date FROM notifications").fetchall(), [("2025-06-01",)])
+
+    def test_cli(self):
+        self.assertEqual(main(["--db", self.db_file, "--csv", self.csv_file, "--notifications", self.text_file]), 0)
+        with sqlite3.connect(self.db_file) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM moods").fetchone()[0], 3)
+
+    def test_cli_prefers_indexed_ledger(self):
+        # The stale text file still lists bob; the ledger the app now updates has dave
+        NotificationLedger(os.path.join(self.tmp_dir, "last_notification.idx")).set("dave", "2025-06-01")
+        cwd = os.getcwd()
+        os.chdir(self.tmp_dir)
+        try:
+            self.assertEqual(main(["--db", self.db_file, "--csv", self.csv_file]), 0)
+            os.remove("last_notification.idx")
+            self.assertEqual(main(["--db", "fallback.db", "--csv", self.csv_file]), 0)
+        finally:
+            os.chdir(cwd)
+        with sqlite3.connect(self.db_file) as conn:
+            self.assertEqual(conn.execute("SELECT username FROM notifications").fetchall(), [("dave",)])
+        with sqlite3.connect(os.path.join(self.tmp_dir, "fallback.db")) as conn:
+            self.assertIn(("bob",), conn.execute("SELECT username FROM notifications").fetchall())
+
+
+if __name__ == "__main__":
+    unittest.main()
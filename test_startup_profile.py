@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import startup_profile
+from startup_profile import ImportTimer, StartupProfile
+
+
+class TestStartupProfile(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.profile_file = os.path.join(self.tmp_dir, "startup_profile.jsonl")
+
+    def tearDown(self):
+        startup_profile.finish(os.path.join(self.tmp_dir, "discard.jsonl"))
+        shutil.rmtree(self.tmp_dir)
+
+    def test_mark_is_noop_when_disabled(self):
+        """Test marks are ignored unless profiling is enabled"""
+        startup_profile.mark("phase")
+        self.assertIsNone(startup_profile.finish(self.profile_file))
+        self.assertFalse(os.path.exists(self.profile_file))
+
+    def test_phase_durations(self):
+        """Test phases report offsets and per-phase durations"""
+        profile = StartupProfile(start=100.0)
+        profile.phases = [("import_pyside6", 0.5), ("init_ui", 0.75)]
+        record = profile.to_dict()
+        self.assertEqual(record["total_ms"], 750.0)
+        self.assertEqual([p["duration_ms"] for p in record["phases"]], [500.0, 250.0])
+        self.assertNotIn("imports", record)
+
+    def test_finish_appends_json_lines(self):
+        """Test each run appends one JSON record to the log"""
+        for _ in range(2):
+            startup_profile.enable()
+            startup_profile.mark("eligibility_check")
+            startup_profile.finish(self.profile_file)
+        with open(self.profile_file, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["phases"][0]["phase"], "eligibility_check")
+
+    def test_import_timer(self):
+        """Test first-time imports are recorded and the hook is removed afterwards"""
+        module_dir = os.path.join(self.tmp_dir, "modules")
+        os.makedirs(module_dir)
+        with open(os.path.join(module_dir, "profiled_outer.py"), 'w') as f:
+            f.write("import profiled_inner\n")
+        with open(os.path.join(module_dir, "profiled_inner.py"), 'w') as f:
+            f.write("VALUE = 1\n")
+        sys.path.insert(0, module_dir)
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import profiled_outer  # noqa: F401
+        finally:
+            timer.uninstall()
+            sys.path.remove(module_dir)
+            sys.modules.pop("profiled_outer", None)
+            sys.modules.pop("profiled_inner", None)
+        records = {r["module"]: r for r in timer.slowest()}
+        self.assertIn("profiled_inner", records)
+        outer = records["profiled_outer"]
+        self.assertGreaterEqual(outer["cumulative_ms"], records["profiled_inner"]["cumulative_ms"])
+        self.assertLessEqual(outer["self_ms"], outer["cumulative_ms"])
+
+
+if __name__ == '__main__':
+    unittest.main()
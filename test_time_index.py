@@ -0,0 +1,108 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from log_checkpoint import FINGERPRINT_BYTES
+from mood_reader import MoodReader
+from time_index import TimeIndex, main
+
+HISTORY_CSV = (
+    "Timestamp,Username,Mood,State\r\n"
+    "2025-05-26 09:00:00,alice,😔,Low Key\r\n"
+    "2025-05-26 10:00:00,bob,😄,Thrivin'\r\n"
+    "2025-05-27 09:00:00,alice,😄,Thrivin'\r\n"
+    "2025-05-28 09:00:00,alice,😞,Cooked >_>\r\n"
+    "2025-05-28 09:05:00,bob,😊👍\r\n"
+    "2025-05-29 09:00:00,alice,😊,Chillin'\r\n"
+)
+
+
+class TestTimeIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.mood_file = os.path.join(self.tmp_dir, "employee_mood_data.csv")
+        self.write(HISTORY_CSV)
+        self.index = TimeIndex(self.mood_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write(self, text, mode='w'):
+        with open(self.mood_file, mode, newline='', encoding='utf-8') as f:
+            f.write(text)
+
+    def days(self, start, end):
+        return [record.timestamp[:10] for record in self.index.query(start, end)]
+
+    def test_one_checkpoint_per_day(self):
+        """Test a checkpoint is recorded at the first row of each new day"""
+        self.assertEqual(self.index.refresh(), 5)
+        blocks = self.index.checkpoint.load()["blocks"]
+        self.assertEqual([block[0] for block in blocks], ["2025-05-26", "2025-05-27", "2025-05-28", "2025-05-29"])
+        with open(self.mood_file, 'rb') as f:
+            f.seek(blocks[1][1])
+            self.assertTrue(f.readline().startswith(b"2025-05-27"))
+
+    def test_range_query_seeks_to_first_match(self):
+        """Test queries return the matching rows and start reading at the checkpoint"""
+        self.assertEqual(self.days("2025-05-27", "2025-05-28"), ["2025-05-27", "2025-05-28"])
+        self.assertEqual(self.days("2025-05-29", None), ["2025-05-29"])
+        self.assertEqual(self.days(None, "2025-05-26"), ["2025-05-26", "2025-05-26"])
+        self.assertEqual(self.days("2025-06-01", "2025-06-30"), [])
+
+        offsets = []
+        original = MoodReader.__init__
+
+        def record_offset(reader, path, start_offset=0, quarantine=None, end_offset=None):
+            offsets.append(start_offset)
+            original(reader, path, start_offset, quarantine, end_offset)
+
+        with patch.object(MoodReader, '__init__', record_offset):
+            list(self.index.query("2025-05-28", "2025-05-28"))
+        self.assertEqual(offsets[-1], self.index.checkpoint.load()["blocks"][2][1])
+
+    def test_appends_and_out_of_order_rows(self):
+        """Test appended rows are indexed incrementally, including late ones"""
+        self.index.refresh()
+        self.write("2025-05-30 09:00:00,alice,😐,Meh!\r\n"
+                   "2025-05-26 18:00:00,carol,😞,Cooked >_>\r\n", mode='a')
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertEqual(self.days("2025-05-26", "2025-05-26"), ["2025-05-26", "2025-05-26", "2025-05-26"])
+        self.assertEqual(self.days("2025-05-30", "2025-05-30"), ["2025-05-30"])
+
+    def test_validate_and_rebuild_after_external_edit(self):
+        """Test an externally edited log fails validation and is reindexed"""
+        padding = "".join(f"2025-05-01 09:{i % 60:02d}:00,user{i:03d},😐,Meh!\r\n" for i in range(150))
+        history = HISTORY_CSV.replace("\r\n", "\r\n" + padding, 1)
+        self.assertGreater(history.index("2025-05-27"), FINGERPRINT_BYTES)
+        self.write(history)
+        self.index.refresh()
+        self.assertTrue(self.index.validate())
+        # The fingerprinted prefix is unchanged, but every later checkpoint moves
+        self.write(history.replace("2025-05-27 09:00:00,alice,", "2025-05-27 09:00:00,alice_renamed,"))
+        self.assertFalse(self.index.validate())
+        self.index.refresh(validate=True)
+        self.assertTrue(self.index.validate())
+        self.assertEqual(self.days("2025-05-28", "2025-05-29"), ["2025-05-28", "2025-05-29"])
+
+    def test_rewritten_log_rebuilds(self):
+        """Test a log that shrank below the checkpoint is reindexed"""
+        self.index.refresh()
+        self.write("Timestamp,Username,Mood,State\r\n2025-06-01 09:00:00,bob,😊,Chillin'\r\n")
+        self.assertEqual(self.days(None, None), ["2025-06-01"])
+
+    def test_cli(self):
+        """Test the command line query"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main([self.mood_file, "--start", "2025-05-27", "--validate"]), 0)
+        self.assertIn("Thrivin': 1", output.getvalue())
+        self.assertIn("Index did not match", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from datetime import date
+
+from mood_reader import MoodRecord
+from user_history import UserHistoryCache, day_range
+
+TODAY = date(2025, 5, 29)
+
+
+class FakeStorage:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def __call__(self, username, since):
+        self.calls.append((username, since))
+        return [MoodRecord(timestamp, user, mood, "") for timestamp, user, mood in self.rows
+                if user == username and timestamp[:10] >= since]
+
+
+class TestUserHistoryCache(unittest.TestCase):
+    def setUp(self):
+        self.storage = FakeStorage([
+            ("2025-05-20 09:00:00", "alice", "😞"),
+            ("2025-05-27 09:00:00", "alice", "😔"),
+            ("2025-05-29 09:00:00", "alice", "😐"),
+            ("2025-05-29 09:20:00", "alice", "😄"),
+            ("2025-05-29 09:10:00", "alice", "😊"),
+            ("2025-05-28 09:00:00", "bob", "😊"),
+        ])
+        self.cache = UserHistoryCache(self.storage, maxsize=2)
+
+    def test_day_range(self):
+        self.assertEqual(day_range(3, TODAY), ["2025-05-27", "2025-05-28", "2025-05-29"])
+
+    def test_latest_check_in_per_day(self):
+        """Test each day shows its latest check-in and empty days are None"""
+        history = self.cache.get("alice", 3, TODAY)
+        self.assertEqual(history, [("2025-05-27", "😔"), ("2025-05-28", None), ("2025-05-29", "😄")])
+        self.assertEqual(self.storage.calls, [("alice", "2025-05-27")])
+
+    def test_hits_do_not_touch_storage(self):
+        """Test repeated and shorter windows are served from the cache"""
+        self.cache.get("alice", 7, TODAY)
+        self.cache.get("alice", 7, TODAY)
+        self.cache.get("alice", 2, TODAY)
+        self.assertEqual(len(self.storage.calls), 1)
+        # A longer window than the cached one is loaded again
+        self.assertEqual(self.cache.get("alice", 10, TODAY)[0], ("2025-05-20", "😞"))
+        self.assertEqual(len(self.storage.calls), 2)
+
+    def test_invalidate_reloads_only_that_user(self):
+        """Test appending a user's row invalidates just their entry"""
+        self.cache.get("alice", 7, TODAY)
+        self.cache.get("bob", 7, TODAY)
+        self.storage.rows.append(("2025-05-29 17:00:00", "alice", "😞"))
+        self.cache.invalidate("alice")
+        self.assertEqual(self.cache.get("alice", 7, TODAY)[-1], ("2025-05-29", "😞"))
+        self.cache.get("bob", 7, TODAY)
+        self.assertEqual([user for user, _ in self.storage.calls], ["alice", "bob", "alice"])
+
+    def test_lru_eviction(self):
+        """Test the least recently used user is evicted past maxsize"""
+        self.cache.get("alice", 7, TODAY)
+        self.cache.get("bob", 7, TODAY)
+        self.cache.get("alice", 7, TODAY)
+        self.cache.get("carol", 7, TODAY)
+        self.assertEqual(list(self.cache.entries), ["alice", "carol"])
+        self.cache.get("bob", 7, TODAY)
+        self.assertEqual(self.cache.misses, 4)
+
+    def test_load_racing_invalidation_is_not_cached(self):
+        """Test a load that overlapped an append is returned but not kept"""
+        def load(username, since):
+            self.cache.invalidate(username)
+            return self.storage(username, since)
+
+        self.cache.load = load
+        self.cache.get("alice", 7, TODAY)
+        self.assertNotIn("alice", self.cache.entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
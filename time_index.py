@@ -0,0 +1,124 @@
+import argparse
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from collections import Counter
+
+from log_checkpoint import LogCheckpoint
+from mood_reader import MoodReader
+from moods import EMOJI_STATE_MAP, EMOJIS
+
+# Block fields: the latest day seen up to and including the block, where the
+# block starts in the log, and the earliest day of any row in it
+MAX_DAY, OFFSET, MIN_DAY = range(3)
+
+
+class TimeIndex:
+    """Sparse (day -> byte offset) index over a mood CSV, kept in a sidecar file.
+
+    The log is split into blocks, a new one starting at each row that moves
+    the latest day seen so far forward; that is one checkpoint per day for
+    a log written in time order. Every row before the first block whose
+    latest day reaches ``start`` is older than ``start``, so a range query
+    binary-searches the blocks and seeks straight to it. Rows appended out
+    of order are covered by each block's earliest day.
+    """
+
+    def __init__(self, mood_path, store_path=None):
+        self.mood_path = mood_path
+        self.store_path = store_path or mood_path + ".tidx"
+        self.checkpoint = LogCheckpoint(mood_path, self.store_path)
+        self.lock = self.checkpoint.lock
+
+    def _day_at(self, offset):
+        """Day of the row starting at ``offset``, or None if no valid row starts there."""
+        with open(self.mood_path, 'rb') as f:
+            if offset:
+                f.seek(offset - 1)
+                if f.read(1) != b"\n":
+                    return None
+            reader = MoodReader(self.mood_path, start_offset=offset, end_offset=offset + 1)
+            for record in reader:
+                return record.timestamp[:10]
+        return None
+
+    def validate(self, state=None):
+        """Check the sidecar still matches the log: same prefix and every checkpoint on its row."""
+        state = state if state is not None else self.checkpoint.load()
+        if self.checkpoint.is_stale(state):
+            return False
+        return all(self._day_at(block[OFFSET]) == block[MAX_DAY] for block in state["blocks"])
+
+    def refresh(self, rebuild=False, validate=False):
+        """Index rows appended since the last refresh. Returns the number of rows indexed.
+
+        The index is rebuilt from scratch if the log was rewritten, or with
+        ``validate`` if any checkpoint no longer points at its row.
+        """
+        with self.lock:
+            state = self.checkpoint.load()
+            if rebuild or self.checkpoint.is_stale(state) or (validate and not self.validate(state)):
+                state = self.checkpoint.reset(blocks=[])
+            if not os.path.exists(self.mood_path):
+                self.checkpoint.save(state)
+                return 0
+            if state["offset"] == os.path.getsize(self.mood_path) and os.path.exists(self.store_path):
+                return 0
+            blocks = state["blocks"]
+            reader = MoodReader(self.mood_path, start_offset=state["offset"])
+            for record in reader:
+                day = record.timestamp[:10]
+                if not blocks or day > blocks[-1][MAX_DAY]:
+                    blocks.append([day, reader.line_offset, day])
+                elif day < blocks[-1][MIN_DAY]:
+                    blocks[-1][MIN_DAY] = day
+            self.checkpoint.advance(state, reader.offset)
+            self.checkpoint.save(state)
+            return reader.stats["rows"]
+
+    def _ranges(self, blocks, start, end):
+        """(start offset, end offset) spans of the log that can hold rows in [start, end]."""
+        max_days = [block[MAX_DAY] for block in blocks]
+        first = bisect_left(max_days, start) if start is not None else 0
+        last = bisect_right(max_days, end) if end is not None else len(blocks)
+        spans = []
+        if first < last:
+            spans.append((blocks[first][OFFSET], blocks[last][OFFSET] if last < len(blocks) else None))
+        # Later blocks only matter if rows older than their latest day were appended to them
+        for i in range(max(first, last), len(blocks)):
+            if blocks[i][MIN_DAY] <= end:
+                spans.append((blocks[i][OFFSET], blocks[i + 1][OFFSET] if i + 1 < len(blocks) else None))
+        return spans
+
+    def query(self, start=None, end=None):
+        """Yield records with ISO days in [start, end], reading only the blocks that can hold them."""
+        self.refresh()
+        state = self.checkpoint.load()
+        for span_start, span_end in self._ranges(state["blocks"], start, end):
+            for record in MoodReader(self.mood_path, start_offset=span_start, end_offset=span_end):
+                day = record.timestamp[:10]
+                if (start is None or day >= start) and (end is None or day <= end):
+                    yield record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the mood log by date through a sparse time index.")
+    parser.add_argument("path", nargs="?", default="employee_mood_data.csv")
+    parser.add_argument("--start", help="first ISO day")
+    parser.add_argument("--end", help="last ISO day")
+    parser.add_argument("--validate", action="store_true", help="check every checkpoint and rebuild if any is wrong")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index from scratch")
+    args = parser.parse_args(argv)
+
+    index = TimeIndex(args.path)
+    if args.validate and not index.validate():
+        print("Index did not match the log; rebuilding")
+    index.refresh(rebuild=args.rebuild, validate=args.validate)
+    counts = Counter(record.mood for record in index.query(args.start, args.end))
+    for emoji in EMOJIS:
+        print(f"{emoji} {EMOJI_STATE_MAP[emoji]}: {counts[emoji]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+
+# Users whose recent check-ins are kept in memory at once
+USER_HISTORY_CACHE_SIZE = 256
+
+
+def day_range(days, today=None):
+    """The last ``days`` ISO days, oldest first, ending with ``today``."""
+    today = today or date.today()
+    return [(today - timedelta(days=offset)).isoformat() for offset in range(days - 1, -1, -1)]
+
+
+class UserHistoryCache:
+    """Bounded LRU cache of each user's latest check-in per day.
+
+    ``load(username, since)`` fetches a user's records from the ISO day
+    ``since`` onwards from the storage layer. It is only called on a miss,
+    or when a longer window is asked for than the cached one covers.
+    ``invalidate`` drops a user's entry once their rows are appended, and
+    the least recently used users are evicted past ``maxsize``.
+    """
+
+    def __init__(self, load, maxsize=USER_HISTORY_CACHE_SIZE):
+        self.load = load
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped by every invalidation, so a load that raced one is not cached
+        self.generation = 0
+        self.misses = 0
+
+    def get(self, username, days, today=None):
+        """``[(day, mood or None), ...]`` for the last ``days`` days, oldest first."""
+        window = day_range(days, today)
+        since = window[0]
+        with self.lock:
+            entry = self.entries.get(username)
+            if entry is not None and entry[0] <= since:
+                self.entries.move_to_end(username)
+                latest = entry[1]
+            else:
+                latest = None
+                generation = self.generation
+        if latest is None:
+            latest = {}
+            for record in self.load(username, since):
+                day = record.timestamp[:10]
+                if day not in latest or record.timestamp >= latest[day][0]:
+                    latest[day] = (record.timestamp, record.mood)
+            with self.lock:
+                self.misses += 1
+                if generation == self.generation:
+                    self.entries[username] = (since, latest)
+                    self.entries.move_to_end(username)
+                    while len(self.entries) > self.maxsize:
+                        self.entries.popitem(last=False)
+        return [(day, latest[day][1] if day in latest else None) for day in window]
+
+    def invalidate(self, username):
+        with self.lock:
+            self.generation += 1
+            self.entries.pop(username, None)
+
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()